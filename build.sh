@@ -12,12 +12,16 @@ pip install --upgrade pip
 echo "📚 Installing Python requirements..."
 pip install -r requirements.txt
 
-echo "🎨 Collecting static files..."
+echo "🎨 Building and collecting static files..."
+python manage.py build_assets --settings=portfolio_project.settings.render
 python manage.py collectstatic --noinput --settings=portfolio_project.settings.render
 
 echo "🗃️ Running database migrations..."
 python manage.py migrate --noinput --settings=portfolio_project.settings.render
 
+echo "🔗 Rebuilding related content..."
+python manage.py rebuild_related_content --settings=portfolio_project.settings.render
+
 echo "👤 Creating admin user..."
 python create_admin.py
 
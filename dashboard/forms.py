@@ -126,20 +126,28 @@ class ProjectForm(forms.ModelForm):
 
 
 class BlogPostForm(forms.ModelForm):
+    # Tags are edited as comma-separated text and stored on the Tag relation
+    tags = forms.CharField(
+        required=False,
+        max_length=500,
+        widget=forms.TextInput(attrs={'placeholder': 'e.g., Django, Web Development, Python'}),
+    )
+
     class Meta:
         model = BlogPost
         fields = [
-            'title', 'excerpt', 'body', 'image', 'tags', 
+            'title', 'excerpt', 'body', 'image',
             'is_featured', 'is_published'
         ]
         widgets = {
             'excerpt': forms.Textarea(attrs={'rows': 3, 'maxlength': 300}),
             'body': forms.Textarea(attrs={'rows': 10}),
-            'tags': forms.TextInput(attrs={'placeholder': 'e.g., Django, Web Development, Python'}),
         }
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        if self.instance.pk:
+            self.fields['tags'].initial = self.instance.tags_string
         self.helper = FormHelper()
         self.helper.form_method = 'post'
         self.helper.form_enctype = 'multipart/form-data'
@@ -163,6 +171,10 @@ class BlogPostForm(forms.ModelForm):
             ),
         )
 
+    def _save_m2m(self):
+        super()._save_m2m()
+        self.instance.set_tags_from_string(self.cleaned_data.get('tags', ''))
+
 
 class CVUploadForm(forms.ModelForm):
     class Meta:
@@ -1,3 +1,286 @@
-from django.test import TestCase
+import shutil
+import tempfile
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from portfolio.models import (
+    Project, BlogPost, Education, Certification, Award, SEOSettings,
+    Testimonial, Skill, CareerTimeline, FooterLink, ContactMessage, PersonalInfo, PendingUpload,
+    ScheduledJob
+)
+from portfolio.testing import QueryBudgetTestCase
+from portfolio_project.metrics import histogram
+
+# Routes taking an object pk, with the model the pk comes from
+OBJECT_ROUTES = {
+    'project_edit': Project,
+    'project_delete': Project,
+    'blog_edit': BlogPost,
+    'blog_delete': BlogPost,
+    'education_edit': Education,
+    'education_delete': Education,
+    'certification_edit': Certification,
+    'certification_delete': Certification,
+    'award_edit': Award,
+    'award_delete': Award,
+    'seo_edit': SEOSettings,
+    'seo_delete': SEOSettings,
+    'testimonial_edit': Testimonial,
+    'testimonial_delete': Testimonial,
+    'skill_edit': Skill,
+    'skill_delete': Skill,
+    'career_edit': CareerTimeline,
+    'career_delete': CareerTimeline,
+    'footer_link_edit': FooterLink,
+    'footer_link_delete': FooterLink,
+    'message_detail': ContactMessage,
+}
+
+
+class DashboardRouteBudgetTests(QueryBudgetTestCase):
+    """Every dashboard route stays within its query budget on a large dataset"""
+
+    budgets = {
+        'dashboard:login': 1,
+        'dashboard:logout': 4,
+        'dashboard:home': 9,
+        'dashboard:performance': 3,
+        'dashboard:jobs': 4,
+        'dashboard:personal_info': 4,
+        'dashboard:upload_cv': 5,
+        'dashboard:projects': 6,
+        'dashboard:project_create': 4,
+        'dashboard:project_edit': 6,
+        'dashboard:project_delete': 4,
+        'dashboard:blog_posts': 6,
+        'dashboard:blog_create': 3,
+        'dashboard:blog_edit': 5,
+        'dashboard:blog_delete': 5,
+        'dashboard:education': 4,
+        'dashboard:education_create': 3,
+        'dashboard:education_edit': 4,
+        'dashboard:education_delete': 4,
+        'dashboard:certifications': 4,
+        'dashboard:certification_create': 3,
+        'dashboard:certification_edit': 4,
+        'dashboard:certification_delete': 4,
+        'dashboard:awards': 4,
+        'dashboard:award_create': 3,
+        'dashboard:award_edit': 4,
+        'dashboard:award_delete': 4,
+        'dashboard:seo': 4,
+        'dashboard:seo_create': 3,
+        'dashboard:seo_edit': 4,
+        'dashboard:seo_delete': 4,
+        'dashboard:testimonials': 4,
+        'dashboard:testimonial_create': 3,
+        'dashboard:testimonial_edit': 4,
+        'dashboard:testimonial_delete': 4,
+        'dashboard:skills': 4,
+        'dashboard:skill_create': 3,
+        'dashboard:skill_edit': 4,
+        'dashboard:skill_delete': 4,
+        'dashboard:career': 4,
+        'dashboard:career_create': 3,
+        'dashboard:career_edit': 4,
+        'dashboard:career_delete': 4,
+        'dashboard:footer_links': 4,
+        'dashboard:footer_link_create': 3,
+        'dashboard:footer_link_edit': 4,
+        'dashboard:footer_link_delete': 4,
+        'dashboard:messages': 6,
+        'dashboard:message_detail': 5,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.user = get_user_model().objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+
+    def test_budgets_cover_every_route(self):
+        self.assertBudgetsCover('dashboard')
+
+    def test_login_page(self):
+        self.assertWithinBudget('dashboard:login', reverse('dashboard:login'))
+
+    def test_pages(self):
+        self.client.force_login(self.user)
+        for name in sorted(self.budgets):
+            if name.split(':')[1] in OBJECT_ROUTES or name in ('dashboard:login', 'dashboard:logout'):
+                continue
+            with self.subTest(name):
+                self.assertWithinBudget(name, reverse(name))
+
+    def test_filtered_lists(self):
+        self.client.force_login(self.user)
+        self.assertWithinBudget('dashboard:projects', reverse('dashboard:projects') + '?search=Project&page=3')
+        self.assertWithinBudget('dashboard:blog_posts', reverse('dashboard:blog_posts') + '?search=Post&page=3')
+        self.assertWithinBudget('dashboard:messages', reverse('dashboard:messages') + '?status=unread&page=2')
+        cursor = self.client.get(reverse('dashboard:messages'), {'status': 'unread'}).context['page_obj'].next_cursor
+        self.assertWithinBudget('dashboard:messages', reverse('dashboard:messages') + f'?status=unread&cursor={cursor}')
+
+    def test_object_pages(self):
+        self.client.force_login(self.user)
+        for route, model in OBJECT_ROUTES.items():
+            name = f'dashboard:{route}'
+            with self.subTest(name):
+                pk = model.objects.order_by('pk').values_list('pk', flat=True)[1]
+                self.assertWithinBudget(name, reverse(name, kwargs={'pk': pk}))
+
+    def test_logout(self):
+        self.client.force_login(self.user)
+        self.assertWithinBudget('dashboard:logout', reverse('dashboard:logout'), status=302)
+
+
+class PerformanceInstrumentationTests(TestCase):
+    """The performance middleware times requests and reports them to staff"""
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.staff = User.objects.create_user('staff', 'staff@example.com', 'password', is_staff=True)
+        cls.user = User.objects.create_user('user', 'user@example.com', 'password')
+
+    def setUp(self):
+        histogram.reset()
+
+    def test_server_timing_header_only_for_staff(self):
+        response = self.client.get(reverse('dashboard:login'))
+        self.assertNotIn('Server-Timing', response)
+
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('dashboard:login'))
+        self.assertNotIn('Server-Timing', response)
+
+        self.client.force_login(self.staff)
+        response = self.client.get(reverse('dashboard:login'))
+        self.assertRegex(response['Server-Timing'], r'db;dur=[\d.]+;desc="\d+ queries"')
+        self.assertIn('total;dur=', response['Server-Timing'])
+
+    @override_settings(PORTFOLIO_SERVER_TIMING=True)
+    def test_server_timing_header_for_everyone(self):
+        response = self.client.get(reverse('dashboard:login'))
+        self.assertIn('total;dur=', response['Server-Timing'])
+
+    def test_requests_recorded_by_url_name(self):
+        self.client.get(reverse('dashboard:login'))
+        self.client.get(reverse('dashboard:login'))
+        row, = histogram.snapshot()
+        self.assertEqual(row['name'], 'dashboard:login')
+        self.assertEqual(row['count'], 2)
+        self.assertEqual(sum(row['buckets']), 2)
+        self.assertGreater(row['avg_template_ms'], 0)
+
+    def test_performance_page_is_staff_only(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('dashboard:performance'))
+        self.assertEqual(response.status_code, 403)
+
+        self.client.force_login(self.staff)
+        self.client.get(reverse('dashboard:login'))
+        response = self.client.get(reverse('dashboard:performance'))
+        self.assertContains(response, 'dashboard:login')
+
+    def test_reset(self):
+        self.client.force_login(self.staff)
+        self.client.get(reverse('dashboard:login'))
+        response = self.client.post(reverse('dashboard:performance'))
+        self.assertRedirects(response, reverse('dashboard:performance'))
+        names = [row['name'] for row in histogram.snapshot()]
+        self.assertNotIn('dashboard:login', names)
+
+
+@override_settings(PORTFOLIO_UPLOAD_WORKER=True)
+class UploadCVTests(TestCase):
+    """Uploading a CV returns at once and shows the upload as pending"""
+
+    def setUp(self):
+        staging_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, staging_root)
+        self.enterContext(override_settings(PORTFOLIO_UPLOAD_STAGING_ROOT=staging_root))
+        self.client.force_login(get_user_model().objects.create_user('owner', password='password'))
+
+    def test_upload_is_queued(self):
+        response = self.client.post(
+            reverse('dashboard:upload_cv'),
+            {'resume': SimpleUploadedFile('cv.pdf', b'%PDF-1.4', content_type='application/pdf')},
+        )
+        self.assertRedirects(response, reverse('dashboard:upload_cv'), fetch_redirect_response=False)
+        upload = PendingUpload.objects.get()
+        self.assertEqual((upload.status, upload.original_name), ('queued', 'cv.pdf'))
+        self.assertFalse(PersonalInfo.objects.get().resume)
+
+        response = self.client.get(reverse('dashboard:upload_cv'))
+        self.assertContains(response, 'Pending')
+        self.assertContains(response, 'http-equiv="refresh"')
+
+
+class ScheduledJobsPageTests(TestCase):
+    """Staff see scheduled jobs with their runs and can queue a run"""
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.staff = User.objects.create_user('staff', 'staff@example.com', 'password', is_staff=True)
+        cls.user = User.objects.create_user('user', 'user@example.com', 'password')
+        cls.job = ScheduledJob.objects.create(name='github-sync', command='sync_github_repos', schedule='@daily')
+        cls.job.runs.create(worker='web.1:42', status='failed', duration=1.5, output='Boom')
+
+    def test_lists_jobs_and_runs(self):
+        self.client.force_login(self.staff)
+        response = self.client.get(reverse('dashboard:jobs'))
+        self.assertContains(response, 'github-sync')
+        self.assertContains(response, 'Boom')
+
+    def test_staff_only(self):
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(reverse('dashboard:jobs')).status_code, 403)
+
+    def test_run_now(self):
+        self.client.force_login(self.staff)
+        response = self.client.post(reverse('dashboard:jobs'), {'job': self.job.pk})
+        self.assertRedirects(response, reverse('dashboard:jobs'))
+        self.job.refresh_from_db()
+        self.assertLessEqual(self.job.next_run_at, timezone.now())
+
+
+class ContactMessageListTests(TestCase):
+    """Messages are paged by cursor, keeping the filters"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user('owner', password='password')
+        ContactMessage.objects.bulk_create([
+            ContactMessage(name=f'Sender {i}', email='spam@example.com', subject='Hi', message='...',
+                           is_read=i % 2 == 0)
+            for i in range(50)
+        ])
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_pages(self):
+        response = self.client.get(reverse('dashboard:messages'), {'status': 'unread'})
+        page = response.context['page_obj']
+        self.assertEqual(len(page), 20)
+        self.assertContains(response, f'?status=unread&amp;cursor={page.next_cursor}')
+        self.assertEqual((response.context['total_messages'], response.context['unread_count']), (50, 25))
+
+        response = self.client.get(reverse('dashboard:messages'), {'status': 'unread', 'cursor': page.next_cursor})
+        last = response.context['page_obj']
+        self.assertEqual(len(last), 5)
+        self.assertFalse(last.has_next())
+        seen = {message.pk for message in list(page) + list(last)}
+        self.assertEqual(seen, set(ContactMessage.objects.filter(is_read=False).values_list('pk', flat=True)))
+
+    @override_settings(PORTFOLIO_APPROXIMATE_COUNTS=True)
+    def test_approximate_counts_are_exact_for_small_tables(self):
+        response = self.client.get(reverse('dashboard:messages'))
+        self.assertTrue(response.context['counts_exact'])
+        self.assertContains(response, 'Total: 50')
@@ -11,6 +11,8 @@ urlpatterns = [
     
     # Dashboard URLs
     path('', views.DashboardHomeView.as_view(), name='home'),
+    path('performance/', views.PerformanceView.as_view(), name='performance'),
+    path('jobs/', views.ScheduledJobsView.as_view(), name='jobs'),
     
     # Personal Information URLs
     path('personal-info/', views.EnhancedPersonalInfoUpdateView.as_view(), name='personal_info'),
@@ -1,20 +1,26 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.views import LoginView
-from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.contrib.auth.decorators import login_required
 from django.views.generic import (
     TemplateView, ListView, CreateView, UpdateView, DeleteView, DetailView
 )
 from django.urls import reverse_lazy
+from django.conf import settings
 from django.contrib import messages
 from django.db.models import Count, Q
 from django.utils import timezone
+from django.core.files.uploadedfile import UploadedFile
 from datetime import timedelta
 
+from portfolio_project.metrics import histogram, bucket_labels
 from portfolio.models import (
     PersonalInfo, Project, BlogPost, ContactMessage, Education, 
-    Certification, Award, SEOSettings, Testimonial, Skill, CareerTimeline, FooterLink
+    Certification, Award, SEOSettings, Testimonial, Skill, CareerTimeline, FooterLink,
+    ScheduledJob, JobRun
 )
+from portfolio.pagination import CursorPaginationMixin, approximate_count
+from portfolio.uploads import queue_upload
 from .forms import (
     CustomLoginForm, EnhancedPersonalInfoForm, ProjectForm, BlogPostForm, CVUploadForm,
     EducationForm, CertificationForm, AwardForm, SEOForm, TestimonialForm,
@@ -40,26 +46,82 @@ class DashboardHomeView(LoginRequiredMixin, TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         
-        # Get statistics
+        # Get statistics (one aggregate query per model)
+        projects = Project.objects.aggregate(
+            total=Count('id'), featured=Count('id', filter=Q(is_featured=True))
+        )
+        posts = BlogPost.objects.aggregate(
+            total=Count('id'), published=Count('id', filter=Q(is_published=True))
+        )
+        contact_messages = ContactMessage.objects.aggregate(
+            unread=Count('id', filter=Q(is_read=False)),
+            recent=Count('id', filter=Q(created__gte=timezone.now() - timedelta(days=7))),
+        )
         context['stats'] = {
-            'total_projects': Project.objects.count(),
-            'featured_projects': Project.objects.filter(is_featured=True).count(),
-            'total_blog_posts': BlogPost.objects.count(),
-            'published_posts': BlogPost.objects.filter(is_published=True).count(),
-            'unread_messages': ContactMessage.objects.filter(is_read=False).count(),
-            'recent_messages': ContactMessage.objects.filter(
-                created__gte=timezone.now() - timedelta(days=7)
-            ).count(),
+            'total_projects': projects['total'],
+            'featured_projects': projects['featured'],
+            'total_blog_posts': posts['total'],
+            'published_posts': posts['published'],
+            'unread_messages': contact_messages['unread'],
+            'recent_messages': contact_messages['recent'],
         }
         
         # Recent activity
-        context['recent_projects'] = Project.objects.order_by('-created_at')[:3]
-        context['recent_posts'] = BlogPost.objects.order_by('-created')[:3]
-        context['recent_messages'] = ContactMessage.objects.order_by('-created')[:5]
+        context['recent_projects'] = Project.objects.only(
+            'title', 'is_featured', 'created_at'
+        ).order_by('-created_at')[:3]
+        context['recent_posts'] = BlogPost.objects.only(
+            'title', 'is_published', 'created'
+        ).order_by('-created')[:3]
+        context['recent_messages'] = ContactMessage.objects.defer('message').order_by('-created')[:5]
         
         return context
 
 
+class PerformanceView(LoginRequiredMixin, UserPassesTestMixin, TemplateView):
+    """Staff-only request timings per URL, from the performance middleware"""
+    template_name = 'dashboard/performance.html'
+    login_url = reverse_lazy('dashboard:login')
+    
+    def test_func(self):
+        return self.request.user.is_staff
+    
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['routes'] = histogram.snapshot()
+        context['bucket_labels'] = bucket_labels()
+        context['window_size'] = histogram.size
+        return context
+    
+    def post(self, request, *args, **kwargs):
+        """Clear the collected timings"""
+        histogram.reset()
+        messages.success(request, 'Performance statistics reset.')
+        return redirect('dashboard:performance')
+
+
+
+class ScheduledJobsView(LoginRequiredMixin, UserPassesTestMixin, TemplateView):
+    """Staff-only list of scheduled jobs and their recent runs"""
+    template_name = 'dashboard/jobs.html'
+    login_url = reverse_lazy('dashboard:login')
+    
+    def test_func(self):
+        return self.request.user.is_staff
+    
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['jobs'] = ScheduledJob.objects.all()
+        context['runs'] = JobRun.objects.select_related('job')[:50]
+        return context
+    
+    def post(self, request, *args, **kwargs):
+        """Make a job due for the next scheduler poll"""
+        job = get_object_or_404(ScheduledJob, pk=request.POST.get('job'), enabled=True)
+        ScheduledJob.objects.filter(pk=job.pk).update(next_run_at=timezone.now())
+        messages.success(request, f'"{job.name}" will run on the next scheduler poll.')
+        return redirect('dashboard:jobs')
+
 # This view is deprecated - use EnhancedPersonalInfoUpdateView instead
 # class PersonalInfoUpdateView(LoginRequiredMixin, UpdateView):
 #     """Update personal information"""
@@ -97,7 +159,22 @@ class UploadCVView(LoginRequiredMixin, UpdateView):
         )
         return personal_info
     
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        # Uploads still being moved into storage (see portfolio/uploads.py)
+        context['pending_uploads'] = list(self.object.pending_uploads.exclude(status='done')[:3])
+        context['uploads_in_progress'] = any(
+            upload.status in ('queued', 'uploading') for upload in context['pending_uploads']
+        )
+        return context
+    
     def form_valid(self, form):
+        resume = form.cleaned_data.get('resume')
+        if isinstance(resume, UploadedFile):
+            # The upload finishes in the background; this page shows its progress
+            queue_upload(self.object, 'resume', resume)
+            messages.info(self.request, 'CV/Resume received and is being uploaded.')
+            return redirect('dashboard:upload_cv')
         messages.success(self.request, 'CV/Resume uploaded successfully!')
         return super().form_valid(form)
 
@@ -112,7 +189,7 @@ class ProjectListView(LoginRequiredMixin, ListView):
     login_url = reverse_lazy('dashboard:login')
     
     def get_queryset(self):
-        queryset = Project.objects.all().order_by('-created_at')
+        queryset = Project.objects.for_listing().order_by('-created_at')
         search = self.request.GET.get('search')
         if search:
             queryset = queryset.filter(
@@ -169,7 +246,7 @@ class BlogPostListView(LoginRequiredMixin, ListView):
     login_url = reverse_lazy('dashboard:login')
     
     def get_queryset(self):
-        queryset = BlogPost.objects.all().order_by('-created')
+        queryset = BlogPost.objects.for_listing().order_by('-created')
         search = self.request.GET.get('search')
         if search:
             queryset = queryset.filter(
@@ -217,16 +294,19 @@ class BlogPostDeleteView(LoginRequiredMixin, DeleteView):
 
 
 # Contact Message Views
-class ContactMessageListView(LoginRequiredMixin, ListView):
+class ContactMessageListView(LoginRequiredMixin, CursorPaginationMixin, ListView):
     """List all contact messages with enhanced management"""
     model = ContactMessage
     template_name = 'dashboard/messages/list.html'
     context_object_name = 'messages'
     paginate_by = 20
     login_url = reverse_lazy('dashboard:login')
+    # Spam makes this table large, so pages are fetched by cursor
+    cursor_pagination = True
+    cursor_ordering = ('-created', '-id')
     
     def get_queryset(self):
-        queryset = ContactMessage.objects.all().order_by('-created')
+        queryset = ContactMessage.objects.defer('message').order_by(*self.cursor_ordering)
         
         # Filter by read/unread status
         status = self.request.GET.get('status')
@@ -249,8 +329,18 @@ class ContactMessageListView(LoginRequiredMixin, ListView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['total_messages'] = ContactMessage.objects.count()
-        context['unread_count'] = ContactMessage.objects.filter(is_read=False).count()
+        if getattr(settings, 'PORTFOLIO_APPROXIMATE_COUNTS', False):
+            total, total_exact = approximate_count(ContactMessage.objects.all())
+            unread, unread_exact = approximate_count(ContactMessage.objects.filter(is_read=False))
+            context['counts_exact'] = total_exact and unread_exact
+        else:
+            counts = ContactMessage.objects.aggregate(
+                total=Count('id'), unread=Count('id', filter=Q(is_read=False))
+            )
+            total, unread = counts['total'], counts['unread']
+            context['counts_exact'] = True
+        context['total_messages'] = total
+        context['unread_count'] = unread
         context['current_status'] = self.request.GET.get('status', '')
         context['current_search'] = self.request.GET.get('search', '')
         return context
@@ -560,13 +650,7 @@ class SkillListView(LoginRequiredMixin, ListView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         # Group skills by category
-        context['skills_by_category'] = {}
-        for choice in Skill.SKILL_CATEGORIES:
-            category_key = choice[0]
-            category_name = choice[1]
-            skills = Skill.objects.filter(category=category_key).order_by('order', 'name')
-            if skills.exists():
-                context['skills_by_category'][category_name] = skills
+        context['skills_by_category'] = Skill.get_grouped()
         return context
 
 
@@ -666,13 +750,7 @@ class FooterLinkListView(LoginRequiredMixin, ListView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         # Group links by category
-        context['links_by_category'] = {}
-        for choice in FooterLink.LINK_CATEGORIES:
-            category_key = choice[0]
-            category_name = choice[1]
-            links = FooterLink.objects.filter(category=category_key, is_active=True).order_by('order', 'title')
-            if links.exists():
-                context['links_by_category'][category_name] = links
+        context['links_by_category'] = FooterLink.get_grouped()
         return context
 
 
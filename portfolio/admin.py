@@ -1,23 +1,38 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
 from django.utils.html import format_html
 from django.utils.safestring import mark_safe
 from django.urls import reverse
 from django.http import HttpResponseRedirect
+from django.utils import timezone
 from .models import (
     Tag, Project, Testimonial, 
-    ContactMessage, BlogPost
+    ContactMessage, BlogPost, OutgoingEmail, PendingUpload, ScheduledJob, JobRun
 )
+from . import uploads
+from .images import rendition_url
+
+
+class ListingChangeList(ChangeList):
+    """Change list that loads its rows through the model's for_listing() queryset"""
+    
+    def get_queryset(self, request, *args, **kwargs):
+        return super().get_queryset(request, *args, **kwargs).for_listing()
 
 
 @admin.register(Tag)
 class TagAdmin(admin.ModelAdmin):
-    list_display = ['name', 'project_count']
+    list_display = ['name', 'project_count', 'post_count']
     search_fields = ['name']
     ordering = ['name']
     
+    def get_queryset(self, request):
+        # Counts are annotated once instead of a COUNT query per row
+        return super().get_queryset(request).with_counts()
+    
     def project_count(self, obj):
         """Display number of projects using this tag"""
-        count = obj.project_set.count()
+        count = obj.project_count
         if count > 0:
             url = reverse('admin:portfolio_project_changelist') + f'?tags__id__exact={obj.id}'
             return format_html('<a href="{}">{} project{}</a>', 
@@ -25,6 +40,12 @@ class TagAdmin(admin.ModelAdmin):
         return '0 projects'
     project_count.short_description = 'Projects'
     project_count.admin_order_field = 'project_count'
+    
+    def post_count(self, obj):
+        """Display number of blog posts using this tag"""
+        return obj.post_count
+    post_count.short_description = 'Blog posts'
+    post_count.admin_order_field = 'post_count'
 
 
 @admin.register(Project)
@@ -58,7 +79,7 @@ class ProjectAdmin(admin.ModelAdmin):
         if obj.image:
             return format_html(
                 '<img src="{}" style="width: 50px; height: 50px; object-fit: cover; border-radius: 4px;" />',
-                obj.image.url
+                rendition_url(obj.image, 100) or obj.image.url
             )
         return 'No image'
     image_thumbnail.short_description = 'Image'
@@ -68,7 +89,7 @@ class ProjectAdmin(admin.ModelAdmin):
         if obj.image:
             return format_html(
                 '<img src="{}" style="max-width: 300px; max-height: 300px; object-fit: contain;" />',
-                obj.image.url
+                rendition_url(obj.image, 600) or obj.image.url
             )
         return 'No image uploaded'
     image_preview.short_description = 'Image Preview'
@@ -98,6 +119,9 @@ class ProjectAdmin(admin.ModelAdmin):
         )
     unmark_as_featured.short_description = 'Unmark selected projects as featured'
     
+    def get_changelist(self, request, **kwargs):
+        return ListingChangeList
+    
     def get_readonly_fields(self, request, obj=None):
         readonly = list(self.readonly_fields)
         if obj:  # editing an existing object
@@ -126,7 +150,7 @@ class TestimonialAdmin(admin.ModelAdmin):
         if obj.avatar:
             return format_html(
                 '<img src="{}" style="width: 40px; height: 40px; object-fit: cover; border-radius: 50%;" />',
-                obj.avatar.url
+                rendition_url(obj.avatar, 80) or obj.avatar.url
             )
         return 'No avatar'
     avatar_thumbnail.short_description = 'Avatar'
@@ -136,7 +160,7 @@ class TestimonialAdmin(admin.ModelAdmin):
         if obj.avatar:
             return format_html(
                 '<img src="{}" style="max-width: 200px; max-height: 200px; object-fit: contain; border-radius: 8px;" />',
-                obj.avatar.url
+                rendition_url(obj.avatar, 400) or obj.avatar.url
             )
         return 'No avatar uploaded'
     avatar_preview.short_description = 'Avatar Preview'
@@ -162,19 +186,20 @@ class TestimonialAdmin(admin.ModelAdmin):
 
 @admin.register(ContactMessage)
 class ContactMessageAdmin(admin.ModelAdmin):
-    list_display = ['name', 'email', 'subject', 'is_read', 'created']
-    list_filter = ['is_read', 'created']
+    list_display = ['name', 'email', 'subject', 'is_read', 'notification_status', 'auto_reply_status', 'created']
+    list_filter = ['is_read', 'notification_status', 'created']
     search_fields = ['name', 'email', 'subject', 'message']
     list_editable = ['is_read']
     actions = ['mark_as_read', 'mark_as_unread']
     date_hierarchy = 'created'
-    readonly_fields = ['name', 'email', 'subject', 'message', 'created']
+    readonly_fields = ['name', 'email', 'subject', 'message', 'created', 'notification_status', 'auto_reply_status']
     fields = [
         ('name', 'email'),
         'subject',
         'message',
         'is_read',
-        'created'
+        'created',
+        ('notification_status', 'auto_reply_status'),
     ]
     
     def mark_as_read(self, request, queryset):
@@ -200,10 +225,96 @@ class ContactMessageAdmin(admin.ModelAdmin):
         return False
 
 
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = ['subject', 'kind', 'to', 'status', 'attempts', 'next_attempt_at', 'sent_at']
+    list_filter = ['status', 'kind']
+    search_fields = ['subject', 'to']
+    list_select_related = ['contact_message']
+    actions = ['retry_now']
+    readonly_fields = [
+        'contact_message', 'kind', 'subject', 'body', 'from_email', 'to', 'status',
+        'attempts', 'next_attempt_at', 'last_error', 'created', 'sent_at'
+    ]
+    
+    def retry_now(self, request, queryset):
+        """Queue failed or waiting emails for the next worker poll"""
+        updated = queryset.exclude(status='sent').update(
+            status='queued', attempts=0, next_attempt_at=timezone.now()
+        )
+        self.message_user(
+            request,
+            f'{updated} email{"s" if updated != 1 else ""} queued for sending.'
+        )
+    retry_now.short_description = 'Retry selected emails now'
+    
+    def has_add_permission(self, request):
+        # Emails are queued by the contact form
+        return False
+
+
+@admin.register(PendingUpload)
+class PendingUploadAdmin(admin.ModelAdmin):
+    list_display = ['original_name', 'field_name', 'personal_info', 'status', 'progress', 'attempts', 'created', 'finished_at']
+    list_filter = ['status', 'field_name']
+    search_fields = ['original_name']
+    list_select_related = ['personal_info']
+    actions = ['retry_now']
+    readonly_fields = [
+        'personal_info', 'field_name', 'staged_name', 'original_name', 'size', 'bytes_uploaded',
+        'status', 'attempts', 'next_attempt_at', 'last_error', 'created', 'finished_at'
+    ]
+    
+    def progress(self, obj):
+        return f'{obj.progress}%'
+    progress.short_description = 'Progress'
+    
+    def retry_now(self, request, queryset):
+        """Queue failed uploads whose staged file is still on disk"""
+        updated = uploads.retry(queryset)
+        self.message_user(
+            request,
+            f'{updated} upload{"s" if updated != 1 else ""} queued for upload.'
+        )
+    retry_now.short_description = 'Retry selected uploads'
+    
+    def has_add_permission(self, request):
+        # Uploads are queued by the dashboard
+        return False
+
+
+class JobRunInline(admin.TabularInline):
+    model = JobRun
+    extra = 0
+    max_num = 0
+    can_delete = False
+    fields = ['started_at', 'status', 'duration', 'worker', 'output']
+    readonly_fields = fields
+
+
+@admin.register(ScheduledJob)
+class ScheduledJobAdmin(admin.ModelAdmin):
+    list_display = ['name', 'command', 'arguments', 'schedule', 'enabled', 'next_run_at', 'last_run_at', 'last_status', 'locked_by']
+    list_filter = ['enabled', 'last_status']
+    search_fields = ['name', 'command']
+    readonly_fields = ['locked_until', 'locked_by', 'last_run_at', 'last_status']
+    inlines = [JobRunInline]
+    actions = ['run_now']
+    
+    def run_now(self, request, queryset):
+        """Make jobs due for the next scheduler poll"""
+        updated = queryset.filter(enabled=True).update(next_run_at=timezone.now())
+        self.message_user(
+            request,
+            f'{updated} job{"s" if updated != 1 else ""} queued for the scheduler.'
+        )
+    run_now.short_description = 'Run selected jobs now'
+
+
 @admin.register(BlogPost)
 class BlogPostAdmin(admin.ModelAdmin):
     list_display = ['image_thumbnail', 'title', 'excerpt_preview', 'is_published', 'created', 'updated']
-    list_filter = ['is_published', 'created', 'updated']
+    list_filter = ['is_published', 'tags', 'created', 'updated']
     search_fields = ['title', 'body', 'excerpt']
     list_editable = ['is_published']
     prepopulated_fields = {'slug': ('title',)}
@@ -217,9 +328,10 @@ class BlogPostAdmin(admin.ModelAdmin):
             'fields': ['image', 'image_preview']
         }),
         ('Metadata', {
-            'fields': ['is_published']
+            'fields': ['tags', 'is_published']
         })
     ]
+    filter_horizontal = ['tags']
     readonly_fields = ['created', 'updated', 'image_preview']
     
     def image_thumbnail(self, obj):
@@ -227,7 +339,7 @@ class BlogPostAdmin(admin.ModelAdmin):
         if obj.image:
             return format_html(
                 '<img src="{}" style="width: 50px; height: 50px; object-fit: cover; border-radius: 4px;" />',
-                obj.image.url
+                rendition_url(obj.image, 100) or obj.image.url
             )
         return 'No image'
     image_thumbnail.short_description = 'Image'
@@ -237,11 +349,14 @@ class BlogPostAdmin(admin.ModelAdmin):
         if obj.image:
             return format_html(
                 '<img src="{}" style="max-width: 300px; max-height: 300px; object-fit: contain;" />',
-                obj.image.url
+                rendition_url(obj.image, 600) or obj.image.url
             )
         return 'No image uploaded'
     image_preview.short_description = 'Image Preview'
     
+    def get_changelist(self, request, **kwargs):
+        return ListingChangeList
+    
     def excerpt_preview(self, obj):
         """Display truncated excerpt"""
         if obj.excerpt:
@@ -4,3 +4,17 @@ from django.apps import AppConfig
 class PortfolioConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "portfolio"
+
+    def ready(self):
+        """Wire cache invalidation, search, related content and image renditions to model changes"""
+        from .signals import (
+            connect_cache_signals, connect_search_signals, connect_related_signals,
+            connect_image_signals,
+        )
+        connect_cache_signals()
+        connect_search_signals()
+        connect_related_signals()
+        connect_image_signals()
+        
+        # Register the deploy-time static files checks
+        from . import checks  # noqa: F401
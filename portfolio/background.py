@@ -0,0 +1,77 @@
+"""
+Debounced work on background threads of the web process.
+
+``debounce(key, delay, fn, item)`` calls ``fn(items)`` on a daemon thread
+``delay`` seconds later. Calls with the same ``key`` made before that run
+starts join it, adding their ``item`` to the list ``fn`` receives, so a
+burst of saves is handled once. Calls made while ``fn`` runs schedule the
+next run. ``debounce_on_commit()`` does the same once the current
+transaction commits, so the thread never reads rows that are not visible
+yet and a rolled back request queues nothing.
+
+Threads are lost with their process; every caller has a scheduler job or
+management command that catches up on work that was queued but never run.
+"""
+import logging
+import threading
+from collections import namedtuple
+
+from django.db import connections, transaction
+
+logger = logging.getLogger(__name__)
+
+Task = namedtuple('Task', ['timer', 'fn', 'items'])
+
+_tasks = {}
+_lock = threading.Lock()
+
+
+def debounce(key, delay, fn, item=None):
+    """Call ``fn(items)`` on a background thread after ``delay`` seconds, once per burst of calls"""
+    with _lock:
+        task = _tasks.get(key)
+        if task is None:
+            task = _tasks[key] = Task(_start_timer(delay, key), fn, [])
+        if item is not None:
+            task.items.append(item)
+        return task.timer
+
+
+def debounce_on_commit(key, delay, fn, item=None):
+    """``debounce()`` once the current transaction commits"""
+    transaction.on_commit(lambda: debounce(key, delay, fn, item))
+
+
+def _start_timer(delay, key):
+    timer = threading.Timer(delay, _run, [key])
+    timer.daemon = True
+    timer.start()
+    return timer
+
+
+def _take(key):
+    with _lock:
+        return _tasks.pop(key, None)
+
+
+def flush(key):
+    """Run ``key``'s queued call now on this thread; returns its result, or None when nothing is queued"""
+    task = _take(key)
+    if task is None:
+        return None
+    task.timer.cancel()
+    return task.fn(task.items)
+
+
+def _run(key):
+    task = _take(key)
+    if task is None:
+        # Flushed before the timer fired
+        return
+    try:
+        task.fn(task.items)
+    except Exception:
+        logger.exception(f"Background task {key} failed")
+    finally:
+        # The thread opened its own database connections
+        connections.close_all()
@@ -0,0 +1,116 @@
+"""
+Versioned caching for public page data.
+
+Every model in the portfolio app owns a generation counter stored in the
+cache. Cached values are keyed on the generations of the models they were
+built from, so bumping a counter (see ``portfolio.signals``) makes every
+dependent entry unreachable at once without having to track individual keys.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.query import QuerySet
+
+from portfolio_project.metrics import record_cache
+
+CACHE_PREFIX = 'portfolio'
+CACHE_TIMEOUT = getattr(settings, 'PORTFOLIO_CACHE_TIMEOUT', 3600)
+
+CONTENT_GENERATION_KEY = f'{CACHE_PREFIX}:gen:content'
+
+# Backends whose entries live inside one process: bumping a generation in one
+# web worker does not reach the others
+PROCESS_LOCAL_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+_MISSING = object()
+
+
+def _new_generation():
+    # Time-based seed so a counter evicted from the cache never restarts
+    # at a value that older entries were keyed with
+    return int(time.time() * 1000)
+
+
+def is_shared_cache():
+    """Whether every process uses the same default cache (Redis, memcached, database)"""
+    backend = settings.CACHES.get('default', {}).get('BACKEND', '')
+    return backend not in PROCESS_LOCAL_BACKENDS
+
+
+def generation_key(model):
+    """Return the cache key holding the generation counter of a model"""
+    return f'{CACHE_PREFIX}:gen:{model._meta.label_lower}'
+
+
+def get_generations(*models):
+    """Return the current generation of each model, seeding missing counters"""
+    keys = [generation_key(model) for model in models]
+    found = cache.get_many(keys)
+    missing = [key for key in keys if key not in found]
+    if missing:
+        for key in missing:
+            cache.add(key, _new_generation(), None)
+        found.update(cache.get_many(missing))
+    return [found.get(key, 0) for key in keys]
+
+
+def bump_generation(model):
+    """Invalidate every cached value built from the given model"""
+    key = generation_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _new_generation(), None)
+
+
+def get_content_generation():
+    """Return the site-wide content generation used by the page cache"""
+    key = CONTENT_GENERATION_KEY
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, _new_generation(), None)
+        generation = cache.get(key, 0)
+    return generation
+
+
+def bump_content_generation():
+    """Invalidate every cached page at once"""
+    try:
+        cache.incr(CONTENT_GENERATION_KEY)
+    except ValueError:
+        cache.set(CONTENT_GENERATION_KEY, _new_generation(), None)
+
+
+def make_key(name, models, parts=()):
+    """Build a cache key for ``name`` that changes whenever a model changes"""
+    generations = '.'.join(str(gen) for gen in get_generations(*models))
+    key = f'{CACHE_PREFIX}:{name}:{generations}'
+    if parts:
+        # Request values (search terms, tags) may not be safe as raw cache keys
+        digest = hashlib.md5('|'.join(str(part) for part in parts).encode()).hexdigest()
+        key = f'{key}:{digest}'
+    return key
+
+
+def get_or_build(name, models, builder, parts=(), timeout=None):
+    """
+    Return the cached value for ``name`` or build and store it.
+
+    ``models`` lists every model the value is read from; ``builder`` is called
+    without arguments on a miss. Querysets are evaluated before being stored
+    so the cache never holds a lazy query.
+    """
+    key = make_key(name, models, parts)
+    value = cache.get(key, _MISSING)
+    record_cache(hit=value is not _MISSING)
+    if value is _MISSING:
+        value = builder()
+        if isinstance(value, QuerySet):
+            value = list(value)
+        cache.set(key, value, CACHE_TIMEOUT if timeout is None else timeout)
+    return value
@@ -0,0 +1,59 @@
+"""
+Startup checks for the production static pipeline.
+
+With manifest storage, ``{% static %}`` raises for any file missing from
+``staticfiles.json``, so a deploy that skipped collectstatic would only fail
+on the first page view. ``verify_static_manifest()`` is called by the WSGI
+entry point so the web process fails fast instead; the same checks run with
+``manage.py check --deploy``. They are not registered as regular checks
+because collectstatic, which writes the manifest, runs staticfiles checks
+first.
+"""
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestFilesMixin, staticfiles_storage
+from django.core.checks import Error, Warning, register
+from django.core.exceptions import ImproperlyConfigured
+
+# Assets every public page links to
+REQUIRED_ASSETS = ['css/styles.css', 'js/main.js']
+
+
+@register(deploy=True)
+def check_static_manifest(app_configs=None, **kwargs):
+    """Hashed static files must be collected before the site is served"""
+    if settings.DEBUG or not isinstance(staticfiles_storage, ManifestFilesMixin):
+        return []
+    
+    manifest_storage = staticfiles_storage.manifest_storage
+    if not manifest_storage.exists(staticfiles_storage.manifest_name):
+        return [Error(
+            f'Static files manifest {staticfiles_storage.manifest_name} not found in {settings.STATIC_ROOT}.',
+            hint='Run "manage.py build_assets" and "manage.py collectstatic" during the build.',
+            id='portfolio.E001',
+        )]
+    
+    missing = [name for name in REQUIRED_ASSETS if name not in staticfiles_storage.hashed_files]
+    if missing:
+        return [Error(
+            f'Static files manifest has no entry for {", ".join(missing)}.',
+            hint='Re-run "manage.py collectstatic" from an up-to-date checkout.',
+            id='portfolio.E002',
+        )]
+    
+    errors = []
+    try:
+        import brotli  # noqa: F401
+    except ImportError:
+        errors.append(Warning(
+            'Brotli is not installed, so collectstatic only writes gzip copies of static files.',
+            hint='pip install Brotli',
+            id='portfolio.W001',
+        ))
+    return errors
+
+
+def verify_static_manifest():
+    """Raise ImproperlyConfigured if the static files manifest is missing or stale"""
+    for message in check_static_manifest():
+        if message.is_serious():
+            raise ImproperlyConfigured(f'{message.msg} {message.hint}')
@@ -0,0 +1,258 @@
+"""
+Concurrent, resumable migration of local media to Cloudinary.
+
+Used by ``manage.py migrate_images_to_cloudinary``. Files are hashed and
+uploaded on a thread pool; files with identical content are uploaded once
+and every field holding them points at the same upload. Finished uploads
+are recorded in a JSON manifest, which is saved every few files together
+with ``bulk_update`` writes of the migrated fields, so a rerun after a
+failure or interruption only processes what is left.
+
+Resume files stay local and are never migrated.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.conf import settings
+
+from .cache import bump_content_generation, bump_generation
+from .models import Project, Testimonial, BlogPost, PersonalInfo, Certification, Award, SEOSettings
+
+logger = logging.getLogger(__name__)
+
+# Image fields to migrate, with the Cloudinary folder for each instance
+MIGRATION_FIELDS = [
+    (Project, 'image', lambda project: f'projects/{project.slug}'),
+    (Testimonial, 'avatar', lambda testimonial: f'testimonials/{testimonial.id}'),
+    (BlogPost, 'image', lambda post: f'blog/{post.slug}'),
+    (PersonalInfo, 'profile_image', lambda info: f'profile/{info.id}'),
+    (Certification, 'certificate_image', lambda cert: f'certifications/{cert.id}'),
+    (Award, 'award_image', lambda award: f'awards/{award.id}'),
+    (SEOSettings, 'og_image', lambda seo: f'seo/{seo.page}'),
+]
+
+DEFAULT_CONCURRENCY = getattr(settings, 'PORTFOLIO_CLOUDINARY_MIGRATION_CONCURRENCY', 8)
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+MigrationItem = namedtuple('MigrationItem', ['model', 'pk', 'field_name', 'name', 'path', 'folder'])
+
+
+def item_key(item):
+    """Manifest key of a model field, e.g. 'portfolio.project:3:image'"""
+    return f'{item.model._meta.label_lower}:{item.pk}:{item.field_name}'
+
+
+def file_hash(path):
+    """SHA-256 of a file's content, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def upload_file(path, folder):
+    """Upload one file; returns Cloudinary's upload result"""
+    import cloudinary.uploader
+
+    return cloudinary.uploader.upload(
+        path,
+        folder=folder,
+        resource_type="auto",  # Let Cloudinary detect the resource type
+        use_filename=True,
+        unique_filename=True,
+        overwrite=False
+    )
+
+
+class Manifest:
+    """
+    Checkpoint of a migration, saved as JSON.
+
+    ``uploads`` maps content hashes to their Cloudinary URL; ``done`` maps
+    migrated fields (see ``item_key``) to the hash and name written to them.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.uploads = {}
+        self.done = {}
+        if os.path.exists(path):
+            with open(path) as handle:
+                data = json.load(handle)
+            self.uploads = data.get('uploads', {})
+            self.done = data.get('done', {})
+
+    def save(self):
+        # Write then rename, so an interrupted save never corrupts the checkpoint
+        temporary = f'{self.path}.tmp'
+        with open(temporary, 'w') as handle:
+            json.dump({'uploads': self.uploads, 'done': self.done}, handle, indent=1, sort_keys=True)
+        os.replace(temporary, self.path)
+
+    def is_done(self, item):
+        """Whether the field still holds what the migration wrote to it"""
+        entry = self.done.get(item_key(item))
+        # Entries of older manifests hold only the hash and cannot be checked
+        return isinstance(entry, dict) and entry.get('name') == item.name
+
+
+class MigrationStats:
+    """Counters for the throughput summary"""
+
+    def __init__(self):
+        self.migrated = 0
+        self.uploaded = 0
+        self.deduplicated = 0
+        self.skipped = 0
+        self.failed = 0
+        self.bytes_uploaded = 0
+        self.elapsed = 0.0
+        self.failed_items = []
+
+    @property
+    def files_per_second(self):
+        return self.uploaded / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def megabytes_per_second(self):
+        return self.bytes_uploaded / 1024 / 1024 / self.elapsed if self.elapsed else 0.0
+
+
+class CloudinaryMigration:
+    """
+    Migrate image fields to Cloudinary on a pool of ``concurrency`` threads.
+
+    ``log`` receives one line per event (the command passes its stdout).
+    """
+
+    def __init__(self, manifest_path, concurrency=DEFAULT_CONCURRENCY, force=False,
+                 dry_run=False, checkpoint_every=10, upload=upload_file, log=None):
+        self.manifest = Manifest(manifest_path)
+        self.concurrency = max(1, concurrency)
+        self.force = force
+        self.dry_run = dry_run
+        self.checkpoint_every = checkpoint_every
+        self.upload = upload
+        self.log = log or logger.info
+        self.stats = MigrationStats()
+        self._pending = []
+        self._lock = threading.Lock()
+
+    def collect(self):
+        """Fields still to migrate; already migrated and missing files are counted, not returned"""
+        items = []
+        for model, field_name, folder in MIGRATION_FIELDS:
+            for instance in model.objects.exclude(**{field_name: ''}):
+                field = getattr(instance, field_name)
+                item = MigrationItem(
+                    model, instance.pk, field_name, field.name,
+                    os.path.join(settings.MEDIA_ROOT, field.name), folder(instance),
+                )
+                # A field replaced since it was migrated is migrated again
+                if not self.force and (self.manifest.is_done(item) or 'cloudinary' in field.name):
+                    self.stats.skipped += 1
+                elif not os.path.isfile(item.path):
+                    self._fail(item, 'File not found')
+                else:
+                    items.append(item)
+        return items
+
+    def run(self):
+        """Migrate everything left to do; returns the MigrationStats"""
+        start = time.perf_counter()
+        items = self.collect()
+        self.log(f'{len(items)} files to migrate with {self.concurrency} workers')
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            # Group fields by content so each distinct file is uploaded once
+            by_hash = defaultdict(list)
+            hashes = executor.map(self._hash, items)
+            for item, digest in zip(items, hashes):
+                if digest:
+                    by_hash[digest].append(item)
+
+            futures = {}
+            for digest, group in by_hash.items():
+                if digest in self.manifest.uploads and not self.force:
+                    self.stats.deduplicated += len(group)
+                    self._completed(digest, group)
+                elif self.dry_run:
+                    self.log(f'[DRY RUN] Would upload: {group[0].path} to folder: {group[0].folder}')
+                    self.stats.deduplicated += len(group) - 1
+                else:
+                    futures[executor.submit(self.upload, group[0].path, group[0].folder)] = (digest, group)
+
+            try:
+                for future in as_completed(futures):
+                    digest, group = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        for item in group:
+                            self._fail(item, e)
+                        continue
+                    self.stats.uploaded += 1
+                    self.stats.deduplicated += len(group) - 1
+                    self.stats.bytes_uploaded += os.path.getsize(group[0].path)
+                    self.manifest.uploads[digest] = {
+                        'url': result['secure_url'], 'public_id': result.get('public_id', ''),
+                    }
+                    self.log(f'✓ Uploaded {group[0].name} -> {result["secure_url"]}')
+                    self._completed(digest, group)
+            finally:
+                # Keep whatever finished, even when interrupted
+                for future in futures:
+                    future.cancel()
+                self.checkpoint()
+
+        self.stats.elapsed = time.perf_counter() - start
+        return self.stats
+
+    def _hash(self, item):
+        try:
+            return file_hash(item.path)
+        except OSError as e:
+            self._fail(item, e)
+            return None
+
+    def _fail(self, item, error):
+        with self._lock:
+            self.stats.failed += 1
+            self.stats.failed_items.append(f'{item.model.__name__} {item.pk} - {item.field_name}: {error}')
+
+    def _completed(self, digest, group):
+        if self.dry_run:
+            return
+        self._pending.extend((item, digest) for item in group)
+        if len(self._pending) >= self.checkpoint_every:
+            self.checkpoint()
+
+    def checkpoint(self):
+        """Write migrated fields to the database, then record them in the manifest"""
+        if self.dry_run or not self._pending:
+            return
+        pending, self._pending = self._pending, []
+
+        updates = defaultdict(list)
+        for item, digest in pending:
+            instance = item.model(pk=item.pk)
+            setattr(instance, item.field_name, self.manifest.uploads[digest]['url'])
+            updates[item.model, item.field_name].append(instance)
+        for (model, field_name), instances in updates.items():
+            model.objects.bulk_update(instances, [field_name])
+            # bulk_update sends no signals; invalidate cached pages directly
+            bump_generation(model)
+        bump_content_generation()
+
+        for item, digest in pending:
+            self.manifest.done[item_key(item)] = {'hash': digest, 'name': self.manifest.uploads[digest]['url']}
+        self.stats.migrated += len(pending)
+        self.manifest.save()
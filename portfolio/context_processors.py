@@ -1,31 +1,35 @@
+import logging
+
+from django.utils.functional import SimpleLazyObject
+
 from .models import PersonalInfo, FooterLink
 
+logger = logging.getLogger(__name__)
+
+
+def _footer_links_by_category():
+    try:
+        return FooterLink.get_grouped()
+    except Exception as e:
+        logger.warning(f"Footer links could not be loaded: {e}")
+        return {}
+
+
 def portfolio_context(request):
     """Add portfolio-wide context variables"""
     try:
         # Get active personal info
         personal_info = PersonalInfo.get_active()
         
-        # Get footer links grouped by category
-        footer_links_by_category = {}
-        for choice in FooterLink.LINK_CATEGORIES:
-            category_key = choice[0]
-            category_name = choice[1]
-            links = FooterLink.objects.filter(
-                category=category_key, 
-                is_active=True
-            ).order_by('order', 'title')
-            if links.exists():
-                footer_links_by_category[category_name] = links
-        
         return {
             'personal_info': personal_info,
             'portfolio_name': personal_info.portfolio_name if personal_info else 'My Portfolio',
-            'footer_links_by_category': footer_links_by_category,
+            # Resolved only when a template actually renders the footer
+            'footer_links_by_category': SimpleLazyObject(_footer_links_by_category),
         }
     except Exception as e:
         # If database isn't ready or there's an error, return minimal context
-        print(f"Warning: Context processor failed: {e}")
+        logger.warning(f"Context processor failed: {e}")
         return {
             'personal_info': None,
             'portfolio_name': 'My Portfolio',
@@ -0,0 +1,90 @@
+"""
+Cron expressions for scheduled jobs.
+
+Supports the five standard fields (minute, hour, day of month, month, day
+of week) with ``*``, numbers, ranges, lists and ``/step``, plus the
+``@hourly``, ``@daily``, ``@weekly`` and ``@monthly`` shortcuts. As in cron,
+when both day fields are restricted a day matching either one runs.
+Times are evaluated in the project time zone.
+"""
+from datetime import timedelta
+
+from django.utils import timezone
+
+ALIASES = {
+    '@hourly': '0 * * * *',
+    '@daily': '0 0 * * *',
+    '@midnight': '0 0 * * *',
+    '@weekly': '0 0 * * 0',
+    '@monthly': '0 0 1 * *',
+}
+
+# (lowest, highest) value of each field
+FIELD_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+# Give up looking for the next run after this long (e.g. "0 0 30 2 *")
+SEARCH_LIMIT = timedelta(days=366 * 5)
+
+
+def _parse_field(text, lowest, highest):
+    values = set()
+    for part in text.split(','):
+        part, _, step = part.partition('/')
+        if part == '*':
+            start, end = lowest, highest
+        elif '-' in part:
+            start, end = (int(value) for value in part.split('-', 1))
+        else:
+            start = end = int(part)
+        step = int(step) if step else 1
+        if not lowest <= start <= end <= highest or step < 1:
+            raise ValueError(f'{text!r} is outside {lowest}-{highest}')
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronSchedule:
+    """A parsed cron expression; raises ValueError if it is invalid"""
+
+    def __init__(self, expression):
+        self.expression = expression.strip()
+        fields = ALIASES.get(self.expression, self.expression).split()
+        if len(fields) != 5:
+            raise ValueError('A cron expression has five fields: minute hour day month weekday')
+        try:
+            (self.minutes, self.hours, self.days, self.months, weekdays) = [
+                _parse_field(field, *limits) for field, limits in zip(fields, FIELD_RANGES)
+            ]
+        except ValueError as e:
+            raise ValueError(f'Invalid cron expression {expression!r}: {e}')
+        # 0 and 7 both mean Sunday; Python counts Monday as 0
+        self.weekdays = {(day - 1) % 7 for day in weekdays}
+        self.any_day = fields[2] == '*'
+        self.any_weekday = fields[4] == '*'
+
+    def __str__(self):
+        return self.expression
+
+    def _day_matches(self, moment):
+        day = moment.day in self.days
+        weekday = moment.weekday() in self.weekdays
+        if self.any_day or self.any_weekday:
+            return day and weekday
+        return day or weekday
+
+    def next_after(self, moment=None):
+        """First matching minute strictly after ``moment`` (default: now), or None"""
+        moment = timezone.localtime(moment or timezone.now())
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + SEARCH_LIMIT
+        while candidate < limit:
+            if candidate.month not in self.months or not self._day_matches(candidate):
+                candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+            elif candidate.hour not in self.hours:
+                candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                # Re-localize in case the search crossed a DST change
+                return timezone.localtime(candidate)
+        return None
@@ -0,0 +1,330 @@
+"""
+Incremental GitHub repository sync.
+
+Used by ``manage.py sync_github_repos``. Every API request is conditional:
+the ETag and body of the last response to each URL are stored in
+``GitHubResponse``, sent back as ``If-None-Match``, and replayed when GitHub
+answers 304 Not Modified, which does not count against the rate limit. The
+repository list is followed page by page through the ``Link`` header, and
+each repository's topics and languages are fetched concurrently over one
+pooled session.
+
+All database writes happen in one transaction with bulk queries; since
+those skip model signals, the related-content index, search vectors and
+page cache are refreshed here afterwards.
+"""
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.utils import timezone
+from django.utils.text import slugify
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .cache import bump_content_generation, bump_generation
+from .models import GitHubResponse, Project, Tag
+from .related import rebuild
+from .search import is_postgres, update_search_vector
+
+logger = logging.getLogger(__name__)
+
+API_URL = getattr(settings, 'PORTFOLIO_GITHUB_API_URL', 'https://api.github.com')
+DEFAULT_CONCURRENCY = getattr(settings, 'PORTFOLIO_GITHUB_CONCURRENCY', 8)
+
+# Seconds to wait for GitHub to connect and to answer
+TIMEOUT = (5, 30)
+
+PAGE_SIZE = 100
+
+
+class GitHubClient:
+    """
+    Pooled GitHub API session making conditional requests.
+
+    Cached responses are loaded once; new ones are collected and written by
+    ``save()`` so threads never touch the database.
+    """
+
+    def __init__(self, token=None, api_url=None, concurrency=DEFAULT_CONCURRENCY):
+        self.api_url = (api_url or API_URL).rstrip('/')
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=max(1, concurrency),
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(502, 503, 504)),
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'Accept': 'application/vnd.github+json',
+            'X-GitHub-Api-Version': '2022-11-28',
+        })
+        if token:
+            self.session.headers['Authorization'] = f'Bearer {token}'
+        self.cached = {response.url: response for response in GitHubResponse.objects.all()}
+        self.changed = {}
+        self.requests = 0
+        self.not_modified = 0
+        self._lock = threading.Lock()
+
+    def get(self, url):
+        """
+        JSON body of ``url`` and the URL of its next page ('' on the last page).
+
+        A 304 replays the stored body; other errors raise requests exceptions.
+        """
+        cached = self.cached.get(url)
+        headers = {'If-None-Match': cached.etag} if cached and cached.etag else {}
+        response = self.session.get(url, headers=headers, timeout=TIMEOUT)
+        with self._lock:
+            self.requests += 1
+            if response.status_code == 304 and cached:
+                self.not_modified += 1
+                return cached.data, cached.next_url
+
+        response.raise_for_status()
+        data = response.json()
+        next_url = response.links.get('next', {}).get('url', '')
+        with self._lock:
+            self.changed[url] = GitHubResponse(
+                url=url, etag=response.headers.get('ETag', ''), data=data, next_url=next_url,
+            )
+        return data, next_url
+
+    def save(self):
+        """Store new responses for the next run's conditional requests"""
+        if self.changed:
+            GitHubResponse.objects.bulk_create(
+                list(self.changed.values()),
+                update_conflicts=True,
+                unique_fields=['url'],
+                update_fields=['etag', 'data', 'next_url', 'updated'],
+            )
+            self.cached.update(self.changed)
+            self.changed = {}
+
+    def close(self):
+        self.session.close()
+
+
+class SyncResult:
+    """Counters for the command's summary"""
+
+    def __init__(self):
+        self.fetched = 0
+        self.created = []
+        self.updated = []
+        self.unchanged = 0
+        self.requests = 0
+        self.not_modified = 0
+
+
+def get_tech_stack(repo_data, languages, topics):
+    """Comma-separated languages (largest first) and topics of a repository"""
+    tech_stack = []
+    if repo_data.get('language'):
+        tech_stack.append(repo_data['language'])
+    for language in sorted(languages, key=languages.get, reverse=True)[:3]:
+        if language not in tech_stack:
+            tech_stack.append(language)
+    tech_stack.extend(topic for topic in topics[:5] if topic not in tech_stack)
+    return ', '.join(tech_stack) if tech_stack else 'Open Source'
+
+
+def get_live_url(repo_data):
+    """Homepage of a repository, or its GitHub Pages site"""
+    if repo_data.get('homepage'):
+        return repo_data['homepage']
+    if repo_data.get('has_pages'):
+        return f"https://{repo_data['owner']['login']}.github.io/{repo_data['name']}"
+    return ''
+
+
+def get_tag_names(repo_data, topics):
+    """Tags for a newly synced project: its language, up to 3 topics and 'GitHub'"""
+    names = []
+    if repo_data.get('language'):
+        names.append(repo_data['language'])
+    names.extend(topics[:3])
+    names.append('GitHub')
+    return names
+
+
+class GitHubSync:
+    """
+    Sync the public repositories of ``username`` into projects.
+
+    ``log`` receives one line per created or updated project.
+    """
+
+    def __init__(self, username, token=None, max_repos=10, concurrency=DEFAULT_CONCURRENCY,
+                 api_url=None, log=None):
+        self.username = username
+        self.max_repos = max_repos
+        self.concurrency = max(1, concurrency)
+        self.client = GitHubClient(token, api_url, self.concurrency)
+        self.log = log or logger.info
+
+    def fetch_repos(self):
+        """Repositories of the user, most recently updated first, following pagination"""
+        url = (f'{self.client.api_url}/users/{self.username}/repos'
+               f'?type=owner&sort=updated&per_page={min(self.max_repos, PAGE_SIZE)}')
+        repos = []
+        while url and len(repos) < self.max_repos:
+            page, url = self.client.get(url)
+            repos.extend(page)
+        return repos[:self.max_repos]
+
+    def fetch_details(self, repo_data):
+        """Topics and languages (bytes of code by language) of a repository"""
+        base = f"{self.client.api_url}/repos/{repo_data['full_name']}"
+        topics = repo_data.get('topics') or []
+        languages = {}
+        try:
+            topics = self.client.get(f'{base}/topics')[0].get('names', topics)
+            languages = self.client.get(f'{base}/languages')[0]
+        except requests.RequestException as e:
+            logger.warning(f"Could not fetch details of {repo_data['full_name']}: {e}")
+        return topics, languages
+
+    def run(self):
+        """Fetch and write everything; returns a SyncResult"""
+        result = SyncResult()
+        try:
+            repos = [repo for repo in self.fetch_repos() if not repo['private']]
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                details = list(executor.map(self.fetch_details, repos))
+            result.fetched = len(repos)
+
+            with transaction.atomic():
+                self.write(repos, details, result)
+                self.client.save()
+        finally:
+            result.requests = self.client.requests
+            result.not_modified = self.client.not_modified
+            self.client.close()
+
+        if result.created or result.updated:
+            self.refresh_indexes(result)
+        return result
+
+    def write(self, repos, details, result):
+        names = [f"{self.username}/{repo['name']}" for repo in repos]
+        existing = {project.github_repo: project for project in Project.objects.filter(github_repo__in=names)}
+        now = timezone.now()
+
+        new_projects, new_tags, changed = [], [], []
+        seen = set()
+        for name, repo_data, (topics, languages) in zip(names, repos, details):
+            # Pages can shift while they are fetched and repeat a repository
+            if name in seen:
+                continue
+            seen.add(name)
+            project = existing.get(name)
+            if project is None:
+                title = repo_data['name'].replace('-', ' ').replace('_', ' ').title()
+                new_projects.append(Project(
+                    title=title,
+                    description=repo_data.get('description') or f'A {repo_data.get("language") or "software"} project',
+                    tech_stack=get_tech_stack(repo_data, languages, topics),
+                    repo_url=repo_data['html_url'],
+                    live_url=get_live_url(repo_data),
+                    github_repo=name,
+                    is_github_synced=True,
+                    github_stars=repo_data['stargazers_count'],
+                    github_forks=repo_data['forks_count'],
+                    github_language=repo_data.get('language') or '',
+                    github_updated_at=now,
+                ))
+                new_tags.append(get_tag_names(repo_data, topics))
+                continue
+
+            values = {
+                'github_stars': repo_data['stargazers_count'],
+                'github_forks': repo_data['forks_count'],
+                'github_language': repo_data.get('language') or '',
+            }
+            # Keep manually written descriptions
+            if project.is_github_synced and repo_data.get('description'):
+                values['description'] = repo_data['description']
+            if all(getattr(project, field) == value for field, value in values.items()):
+                result.unchanged += 1
+                continue
+            for field, value in values.items():
+                setattr(project, field, value)
+            project.github_updated_at = now
+            changed.append(project)
+
+        if new_projects:
+            self.assign_slugs(new_projects)
+            Project.objects.bulk_create(new_projects)
+            self.add_tags(new_projects, new_tags)
+        if changed:
+            Project.objects.bulk_update(changed, [
+                'github_stars', 'github_forks', 'github_language', 'description', 'github_updated_at',
+            ])
+
+        for project in new_projects:
+            self.log(f'Created project: {project.title}')
+        for project in changed:
+            self.log(f'Updated project: {project.title}')
+        result.created = new_projects
+        result.updated = changed
+
+    def assign_slugs(self, projects):
+        """Unique slugs as Project.save() would pick them, checked with one query"""
+        bases = [slugify(project.title)[:40] or str(uuid.uuid4())[:8] for project in projects]
+        query = Q()
+        for base in set(bases):
+            query |= Q(slug__startswith=base)
+        taken = set(Project.objects.filter(query).values_list('slug', flat=True))
+        for project, base in zip(projects, bases):
+            slug, counter = base, 1
+            while slug in taken:
+                slug = f'{base}-{counter}'
+                counter += 1
+            taken.add(slug)
+            project.slug = slug
+
+    def add_tags(self, projects, tag_names):
+        """Tag new projects, reusing existing tags case-insensitively like Tag.from_names"""
+        tag_names = [[name.strip()[:50] for name in names if name.strip()] for names in tag_names]
+        wanted = {name.lower(): name for names in tag_names for name in names}
+
+        def lookup():
+            return {
+                tag.lower_name: tag
+                for tag in Tag.objects.annotate(lower_name=Lower('name')).filter(lower_name__in=list(wanted))
+            }
+
+        tags = lookup()
+        missing = [Tag(name=name) for lower, name in wanted.items() if lower not in tags]
+        if missing:
+            Tag.objects.bulk_create(missing, ignore_conflicts=True)
+            tags = lookup()
+
+        Through = Project.tags.through
+        Through.objects.bulk_create([
+            Through(project_id=project.pk, tag_id=tag.pk)
+            for project, names in zip(projects, tag_names)
+            for tag in {tags[name.lower()].pk: tags[name.lower()] for name in names}.values()
+        ], ignore_conflicts=True)
+
+    def refresh_indexes(self, result):
+        """Bulk writes send no signals; refresh what the signal handlers would"""
+        rebuild(Project)
+        if is_postgres():
+            pks = [project.pk for project in result.created + result.updated]
+            for project in Project.objects.filter(pk__in=pks).prefetch_related('tags'):
+                update_search_vector(project)
+        bump_generation(Project)
+        if result.created:
+            bump_generation(Tag)
+        bump_content_generation()
@@ -0,0 +1,243 @@
+"""
+Responsive image renditions.
+
+Uploaded images are served to cards a few hundred pixels wide and to 50px
+admin thumbnails, so each original is resized into a ladder of widths and
+re-encoded as AVIF, WebP and JPEG. Renditions are saved with the original's
+storage (local media or Cloudinary) under names derived from it, e.g.
+``images/projects/app.jpg`` -> ``images/projects/app.640w.webp``, and
+recorded on a ``ResponsiveImage`` row that the ``{% responsive_image %}``
+template tag reads to build ``srcset``/``sizes``.
+
+Encoding a ladder takes seconds, so saves never do it in the request: once
+the transaction commits, ``schedule()`` queues the saved object and a
+background thread (see ``portfolio.background``) generates its missing
+renditions ``PORTFOLIO_IMAGE_RENDITIONS_DELAY`` seconds later. Renditions of
+an image that was replaced, cleared or deleted are removed on the same
+thread. The scheduler's ``image-renditions`` job (and
+``manage.py generate_image_renditions``) backfills anything a lost thread
+missed. Until an image has renditions, templates fall back to the original
+file.
+"""
+import logging
+import os
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+
+from . import background
+from .models import ResponsiveImage, Project, BlogPost, Testimonial, Certification, Award
+
+logger = logging.getLogger(__name__)
+
+# Image fields that get renditions, per model
+RESPONSIVE_IMAGE_FIELDS = {
+    Project: ['image'],
+    BlogPost: ['image'],
+    Testimonial: ['avatar'],
+    Certification: ['certificate_image'],
+    Award: ['award_image'],
+}
+
+# Rendition widths in pixels; originals are never upscaled
+IMAGE_WIDTHS = getattr(settings, 'PORTFOLIO_IMAGE_WIDTHS', (160, 320, 640, 960, 1280, 1920))
+
+# Encoder settings per format, best compression first. Browsers pick the
+# first format they support; JPEG is the <img> fallback
+FORMATS = {
+    'avif': {'extension': 'avif', 'pil': 'AVIF', 'options': {'quality': 55, 'speed': 8}},
+    'webp': {'extension': 'webp', 'pil': 'WEBP', 'options': {'quality': 78, 'method': 4}},
+    'jpeg': {'extension': 'jpg', 'pil': 'JPEG', 'options': {'quality': 80, 'optimize': True, 'progressive': True}},
+}
+
+MIME_TYPES = {'avif': 'image/avif', 'webp': 'image/webp', 'jpeg': 'image/jpeg'}
+
+
+def available_formats():
+    """Formats to generate: the configured ones this Pillow build can encode"""
+    wanted = getattr(settings, 'PORTFOLIO_IMAGE_FORMATS', tuple(FORMATS))
+    return [name for name in wanted if name == 'jpeg' or features.check(name)]
+
+
+def rendition_name(source, width, image_format):
+    """Storage name of a rendition, next to its original"""
+    root, ext = os.path.splitext(source)
+    return f"{root}.{width}w.{FORMATS[image_format]['extension']}"
+
+
+def rendition_widths(original_width):
+    """Widths to generate for an original of the given width"""
+    return sorted({min(width, original_width) for width in IMAGE_WIDTHS})
+
+
+def _encode(image, image_format):
+    if image_format == 'jpeg' and image.mode != 'RGB':
+        # JPEG has no alpha channel; flatten transparent images onto white
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        rgba = image.convert('RGBA')
+        background.paste(rgba, mask=rgba.getchannel('A'))
+        image = background
+    elif image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'A' in image.getbands() or 'transparency' in image.info else 'RGB')
+    buffer = BytesIO()
+    image.save(buffer, FORMATS[image_format]['pil'], **FORMATS[image_format]['options'])
+    return buffer.getvalue()
+
+
+def generate_renditions(image_file):
+    """
+    Resize and re-encode an image field's file into every rendition.
+
+    Existing renditions of the same original are overwritten. Returns the
+    ``ResponsiveImage`` recording them.
+    """
+    storage = image_file.storage
+    source = image_file.name
+    with storage.open(source, 'rb') as handle:
+        with Image.open(handle) as original:
+            original = ImageOps.exif_transpose(original)
+            original.load()
+
+    renditions = {}
+    for image_format in available_formats():
+        renditions[image_format] = []
+        for width in rendition_widths(original.width):
+            height = max(1, round(original.height * width / original.width))
+            resized = original if width == original.width else original.resize(
+                (width, height), Image.Resampling.LANCZOS
+            )
+            name = rendition_name(source, width, image_format)
+            if storage.exists(name):
+                storage.delete(name)
+            name = storage.save(name, ContentFile(_encode(resized, image_format)))
+            renditions[image_format].append([width, name])
+
+    image, created = ResponsiveImage.objects.update_or_create(
+        source=source,
+        defaults={'width': original.width, 'height': original.height, 'renditions': renditions},
+    )
+    return image
+
+
+def ensure_renditions(instance):
+    """Generate renditions for a model instance's images that have none yet"""
+    names = {name: getattr(instance, field_name) for field_name, name in image_names(instance).items()}
+    if not names:
+        return []
+    done = set(ResponsiveImage.objects.filter(source__in=names).values_list('source', flat=True))
+
+    generated = []
+    for name, image_file in names.items():
+        if name in done:
+            continue
+        try:
+            generated.append(generate_renditions(image_file))
+        except (OSError, UnidentifiedImageError, Image.DecompressionBombError) as e:
+            # A broken upload should not fail the save; the original is still served
+            logger.warning(f"Could not generate renditions for {name}: {e}")
+    return generated
+
+
+def delete_renditions(source, storage):
+    """Delete the rendition files and record of an original; returns whether it had any"""
+    image = ResponsiveImage.objects.filter(source=source).first()
+    if image is None:
+        return False
+    for renditions in image.renditions.values():
+        for width, name in renditions:
+            try:
+                storage.delete(name)
+            except Exception as e:
+                logger.warning(f"Could not delete rendition {name}: {e}")
+    image.delete()
+    return True
+
+
+def image_names(instance):
+    """Storage names of an instance's images that get renditions, by field"""
+    names = {}
+    for field_name in RESPONSIVE_IMAGE_FIELDS.get(type(instance), []):
+        image_file = getattr(instance, field_name)
+        if image_file and image_file.name:
+            names[field_name] = image_file.name
+    return names
+
+
+def is_referenced(source):
+    """Whether any saved object still uses ``source`` as an image"""
+    return any(
+        model.objects.filter(**{field_name: source}).exists()
+        for model, field_names in RESPONSIVE_IMAGE_FIELDS.items()
+        for field_name in field_names
+    )
+
+
+# Key of queued rendition work in portfolio.background
+BACKGROUND_KEY = 'image-renditions'
+
+
+def schedule(instance, stale=(), generate=True):
+    """
+    Generate ``instance``'s missing renditions once the transaction commits.
+
+    ``stale`` lists (field name, storage name) pairs of images the save
+    replaced or the delete removed; their renditions are deleted.
+    """
+    model = type(instance)
+    stale = {name: model._meta.get_field(field_name).storage for field_name, name in stale}
+    generate = generate and getattr(settings, 'PORTFOLIO_IMAGE_RENDITIONS_ON_SAVE', True)
+    pk = instance.pk if generate and image_names(instance) else None
+    if pk is not None or stale:
+        delay = getattr(settings, 'PORTFOLIO_IMAGE_RENDITIONS_DELAY', 1)
+        background.debounce_on_commit(BACKGROUND_KEY, delay, process_changes, (model, pk, stale))
+
+
+def process_changes(changes):
+    """Generate and delete renditions for queued (model, pk, stale) changes; returns (generated, deleted) counts"""
+    pending, stale = {}, {}
+    for model, pk, stale_names in changes:
+        if pk is not None:
+            pending.setdefault(model, set()).add(pk)
+        stale.update(stale_names)
+    generated = 0
+    for model, pks in pending.items():
+        for instance in model.objects.filter(pk__in=pks).only('pk', *RESPONSIVE_IMAGE_FIELDS[model]):
+            generated += len(ensure_renditions(instance))
+    deleted = 0
+    for source, storage in stale.items():
+        # Another object may have been saved with the same file
+        if not is_referenced(source) and delete_renditions(source, storage):
+            deleted += 1
+    return generated, deleted
+
+
+def process_pending():
+    """Generate and delete every queued rendition now; returns (generated, deleted) counts"""
+    return background.flush(BACKGROUND_KEY) or (0, 0)
+
+
+def lookup(image_file):
+    """Cached renditions of an image field's file, or None if it has none"""
+    if not image_file or not getattr(image_file, 'name', None):
+        return None
+    return ResponsiveImage.get_entry(image_file.name, image_file.storage)
+
+
+def pick_rendition(entry, width, formats=('webp', 'jpeg')):
+    """URL of the smallest rendition at least ``width`` pixels wide"""
+    for image_format in formats:
+        candidates = entry['renditions'].get(image_format)
+        if candidates:
+            for candidate_width, url in candidates:
+                if candidate_width >= width:
+                    return url
+            return candidates[-1][1]
+    return None
+
+
+def rendition_url(image_file, width):
+    """URL of an image's smallest rendition covering ``width`` pixels, or None"""
+    entry = lookup(image_file)
+    return pick_rendition(entry, width) if entry else None
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from portfolio import template_cache
+
+
+def _ms(value):
+    return '-' if value is None else f'{value:.1f}'
+
+
+class Command(BaseCommand):
+    help = 'Compare page render times with cold and warm compiled templates'
+
+    def add_arguments(self, parser):
+        parser.add_argument('urls', nargs='*',
+                            help='Paths to render (default: one page per public view)')
+        parser.add_argument('--repeat', type=int, default=5,
+                            help='Cold/warm render pairs per page (medians are reported)')
+
+    def handle(self, *args, **options):
+        if not template_cache.is_cached():
+            self.stdout.write(self.style.WARNING(
+                'Templates are not loaded through the cached loader, so warm renders compile them again'
+            ))
+        try:
+            results = template_cache.benchmark(options['urls'] or None, repeat=max(1, options['repeat']))
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(f"{'cold ms':>9} {'warm ms':>9} {'cold tpl':>9} {'warm tpl':>9}  url")
+        for result in results:
+            self.stdout.write(
+                f'{_ms(result.cold_ms):>9} {_ms(result.warm_ms):>9} '
+                f'{_ms(result.cold_template_ms):>9} {_ms(result.warm_template_ms):>9}  {result.url}'
+            )
+        if results:
+            saved = sum(result.cold_ms - result.warm_ms for result in results) / len(results)
+            self.stdout.write(self.style.SUCCESS(
+                f'Compiled templates save {saved:.1f} ms per page on average over {len(results)} pages'
+            ))
@@ -9,7 +9,7 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS('Checking blog posts configuration...'))
         
         # Get all blog posts
-        all_posts = BlogPost.objects.all()
+        all_posts = BlogPost.objects.prefetch_related('tags')
         published_posts = BlogPost.objects.filter(is_published=True)
         featured_posts = BlogPost.objects.filter(is_published=True, is_featured=True)
         
@@ -26,7 +26,7 @@ class Command(BaseCommand):
             self.stdout.write(f'     Status: {status}{featured}')
             self.stdout.write(f'     Slug: {post.slug}')
             self.stdout.write(f'     Created: {post.created}')
-            self.stdout.write(f'     Tags: {post.tags or "No tags"}')
+            self.stdout.write(f'     Tags: {post.tags_string or "No tags"}')
             if post.excerpt:
                 self.stdout.write(f'     Excerpt: {post.excerpt[:100]}...')
             self.stdout.write('')
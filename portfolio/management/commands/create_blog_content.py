@@ -1035,11 +1035,13 @@ Python performance optimization is about making informed decisions based on actu
         
         created_count = 0
         for post_data in blog_posts:
+            post_tags = post_data.pop('tags', '')
             post, created = BlogPost.objects.get_or_create(
                 slug=post_data['slug'],
                 defaults=post_data
             )
             if created:
+                post.set_tags_from_string(post_tags)
                 created_count += 1
                 self.stdout.write(
                     self.style.SUCCESS(f'Created blog post: {post.title}')
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from portfolio import query_plans
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN the listing queries and check each uses its index'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--prefer-indexes',
+            action='store_true',
+            help='Discourage sequential scans (PostgreSQL), to check small tables '
+                 'where the planner rightly skips indexes',
+        )
+        parser.add_argument(
+            '--benchmark',
+            action='store_true',
+            help='Also time each query without its index (drops it in a rolled-back '
+                 'transaction; run against a seeded copy such as seed_benchmark_data)',
+        )
+        parser.add_argument('--repeat', type=int, default=20,
+                            help='Runs per query when benchmarking (medians are reported)')
+
+    def handle(self, *args, **options):
+        queries = query_plans.listing_queries()
+        missing = []
+        for query in queries:
+            plan = query_plans.explain(query, prefer_indexes=options['prefer_indexes'])
+            if plan.uses_index:
+                self.stdout.write(f'{self.style.SUCCESS("uses")} {query.index:<28} {query.label}')
+            else:
+                missing.append(query)
+                self.stdout.write(f'{self.style.ERROR("MISS")} {query.index:<28} {query.label}')
+            if options['verbosity'] > 1 or not plan.uses_index:
+                for line in plan.plan.splitlines():
+                    self.stdout.write(f'     {line}')
+
+        if options['benchmark']:
+            self.stdout.write(f"\n{'indexed':>9} {'without':>9}  query")
+            for timing in query_plans.benchmark(queries, repeat=max(1, options['repeat'])):
+                self.stdout.write(
+                    f'{timing.indexed_ms:>7.2f}ms {timing.unindexed_ms:>7.2f}ms  {timing.query.label}'
+                )
+
+        if missing:
+            raise CommandError(f'{len(missing)} of {len(queries)} queries do not use their index')
+        self.stdout.write(self.style.SUCCESS(f'All {len(queries)} queries use their index'))
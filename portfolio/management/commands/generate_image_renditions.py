@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from portfolio.images import RESPONSIVE_IMAGE_FIELDS, ensure_renditions, generate_renditions
+
+
+class Command(BaseCommand):
+    help = 'Generate responsive renditions for uploaded images that have none'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Regenerate renditions for every image, e.g. after changing widths',
+        )
+
+    def handle(self, *args, **options):
+        total = 0
+        for model, field_names in RESPONSIVE_IMAGE_FIELDS.items():
+            count = 0
+            for instance in model.objects.only('pk', *field_names).iterator():
+                if options['force']:
+                    for field_name in field_names:
+                        image_file = getattr(instance, field_name)
+                        if image_file:
+                            try:
+                                generate_renditions(image_file)
+                                count += 1
+                            except Exception as e:
+                                self.stdout.write(self.style.WARNING(f'{image_file.name}: {e}'))
+                else:
+                    count += len(ensure_renditions(instance))
+            if count:
+                self.stdout.write(f'{model._meta.verbose_name_plural}: {count} images')
+            total += count
+
+        self.stdout.write(self.style.SUCCESS(f'Generated renditions for {total} images'))
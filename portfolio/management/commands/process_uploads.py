@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from portfolio.uploads import process_due
+
+
+class Command(BaseCommand):
+    help = 'Move staged dashboard uploads into storage, retrying failures with backoff'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Process the uploads that are due and exit instead of polling',
+        )
+        parser.add_argument('--batch-size', type=int, default=5,
+                            help='Uploads claimed per poll')
+        parser.add_argument('--interval', type=float, default=5,
+                            help='Seconds to wait between polls when nothing is queued')
+
+    def handle(self, *args, **options):
+        if options['once']:
+            done, failed = process_due(options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(f'Processed {done} uploads, {failed} failed'))
+            return
+
+        self.stdout.write('Upload worker started')
+        try:
+            while True:
+                done, failed = process_due(options['batch_size'])
+                if done or failed:
+                    self.stdout.write(f'Processed {done} uploads, {failed} failed')
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write('Upload worker stopped')
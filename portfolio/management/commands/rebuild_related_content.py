@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from portfolio.models import Project, BlogPost
+from portfolio.related import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Recompute the precomputed related projects and blog posts'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model',
+            choices=['projects', 'blog'],
+            help='Only rebuild the index for one model',
+        )
+
+    def handle(self, *args, **options):
+        models = {
+            'projects': Project,
+            'blog': BlogPost,
+        }
+        if options['model']:
+            models = {options['model']: models[options['model']]}
+
+        for name, model in models.items():
+            count = rebuild(model)
+            self.stdout.write(
+                self.style.SUCCESS(f'Rebuilt related content for {count} {name}')
+            )
@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from portfolio.scheduler import ensure_default_jobs, run_due
+
+
+class Command(BaseCommand):
+    help = 'Run scheduled jobs (GitHub sync, media checks, ...) when they are due'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Run the jobs that are due and exit instead of polling',
+        )
+        parser.add_argument('--interval', type=float, default=30,
+                            help='Seconds to wait between polls')
+
+    def handle(self, *args, **options):
+        ensure_default_jobs()
+        if options['once']:
+            succeeded, failed = run_due()
+            self.stdout.write(self.style.SUCCESS(f'Ran {succeeded + failed} jobs, {failed} failed'))
+            return
+
+        self.stdout.write('Scheduler started')
+        try:
+            while True:
+                succeeded, failed = run_due()
+                if succeeded or failed:
+                    self.stdout.write(f'Ran {succeeded + failed} jobs, {failed} failed')
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write('Scheduler stopped')
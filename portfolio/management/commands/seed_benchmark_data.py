@@ -0,0 +1,204 @@
+import random
+from datetime import date, timedelta
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from portfolio.cache import bump_generation, bump_content_generation
+from portfolio.models import (
+    Tag, Project, Testimonial, BlogPost, ContactMessage, PersonalInfo,
+    Education, Certification, Award, SEOSettings, Skill, CareerTimeline, FooterLink
+)
+from portfolio.related import rebuild
+from portfolio.search import is_postgres, update_search_vector
+
+TECHNOLOGIES = [
+    'Python', 'Django', 'JavaScript', 'React', 'PostgreSQL', 'Redis', 'Docker',
+    'AWS', 'Celery', 'Bootstrap', 'TypeScript', 'GraphQL', 'Go', 'Kubernetes',
+]
+
+PARAGRAPH = (
+    'Built and shipped a production feature end to end, from data modelling and '
+    'API design through to deployment, monitoring and iterating on user feedback. '
+)
+
+
+class Command(BaseCommand):
+    help = 'Seed a large, realistic dataset for query budgets and benchmarks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--projects', type=int, default=200)
+        parser.add_argument('--posts', type=int, default=200)
+        parser.add_argument('--skills', type=int, default=120)
+        parser.add_argument('--messages', type=int, default=300)
+        parser.add_argument('--tags', type=int, default=40)
+        parser.add_argument('--seed', type=int, default=42, help='Random seed')
+
+    def handle(self, *args, **options):
+        if Project.objects.filter(slug__startswith='benchmark-project-').exists():
+            self.stdout.write(self.style.WARNING(
+                'Benchmark data already exists; use a fresh database to reseed.'
+            ))
+            return
+
+        rng = random.Random(options['seed'])
+        now = timezone.now()
+
+        # Rows are bulk inserted, so model signals never fire; derived data
+        # (tags, related content, search vectors, cache generations) is
+        # brought up to date at the end instead
+        tags = Tag.objects.bulk_create(
+            [Tag(name=f'Topic {i}') for i in range(options['tags'])]
+        )
+
+        projects = Project.objects.bulk_create([
+            Project(
+                title=f'Benchmark Project {i}',
+                slug=f'benchmark-project-{i}',
+                description=PARAGRAPH * rng.randint(5, 40),
+                tech_stack=', '.join(rng.sample(TECHNOLOGIES, rng.randint(2, 5))),
+                live_url=f'https://example.com/projects/{i}',
+                repo_url=f'https://github.com/example/project-{i}',
+                is_featured=i % 10 == 0,
+                github_stars=rng.randint(0, 500),
+                github_forks=rng.randint(0, 100),
+            )
+            for i in range(options['projects'])
+        ])
+        posts = BlogPost.objects.bulk_create([
+            BlogPost(
+                title=f'Benchmark Post {i}',
+                slug=f'benchmark-post-{i}',
+                excerpt='' if i % 3 == 0 else f'What I learned from benchmark post {i}.',
+                body=PARAGRAPH * rng.randint(20, 200),
+                is_published=i % 8 != 0,
+                is_featured=i == 0,
+            )
+            for i in range(options['posts'])
+        ])
+        # auto_now_add ignores values passed in, so spread the dates afterwards
+        for i, project in enumerate(projects):
+            project.created_at = now - timedelta(days=i * 3)
+        Project.objects.bulk_update(projects, ['created_at'])
+        for i, post in enumerate(posts):
+            post.created = now - timedelta(days=i * 2)
+        BlogPost.objects.bulk_update(posts, ['created'])
+
+        Project.tags.through.objects.bulk_create([
+            Project.tags.through(project_id=project.pk, tag_id=tag.pk)
+            for project in projects
+            for tag in rng.sample(tags, min(len(tags), rng.randint(1, 4)))
+        ])
+        BlogPost.tags.through.objects.bulk_create([
+            BlogPost.tags.through(blogpost_id=post.pk, tag_id=tag.pk)
+            for post in posts
+            for tag in rng.sample(tags, min(len(tags), rng.randint(1, 4)))
+        ])
+
+        categories = [key for key, name in Skill.SKILL_CATEGORIES]
+        Skill.objects.bulk_create([
+            Skill(
+                name=f'Skill {i}',
+                category=categories[i % len(categories)],
+                proficiency=rng.randint(1, 5),
+                order=i,
+                is_featured=i % 6 == 0,
+            )
+            for i in range(options['skills'])
+        ])
+        ContactMessage.objects.bulk_create([
+            ContactMessage(
+                name=f'Visitor {i}',
+                email=f'visitor{i}@example.com',
+                subject=f'Enquiry {i}',
+                message=PARAGRAPH * rng.randint(1, 5),
+                is_read=i % 3 == 0,
+            )
+            for i in range(options['messages'])
+        ])
+
+        self.seed_profile(rng)
+
+        rebuild(Project)
+        rebuild(BlogPost)
+        if is_postgres():
+            for instance in Project.objects.prefetch_related('tags'):
+                update_search_vector(instance)
+            for instance in BlogPost.objects.prefetch_related('tags'):
+                update_search_vector(instance)
+
+        for model in apps.get_app_config('portfolio').get_models():
+            bump_generation(model)
+        bump_content_generation()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {len(projects)} projects, {len(posts)} posts, "
+            f"{options['skills']} skills and {options['messages']} messages"
+        ))
+
+    def seed_profile(self, rng):
+        """Seed the about page, footer and SEO content"""
+        PersonalInfo.objects.create(
+            full_name='Benchmark User',
+            portfolio_name='Benchmark Portfolio',
+            email='benchmark@example.com',
+            bio=PARAGRAPH * 3,
+            about_intro=PARAGRAPH,
+            professional_summary=PARAGRAPH * 2,
+            technical_skills=', '.join(TECHNOLOGIES),
+            soft_skills='Communication, Mentoring, Planning',
+            github_url='https://github.com/example',
+        )
+        Testimonial.objects.bulk_create([
+            Testimonial(
+                name=f'Client {i}', role='Engineering Manager',
+                comment=PARAGRAPH, is_featured=i % 2 == 0,
+            )
+            for i in range(20)
+        ])
+        Education.objects.bulk_create([
+            Education(
+                school_name=f'University {i}', degree='BSc Computer Science',
+                start_date=date(2010 + i, 9, 1), end_date=date(2014 + i, 6, 1), order=i,
+            )
+            for i in range(4)
+        ])
+        Certification.objects.bulk_create([
+            Certification(
+                name=f'Certification {i}', issuing_organization='Cloud Academy',
+                issue_date=date(2020, 1, 1) + timedelta(days=i * 40),
+                is_featured=i % 2 == 0, order=i,
+            )
+            for i in range(12)
+        ])
+        Award.objects.bulk_create([
+            Award(
+                title=f'Award {i}', issuing_organization='Tech Awards',
+                date_received=date(2021, 1, 1) + timedelta(days=i * 60),
+                is_featured=i % 2 == 0, order=i,
+            )
+            for i in range(8)
+        ])
+        CareerTimeline.objects.bulk_create([
+            CareerTimeline(
+                job_title=f'Software Engineer {i}', company=f'Company {i}',
+                start_date=date(2012 + i, 1, 1),
+                end_date=None if i == 0 else date(2013 + i, 1, 1),
+                is_current=i == 0, description=PARAGRAPH * 2,
+                technologies=', '.join(rng.sample(TECHNOLOGIES, 4)), order=i,
+            )
+            for i in range(10)
+        ])
+        categories = [key for key, name in FooterLink.LINK_CATEGORIES]
+        FooterLink.objects.bulk_create([
+            FooterLink(
+                title=f'Link {i}', url=f'https://example.com/{i}',
+                category=categories[i % len(categories)], order=i,
+            )
+            for i in range(20)
+        ])
+        SEOSettings.objects.bulk_create([
+            SEOSettings(page=page, title=f'{name} title', description=f'{name} description')
+            for page, name in SEOSettings.PAGE_CHOICES
+        ])
@@ -324,9 +324,11 @@ This creates a full CRUD API for your Project model!''',
         ]
 
         for blog_data in blog_posts_data:
+            blog_tags = blog_data.pop('tags', '')
             blog_post, created = BlogPost.objects.get_or_create(
                 slug=blog_data['slug'],
                 defaults=blog_data
             )
             if created:
+                blog_post.set_tags_from_string(blog_tags)
                 self.stdout.write(f'✅ Created blog post: {blog_post.title}')
@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from portfolio.outbox import send_due
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued contact-form email, retrying failures with backoff'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Send the email that is due and exit instead of polling',
+        )
+        parser.add_argument('--batch-size', type=int, default=20,
+                            help='Emails sent per mail server connection')
+        parser.add_argument('--interval', type=float, default=5,
+                            help='Seconds to wait between polls when the outbox is empty')
+
+    def handle(self, *args, **options):
+        if options['once']:
+            sent, failed = send_due(options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(f'Sent {sent} emails, {failed} failed'))
+            return
+
+        self.stdout.write('Email worker started')
+        try:
+            while True:
+                sent, failed = send_due(options['batch_size'])
+                if sent or failed:
+                    self.stdout.write(f'Sent {sent} emails, {failed} failed')
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write('Email worker stopped')
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+
+from portfolio.models import Project, BlogPost
+from portfolio.search import is_postgres, update_search_vector
+
+
+class Command(BaseCommand):
+    help = 'Backfill full-text search vectors for projects and blog posts'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model',
+            choices=['projects', 'blog'],
+            help='Only rebuild vectors for one model',
+        )
+
+    def handle(self, *args, **options):
+        if not is_postgres():
+            self.stdout.write(
+                self.style.WARNING(
+                    'Full-text search requires PostgreSQL; '
+                    'this database uses icontains search instead. Nothing to do.'
+                )
+            )
+            return
+
+        querysets = {
+            'projects': Project.objects.prefetch_related('tags'),
+            'blog': BlogPost.objects.all(),
+        }
+        if options['model']:
+            querysets = {options['model']: querysets[options['model']]}
+
+        for name, queryset in querysets.items():
+            count = 0
+            for instance in queryset.iterator(chunk_size=200):
+                update_search_vector(instance)
+                count += 1
+            self.stdout.write(
+                self.style.SUCCESS(f'Updated search vectors for {count} {name}')
+            )
@@ -0,0 +1,57 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from portfolio.warmup import DEFAULT_CONCURRENCY, can_warm, warm
+
+
+class Command(BaseCommand):
+    help = 'Request every public page so the page and fragment caches are built'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                            help='Pages requested at once')
+        parser.add_argument(
+            '--url',
+            type=str,
+            help='Crawl a running server at this base URL instead of rendering in-process '
+                 '(needed to warm a per-process cache such as LocMemCache)',
+        )
+        parser.add_argument('--quiet', action='store_true',
+                            help='Only print the summary')
+
+    def handle(self, *args, **options):
+        base_url = options.get('url')
+        if not can_warm(base_url):
+            # Pages rendered here would only fill this process's own cache
+            self.stdout.write(self.style.WARNING(
+                'Skipped: the cache is per-process, pass --url to warm a running server'
+            ))
+            return
+
+        start = time.perf_counter()
+        results = warm(concurrency=options['concurrency'], base_url=base_url)
+        elapsed = time.perf_counter() - start
+
+        if not options['quiet']:
+            for result in results:
+                line = f"{result.status or 'ERR':>4} {result.ms:8.1f} ms {result.cache or '-':>4}  {result.url}"
+                if result.status == 200:
+                    self.stdout.write(line)
+                else:
+                    self.stdout.write(self.style.ERROR(line))
+
+        failed = [result for result in results if result.status != 200]
+        timings = [result.ms for result in results]
+        if timings:
+            slowest = max(results, key=lambda result: result.ms)
+            self.stdout.write(
+                f'Median {statistics.median(timings):.1f} ms, '
+                f'slowest {slowest.ms:.1f} ms ({slowest.url})'
+            )
+        message = f'Warmed {len(results) - len(failed)} of {len(results)} pages in {elapsed:.1f}s'
+        if failed:
+            self.stdout.write(self.style.WARNING(f'{message}, {len(failed)} failed'))
+        else:
+            self.stdout.write(self.style.SUCCESS(message))
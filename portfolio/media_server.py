@@ -0,0 +1,284 @@
+"""
+Local media file server.
+
+Every view that streams a file from local storage (``media_views`` and the
+resume views) goes through ``serve()``. It answers conditional requests
+(``If-None-Match``/``If-Modified-Since``) with 304, single byte ranges with
+206, and then either hands the transfer to the front proxy or returns the
+open file for the WSGI server to send:
+
+* ``PORTFOLIO_MEDIA_SENDFILE = 'x-accel-redirect'`` (nginx) or
+  ``'x-sendfile'`` (Apache, lighttpd) returns headers only and the proxy
+  sends the file itself.
+* Otherwise the response wraps the open file, so a server providing
+  ``wsgi.file_wrapper`` (gunicorn) sends it with ``os.sendfile`` from the
+  range start without copying it through Python.
+
+Resolved paths and their stat results are cached per process; each request
+re-stats the file once and rebuilds the entry if its mtime or size changed.
+"""
+import mimetypes
+import os
+import re
+import stat
+import threading
+from collections import OrderedDict
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
+
+# Resolved files kept per process
+CACHE_SIZE = getattr(settings, 'PORTFOLIO_MEDIA_CACHE_SIZE', 1024)
+
+# Content types for compressed files, as FileResponse maps them
+ENCODED_TYPES = {
+    'bzip2': 'application/x-bzip',
+    'gzip': 'application/gzip',
+    'xz': 'application/x-xz',
+}
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class MediaFile:
+    """A regular file resolved under a storage root"""
+
+    def __init__(self, root, name, path, size, mtime_ns):
+        self.root = root
+        self.name = name
+        self.path = path
+        self.size = size
+        self.mtime_ns = mtime_ns
+        content_type, encoding = mimetypes.guess_type(path)
+        self.content_type = ENCODED_TYPES.get(encoding, content_type)
+        self.etag = f'"{size:x}-{mtime_ns:x}"'
+        self.last_modified = mtime_ns // 1_000_000_000
+
+
+class StatCache:
+    """Bounded LRU of MediaFile entries keyed by (root, name)"""
+
+    def __init__(self, size=CACHE_SIZE):
+        self.size = size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def discard(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+stat_cache = StatCache()
+
+
+def _safe_join(root, name):
+    """Real path of ``name`` under ``root``; Http404 if it escapes the root"""
+    try:
+        root = os.path.realpath(root)
+        path = os.path.realpath(os.path.join(root, name))
+    except ValueError:
+        # Embedded NUL bytes
+        raise Http404('File not found')
+    if os.path.commonpath([root, path]) != root:
+        raise Http404('File not found')
+    return path
+
+
+def resolve(root, name):
+    """
+    Resolve ``name`` under ``root`` to a MediaFile.
+
+    Raises Http404 if the file is missing, not a regular file or outside
+    ``root`` (including through symlinks).
+    """
+    root = str(root)
+    key = (root, name)
+    cached = stat_cache.get(key)
+    path = cached.path if cached else _safe_join(root, name)
+    try:
+        st = os.stat(path)
+    except OSError:
+        stat_cache.discard(key)
+        raise Http404('File not found')
+
+    if cached and st.st_mtime_ns == cached.mtime_ns and st.st_size == cached.size:
+        return cached
+    if not stat.S_ISREG(st.st_mode):
+        stat_cache.discard(key)
+        raise Http404('File not found')
+
+    media_file = MediaFile(root, name, path, st.st_size, st.st_mtime_ns)
+    stat_cache.set(key, media_file)
+    return media_file
+
+
+def resolve_field(field_file):
+    """Resolve a FileField's file in local storage; Http404 if it has none"""
+    if not field_file or not field_file.name:
+        raise Http404('File not found')
+    root = getattr(field_file.storage, 'location', settings.MEDIA_ROOT)
+    return resolve(root, field_file.name)
+
+
+def byte_range(header, size):
+    """
+    Parse a ``Range`` header into an inclusive (start, end) pair.
+
+    Returns None when the whole file should be sent (no header, a malformed
+    one, or several ranges) and raises ValueError when the range cannot be
+    satisfied.
+    """
+    match = RANGE_RE.match(header or '')
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if not first:
+        # Suffix range: the last N bytes
+        if size == 0 or int(last) == 0:
+            raise ValueError('Unsatisfiable range')
+        return max(0, size - int(last)), size - 1
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise ValueError('Unsatisfiable range')
+    end = min(int(last), size - 1) if last else size - 1
+    return start, end
+
+
+def _if_range_matches(request, media_file):
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range:
+        return True
+    if if_range.startswith(('"', 'W/')):
+        return if_range == media_file.etag
+    return parse_http_date_safe(if_range) == media_file.last_modified
+
+
+class FileRange:
+    """
+    Read-limited view of an open file positioned at the range start.
+
+    ``fileno()`` lets ``wsgi.file_wrapper`` implementations use sendfile;
+    gunicorn sends Content-Length bytes from the file's current offset.
+    """
+
+    def __init__(self, handle, length):
+        self.handle = handle
+        self.remaining = length
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        size = self.remaining if size is None or size < 0 else min(size, self.remaining)
+        data = self.handle.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.handle.fileno()
+
+    def close(self):
+        self.handle.close()
+
+
+def serve(request, media_file, content_type=None, as_attachment=False, filename=None):
+    """
+    Respond to a GET or HEAD for a resolved MediaFile.
+
+    ``content_type`` defaults to the type guessed from the file name and
+    ``filename`` (used in Content-Disposition) to the file's base name.
+    """
+    content_type = content_type or media_file.content_type or 'application/octet-stream'
+    filename = filename or os.path.basename(media_file.name)
+    headers = {
+        'ETag': media_file.etag,
+        'Last-Modified': http_date(media_file.last_modified),
+        'Accept-Ranges': 'bytes',
+    }
+
+    # 304 Not Modified / 412 Precondition Failed
+    response = get_conditional_response(
+        request, etag=media_file.etag, last_modified=media_file.last_modified
+    )
+    if response is not None:
+        for header, value in headers.items():
+            response.headers.setdefault(header, value)
+        return response
+
+    mode = getattr(settings, 'PORTFOLIO_MEDIA_SENDFILE', '')
+    if mode:
+        # The proxy handles ranges and streams the file itself
+        response = HttpResponse(content_type=content_type, headers=headers)
+        if mode == 'x-accel-redirect':
+            prefix = getattr(settings, 'PORTFOLIO_MEDIA_ACCEL_PREFIX', '/protected-media/')
+            response['X-Accel-Redirect'] = prefix.rstrip('/') + '/' + quote(media_file.name.replace(os.sep, '/'))
+        else:
+            response['X-Sendfile'] = media_file.path
+        _set_disposition(response, as_attachment, filename)
+        return response
+
+    start, end = 0, media_file.size - 1
+    status = 200
+    requested = request.META.get('HTTP_RANGE')
+    if requested and _if_range_matches(request, media_file):
+        try:
+            span = byte_range(requested, media_file.size)
+        except ValueError:
+            response = HttpResponse(status=416, headers=headers)
+            response['Content-Range'] = f'bytes */{media_file.size}'
+            return response
+        if span:
+            start, end = span
+            status = 206
+            headers['Content-Range'] = f'bytes {start}-{end}/{media_file.size}'
+    length = end - start + 1
+
+    if request.method == 'HEAD':
+        response = HttpResponse(status=status, content_type=content_type, headers=headers)
+        _set_disposition(response, as_attachment, filename)
+    else:
+        try:
+            handle = open(media_file.path, 'rb')
+        except OSError:
+            stat_cache.discard((media_file.root, media_file.name))
+            raise Http404('File not found')
+        handle.seek(start)
+        response = FileResponse(
+            FileRange(handle, length),
+            status=status,
+            content_type=content_type,
+            as_attachment=as_attachment,
+            filename=filename,
+            headers=headers,
+        )
+    response['Content-Length'] = length
+    return response
+
+
+def _set_disposition(response, as_attachment, filename):
+    # Same header FileResponse builds for the streamed case
+    disposition = content_disposition_header(as_attachment, filename)
+    if disposition:
+        response['Content-Disposition'] = disposition
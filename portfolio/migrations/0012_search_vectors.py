@@ -0,0 +1,57 @@
+# Generated by Django 4.2.11 on 2026-10-18 05:39
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+def create_search_indexes(apps, schema_editor):
+    # GIN indexes and pg_trgm only exist on PostgreSQL; SQLite keeps the
+    # plain column and search falls back to icontains filters
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'"
+        )
+        if cursor.fetchone():
+            schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS portfolio_project_search_gin "
+        "ON portfolio_project USING gin (search_vector)"
+    )
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS portfolio_blogpost_search_gin "
+        "ON portfolio_blogpost USING gin (search_vector)"
+    )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS portfolio_project_search_gin")
+    schema_editor.execute("DROP INDEX IF EXISTS portfolio_blogpost_search_gin")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("portfolio", "0011_alter_personalinfo_resume"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="blogpost",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
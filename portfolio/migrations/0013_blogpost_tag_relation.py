@@ -0,0 +1,55 @@
+# Generated by Django 4.2.11 on 2026-10-18 06:02
+
+from django.db import migrations, models
+
+
+def csv_tags_to_relation(apps, schema_editor):
+    """Move comma-separated BlogPost.tags values onto the shared Tag model"""
+    BlogPost = apps.get_model("portfolio", "BlogPost")
+    Tag = apps.get_model("portfolio", "Tag")
+
+    tags_by_name = {tag.name.lower(): tag for tag in Tag.objects.all()}
+    for post in BlogPost.objects.exclude(legacy_tags=""):
+        post_tags = []
+        for name in post.legacy_tags.split(","):
+            name = name.strip()[:50]
+            if not name:
+                continue
+            tag = tags_by_name.get(name.lower())
+            if tag is None:
+                tag = Tag.objects.create(name=name)
+                tags_by_name[name.lower()] = tag
+            post_tags.append(tag)
+        post.tags.set(post_tags)
+
+
+def relation_to_csv_tags(apps, schema_editor):
+    BlogPost = apps.get_model("portfolio", "BlogPost")
+    for post in BlogPost.objects.prefetch_related("tags"):
+        post.legacy_tags = ", ".join(tag.name for tag in post.tags.all())[:500]
+        post.save(update_fields=["legacy_tags"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("portfolio", "0012_search_vectors"),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name="blogpost",
+            old_name="tags",
+            new_name="legacy_tags",
+        ),
+        migrations.AddField(
+            model_name="blogpost",
+            name="tags",
+            field=models.ManyToManyField(blank=True, to="portfolio.tag"),
+        ),
+        migrations.RunPython(csv_tags_to_relation, relation_to_csv_tags),
+        migrations.RemoveField(
+            model_name="blogpost",
+            name="legacy_tags",
+        ),
+    ]
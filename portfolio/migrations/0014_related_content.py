@@ -0,0 +1,96 @@
+# Generated by Django 4.2.11 on 2026-10-18 06:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("portfolio", "0013_blogpost_tag_relation"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RelatedProject",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("score", models.FloatField()),
+                (
+                    "related",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="portfolio.project",
+                    ),
+                ),
+                (
+                    "source",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="related_entries",
+                        to="portfolio.project",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["source", "-score"],
+                "abstract": False,
+                "indexes": [
+                    models.Index(
+                        fields=["source", "-score"], name="portfolio_relproj_src_score"
+                    )
+                ],
+                "unique_together": {("source", "related")},
+            },
+        ),
+        migrations.CreateModel(
+            name="RelatedBlogPost",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("score", models.FloatField()),
+                (
+                    "related",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="portfolio.blogpost",
+                    ),
+                ),
+                (
+                    "source",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="related_entries",
+                        to="portfolio.blogpost",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["source", "-score"],
+                "abstract": False,
+                "indexes": [
+                    models.Index(
+                        fields=["source", "-score"], name="portfolio_relpost_src_score"
+                    )
+                ],
+                "unique_together": {("source", "related")},
+            },
+        ),
+    ]
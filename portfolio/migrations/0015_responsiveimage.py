@@ -0,0 +1,45 @@
+# Generated by Django 4.2.11 on 2026-10-18 07:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("portfolio", "0014_related_content"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ResponsiveImage",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "source",
+                    models.CharField(
+                        help_text="Storage name of the original image",
+                        max_length=255,
+                        unique=True,
+                    ),
+                ),
+                ("width", models.PositiveIntegerField()),
+                ("height", models.PositiveIntegerField()),
+                (
+                    "renditions",
+                    models.JSONField(
+                        default=dict,
+                        help_text="Storage names by format, as [width, name] pairs",
+                    ),
+                ),
+                ("created", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
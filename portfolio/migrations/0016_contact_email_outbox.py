@@ -0,0 +1,99 @@
+# Generated by Django 4.2.11 on 2026-10-18 08:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("portfolio", "0015_responsiveimage"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="contactmessage",
+            name="auto_reply_status",
+            field=models.CharField(
+                blank=True,
+                choices=[("queued", "Queued"), ("sent", "Sent"), ("failed", "Failed")],
+                max_length=10,
+            ),
+        ),
+        migrations.AddField(
+            model_name="contactmessage",
+            name="notification_status",
+            field=models.CharField(
+                blank=True,
+                choices=[("queued", "Queued"), ("sent", "Sent"), ("failed", "Failed")],
+                max_length=10,
+            ),
+        ),
+        migrations.CreateModel(
+            name="OutgoingEmail",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("notification", "Admin notification"),
+                            ("auto_reply", "Auto-reply"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("subject", models.CharField(max_length=255)),
+                ("body", models.TextField()),
+                ("from_email", models.CharField(max_length=254)),
+                ("to", models.EmailField(max_length=254)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("queued", "Queued"),
+                            ("sent", "Sent"),
+                            ("failed", "Failed"),
+                        ],
+                        default="queued",
+                        max_length=10,
+                    ),
+                ),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                (
+                    "next_attempt_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                ("last_error", models.TextField(blank=True)),
+                ("created", models.DateTimeField(auto_now_add=True)),
+                ("sent_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "contact_message",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="emails",
+                        to="portfolio.contactmessage",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-created"],
+                "indexes": [
+                    models.Index(
+                        fields=["status", "next_attempt_at"], name="portfolio_outbox_due"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.11 on 2026-10-18 06:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("portfolio", "0017_pendingupload"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GitHubResponse",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("url", models.CharField(max_length=500, unique=True)),
+                ("etag", models.CharField(blank=True, max_length=200)),
+                ("data", models.JSONField(default=dict)),
+                (
+                    "next_url",
+                    models.CharField(
+                        blank=True,
+                        help_text="Next page from the Link header",
+                        max_length=500,
+                    ),
+                ),
+                ("updated", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
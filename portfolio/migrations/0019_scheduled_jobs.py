@@ -0,0 +1,140 @@
+# Generated by Django 4.2.11 on 2026-10-18 06:32
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("portfolio", "0018_githubresponse"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ScheduledJob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100, unique=True)),
+                (
+                    "command",
+                    models.CharField(
+                        help_text="Management command to run, e.g. sync_github_repos",
+                        max_length=100,
+                    ),
+                ),
+                (
+                    "arguments",
+                    models.CharField(
+                        blank=True,
+                        help_text="Command-line arguments, e.g. --username octocat",
+                        max_length=500,
+                    ),
+                ),
+                (
+                    "schedule",
+                    models.CharField(
+                        help_text="Cron expression, e.g. '0 3 * * *' or '@hourly'",
+                        max_length=100,
+                    ),
+                ),
+                ("enabled", models.BooleanField(default=True)),
+                ("next_run_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "locked_until",
+                    models.DateTimeField(blank=True, editable=False, null=True),
+                ),
+                (
+                    "locked_by",
+                    models.CharField(blank=True, editable=False, max_length=200),
+                ),
+                (
+                    "last_run_at",
+                    models.DateTimeField(blank=True, editable=False, null=True),
+                ),
+                (
+                    "last_status",
+                    models.CharField(
+                        blank=True,
+                        choices=[
+                            ("running", "Running"),
+                            ("success", "Success"),
+                            ("failed", "Failed"),
+                        ],
+                        editable=False,
+                        max_length=10,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["name"],
+                "indexes": [
+                    models.Index(
+                        fields=["enabled", "next_run_at"], name="portfolio_job_due"
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="JobRun",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("running", "Running"),
+                            ("success", "Success"),
+                            ("failed", "Failed"),
+                        ],
+                        default="running",
+                        max_length=10,
+                    ),
+                ),
+                ("worker", models.CharField(max_length=200)),
+                (
+                    "started_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "duration",
+                    models.FloatField(blank=True, help_text="Seconds", null=True),
+                ),
+                ("output", models.TextField(blank=True)),
+                (
+                    "job",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="runs",
+                        to="portfolio.scheduledjob",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-started_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["job", "-started_at"], name="portfolio_jobrun_recent"
+                    )
+                ],
+            },
+        ),
+    ]
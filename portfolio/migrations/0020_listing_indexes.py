@@ -0,0 +1,68 @@
+# Generated by Django 4.2.11 on 2026-10-18 06:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("portfolio", "0019_scheduled_jobs"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(
+                fields=["-is_featured", "-created_at", "-id"],
+                name="portfolio_project_listing",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(fields=["-created_at"], name="portfolio_project_recent"),
+        ),
+        migrations.AddIndex(
+            model_name="blogpost",
+            index=models.Index(
+                condition=models.Q(("is_published", True)),
+                fields=["-created", "-id"],
+                name="portfolio_post_published",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="blogpost",
+            index=models.Index(fields=["-created"], name="portfolio_post_recent"),
+        ),
+        migrations.AddIndex(
+            model_name="skill",
+            index=models.Index(
+                fields=["category", "order", "name"], name="portfolio_skill_order"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="contactmessage",
+            index=models.Index(
+                fields=["-created", "-id"], name="portfolio_message_recent"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="contactmessage",
+            index=models.Index(
+                condition=models.Q(("is_read", False)),
+                fields=["-created", "-id"],
+                name="portfolio_message_unread",
+            ),
+        ),
+        migrations.RemoveIndex(
+            model_name="scheduledjob",
+            name="portfolio_job_due",
+        ),
+        migrations.AddIndex(
+            model_name="scheduledjob",
+            index=models.Index(
+                condition=models.Q(("enabled", True)),
+                fields=["next_run_at"],
+                name="portfolio_job_due",
+            ),
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 4.2.11 on 2026-10-18 07:00
+
+from django.conf import settings
+from django.db import migrations
+
+
+def project_document(project, tags):
+    return [
+        (project.title, "A"),
+        (f"{tags} {project.tech_stack}", "B"),
+        (project.description, "C"),
+    ]
+
+
+def blog_post_document(post, tags):
+    return [
+        (post.title, "A"),
+        (f"{post.excerpt} {tags}", "B"),
+        (post.body, "C"),
+    ]
+
+
+def backfill_search_vectors(apps, schema_editor):
+    # Rows saved before 0012 have no vector and would never match a search.
+    # The documents mirror portfolio.search as of this migration
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    from django.contrib.postgres.search import SearchVector
+    from django.db.models import TextField, Value
+
+    config = getattr(settings, "PORTFOLIO_SEARCH_CONFIG", "english")
+    db_alias = schema_editor.connection.alias
+    for model_name, document in [
+        ("Project", project_document),
+        ("BlogPost", blog_post_document),
+    ]:
+        model = apps.get_model("portfolio", model_name)
+        rows = (
+            model.objects.using(db_alias)
+            .filter(search_vector__isnull=True)
+            .prefetch_related("tags")
+        )
+        for instance in rows.iterator(chunk_size=200):
+            tags = " ".join(tag.name for tag in instance.tags.all())
+            vector = None
+            for text, weight in document(instance, tags):
+                part = SearchVector(
+                    Value(text or "", output_field=TextField()),
+                    weight=weight,
+                    config=config,
+                )
+                vector = part if vector is None else vector + part
+            model.objects.using(db_alias).filter(pk=instance.pk).update(
+                search_vector=vector
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("portfolio", "0020_listing_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_search_vectors, migrations.RunPython.noop),
+    ]
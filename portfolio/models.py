@@ -1,27 +1,94 @@
 from django.db import models
 from django.urls import reverse
 from django.utils import timezone
-from django.core.cache import cache
+from django.utils.functional import cached_property
 from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
+from django.core.exceptions import ValidationError
 from django.core.files.storage import FileSystemStorage
+from django.db.models import Count
+from django.db.models.functions import Substr
 import os
 
+from .cache import get_or_build
+from .cron import CronSchedule
+
 # Local storage for resume files (served directly by Railway/Django)
 resume_storage = FileSystemStorage(
     location=getattr(settings, 'MEDIA_ROOT', os.path.join(settings.BASE_DIR, 'media')),
     base_url=getattr(settings, 'MEDIA_URL', '/media/')
 )
 
+# Characters of description/body loaded for list cards; templates truncate
+# previews to a few dozen words, so the full text column stays in the database
+LISTING_PREVIEW_CHARS = 600
+
+
+class TagQuerySet(models.QuerySet):
+    def with_counts(self):
+        """Annotate project_count and post_count in the same query"""
+        return self.annotate(
+            project_count=Count('project', distinct=True),
+            post_count=Count('blogpost', distinct=True),
+        )
+
+
+class ProjectQuerySet(models.QuerySet):
+    def for_listing(self):
+        """
+        Projects for list pages and cards.
+        
+        Tags are prefetched and the description is replaced by a short
+        ``description_preview``.
+        """
+        return self.defer('description', 'search_vector').annotate(
+            description_preview=Substr('description', 1, LISTING_PREVIEW_CHARS)
+        ).prefetch_related('tags')
+
+
+class BlogPostQuerySet(models.QuerySet):
+    def for_listing(self):
+        """
+        Blog posts for list pages and cards.
+        
+        Tags are prefetched and the body is replaced by a short
+        ``body_preview`` (used when a post has no excerpt).
+        """
+        return self.defer('body', 'search_vector').annotate(
+            body_preview=Substr('body', 1, LISTING_PREVIEW_CHARS)
+        ).prefetch_related('tags')
+
 
 class Tag(models.Model):
     """Model for project tags"""
     name = models.CharField(max_length=50, unique=True)
     
+    objects = TagQuerySet.as_manager()
+    
     class Meta:
         ordering = ['name']
     
     def __str__(self):
         return self.name
+    
+    @classmethod
+    def from_names(cls, names):
+        """
+        Get or create tags for a list of names.
+        
+        Existing tags are matched case-insensitively so "django" reuses "Django".
+        """
+        tags = []
+        for name in names:
+            name = name.strip()[:50]
+            if not name:
+                continue
+            tag = cls.objects.filter(name__iexact=name).first()
+            if tag is None:
+                tag = cls.objects.create(name=name)
+            if tag not in tags:
+                tags.append(tag)
+        return tags
 
 
 class Project(models.Model):
@@ -47,8 +114,19 @@ class Project(models.Model):
     github_language = models.CharField(max_length=50, blank=True)
     github_updated_at = models.DateTimeField(null=True, blank=True)
     
+    # Weighted full-text document maintained by portfolio.search (PostgreSQL only)
+    search_vector = SearchVectorField(null=True, editable=False)
+    
+    objects = ProjectQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-is_featured', '-created_at']
+        indexes = [
+            # Public listings (ordering plus the id tiebreak used by cursors) and featured projects
+            models.Index(fields=['-is_featured', '-created_at', '-id'], name='portfolio_project_listing'),
+            # Dashboard lists, newest first
+            models.Index(fields=['-created_at'], name='portfolio_project_recent'),
+        ]
     
     def __str__(self):
         return self.title
@@ -97,20 +175,79 @@ class BlogPost(models.Model):
     excerpt = models.TextField(max_length=300, blank=True)
     body = models.TextField()
     image = models.ImageField(upload_to='images/blog/', blank=True)
-    tags = models.CharField(max_length=500, blank=True, help_text="Comma-separated list of tags")
+    tags = models.ManyToManyField(Tag, blank=True)
     is_featured = models.BooleanField(default=False)
     created = models.DateTimeField(auto_now_add=True)
     updated = models.DateTimeField(auto_now=True)
     is_published = models.BooleanField(default=False)
     
+    # Weighted full-text document maintained by portfolio.search (PostgreSQL only)
+    search_vector = SearchVectorField(null=True, editable=False)
+    
+    objects = BlogPostQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-created']
+        indexes = [
+            # Public listings only show published posts
+            models.Index(
+                fields=['-created', '-id'], condition=models.Q(is_published=True),
+                name='portfolio_post_published',
+            ),
+            # Dashboard lists, drafts included
+            models.Index(fields=['-created'], name='portfolio_post_recent'),
+        ]
     
     def __str__(self):
         return self.title
     
     def get_absolute_url(self):
         return reverse('portfolio:blog_detail', kwargs={'slug': self.slug})
+    
+    def set_tags_from_string(self, value):
+        """Replace the post's tags from a comma-separated string"""
+        self.tags.set(Tag.from_names(value.split(',') if value else []))
+    
+    @property
+    def tags_string(self):
+        """Comma-separated tag names (uses prefetched tags when available)"""
+        return ', '.join(tag.name for tag in self.tags.all())
+
+
+class RelatedContent(models.Model):
+    """
+    Precomputed nearest neighbour of a piece of content.
+
+    Rows are written by portfolio.related, never edited by hand.
+    """
+    score = models.FloatField()
+
+    class Meta:
+        abstract = True
+        ordering = ['source', '-score']
+
+    def __str__(self):
+        return f"{self.source} -> {self.related} ({self.score:.2f})"
+
+
+class RelatedProject(RelatedContent):
+    """Top related projects for a project detail page"""
+    source = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='related_entries')
+    related = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='+')
+
+    class Meta(RelatedContent.Meta):
+        unique_together = ['source', 'related']
+        indexes = [models.Index(fields=['source', '-score'], name='portfolio_relproj_src_score')]
+
+
+class RelatedBlogPost(RelatedContent):
+    """Top related posts for a blog post detail page"""
+    source = models.ForeignKey(BlogPost, on_delete=models.CASCADE, related_name='related_entries')
+    related = models.ForeignKey(BlogPost, on_delete=models.CASCADE, related_name='+')
+
+    class Meta(RelatedContent.Meta):
+        unique_together = ['source', 'related']
+        indexes = [models.Index(fields=['source', '-score'], name='portfolio_relpost_src_score')]
 
 
 class PersonalInfo(models.Model):
@@ -184,19 +321,16 @@ class PersonalInfo(models.Model):
                 logger = logging.getLogger(__name__)
                 logger.warning(f"Could not delete old resume file: {e}")
         
-        # Clear cache when personal info is updated
-        cache.delete('personal_info')
+        # Cached copies are invalidated by the post_save signal (see signals.py)
         super().save(*args, **kwargs)
     
     @classmethod
     def get_active(cls):
         """Get the active personal info instance with caching"""
-        info = cache.get('personal_info')
-        if not info:
-            info = cls.objects.filter(is_active=True).first()
-            if info:
-                cache.set('personal_info', info, 3600)  # Cache for 1 hour
-        return info
+        return get_or_build(
+            'personal_info', [cls],
+            lambda: cls.objects.filter(is_active=True).first()
+        )
 
 
 class Education(models.Model):
@@ -324,11 +458,30 @@ class Skill(models.Model):
     
     class Meta:
         ordering = ['category', 'order', 'name']
+        indexes = [models.Index(fields=['category', 'order', 'name'], name='portfolio_skill_order')]
         unique_together = ['name', 'category']
     
     def __str__(self):
         return f"{self.name} ({self.get_category_display()})"
     
+    @classmethod
+    def get_grouped(cls):
+        """
+        Get all skills grouped by category display name, with caching.
+        
+        Built from a single ordered query and bucketed in category order;
+        empty categories are left out.
+        """
+        def build():
+            grouped = {name: [] for key, name in cls.SKILL_CATEGORIES}
+            labels = dict(cls.SKILL_CATEGORIES)
+            # Category first, as the portfolio_skill_order index is
+            for skill in cls.objects.all():
+                grouped.setdefault(labels.get(skill.category, skill.category), []).append(skill)
+            return {name: skills for name, skills in grouped.items() if skills}
+        
+        return get_or_build('skills_by_category', [cls], build)
+    
     @property
     def proficiency_stars(self):
         """Return HTML for star rating display"""
@@ -365,9 +518,9 @@ class CareerTimeline(models.Model):
     def __str__(self):
         return f"{self.job_title} at {self.company}"
     
-    @property
+    @cached_property
     def duration(self):
-        """Calculate and return formatted duration"""
+        """Calculate and return formatted duration, once per instance"""
         start_year = self.start_date.year
         start_month = self.start_date.month
         
@@ -417,19 +570,275 @@ class FooterLink(models.Model):
     
     def __str__(self):
         return f"{self.title} ({self.get_category_display()})"
+    
+    @classmethod
+    def get_grouped(cls):
+        """
+        Get active links grouped by category display name, with caching.
+        
+        Built from a single ordered query and bucketed in category order;
+        empty categories are left out.
+        """
+        def build():
+            grouped = {name: [] for key, name in cls.LINK_CATEGORIES}
+            labels = dict(cls.LINK_CATEGORIES)
+            for link in cls.objects.filter(is_active=True).order_by('order', 'title'):
+                grouped.setdefault(labels.get(link.category, link.category), []).append(link)
+            return {name: links for name, links in grouped.items() if links}
+        
+        return get_or_build('footer_links', [cls], build)
 
 
 class ContactMessage(models.Model):
     """Model for storing contact form submissions"""
+    DELIVERY_CHOICES = [
+        ('queued', 'Queued'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+    
     name = models.CharField(max_length=100)
     email = models.EmailField()
     subject = models.CharField(max_length=200)
     message = models.TextField()
     created = models.DateTimeField(auto_now_add=True)
     is_read = models.BooleanField(default=False)
+    # Delivery of the emails queued for this message (see portfolio/outbox.py)
+    notification_status = models.CharField(max_length=10, choices=DELIVERY_CHOICES, blank=True)
+    auto_reply_status = models.CharField(max_length=10, choices=DELIVERY_CHOICES, blank=True)
     
     class Meta:
         ordering = ['-created']
+        indexes = [
+            # Dashboard messages, newest first. Unread ones get a small index
+            # of their own; read ones are most of the table and walk the first
+            models.Index(fields=['-created', '-id'], name='portfolio_message_recent'),
+            models.Index(
+                fields=['-created', '-id'], condition=models.Q(is_read=False),
+                name='portfolio_message_unread',
+            ),
+        ]
     
     def __str__(self):
         return f"Message from {self.name} - {self.subject}"
+
+
+class OutgoingEmail(models.Model):
+    """
+    Email waiting in the outbox for the send_queued_email worker.
+    
+    Rows are written by portfolio.outbox; sent rows are kept as a delivery log.
+    """
+    KIND_CHOICES = [
+        ('notification', 'Admin notification'),
+        ('auto_reply', 'Auto-reply'),
+    ]
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+    
+    contact_message = models.ForeignKey(
+        ContactMessage, on_delete=models.SET_NULL, null=True, blank=True, related_name='emails'
+    )
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254)
+    to = models.EmailField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-created']
+        indexes = [models.Index(fields=['status', 'next_attempt_at'], name='portfolio_outbox_due')]
+    
+    def __str__(self):
+        return f"{self.get_kind_display()} to {self.to} ({self.status})"
+
+
+class ResponsiveImage(models.Model):
+    """
+    Resized renditions of an uploaded image, stored next to the original.
+
+    Rows are written by portfolio.images, never edited by hand.
+    """
+    source = models.CharField(max_length=255, unique=True, help_text="Storage name of the original image")
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    renditions = models.JSONField(default=dict, help_text="Storage names by format, as [width, name] pairs")
+    created = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return self.source
+    
+    @classmethod
+    def get_entry(cls, source, storage=None):
+        """
+        Get rendition URLs of the processed image ``source``, or None, with caching.
+        
+        URLs are built by ``storage``, the storage the renditions were saved
+        to (the image field's; default_storage when omitted). Each image is
+        cached on its own, so a miss reads one row rather than the table.
+        """
+        if storage is None:
+            from django.core.files.storage import default_storage
+            storage = default_storage
+        
+        def build():
+            image = cls.objects.filter(source=source).first()
+            if image is None:
+                return None
+            return {
+                'width': image.width,
+                'height': image.height,
+                'renditions': {
+                    format: [(width, storage.url(name)) for width, name in renditions]
+                    for format, renditions in image.renditions.items()
+                },
+            }
+        
+        try:
+            # Storages configured differently build different URLs
+            path, args, kwargs = storage.deconstruct()
+            storage_key = (path, args, sorted(kwargs.items()))
+        except AttributeError:
+            storage_key = (type(storage).__module__, type(storage).__qualname__)
+        return get_or_build('responsive_image', [cls], build, parts=[storage_key, source])
+
+
+class PendingUpload(models.Model):
+    """
+    A file upload staged on local disk, waiting to be moved into its field's storage.
+    
+    Rows are written by portfolio.uploads; finished rows are kept as an upload log.
+    """
+    FIELD_CHOICES = [
+        ('resume', 'Resume'),
+    ]
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('uploading', 'Uploading'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+    
+    personal_info = models.ForeignKey(PersonalInfo, on_delete=models.CASCADE, related_name='pending_uploads')
+    field_name = models.CharField(max_length=50, choices=FIELD_CHOICES)
+    staged_name = models.CharField(max_length=255, help_text="Name of the staged file in the upload staging storage")
+    original_name = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField(default=0)
+    bytes_uploaded = models.PositiveBigIntegerField(default=0)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-created']
+        indexes = [models.Index(fields=['status', 'next_attempt_at'], name='portfolio_upload_due')]
+    
+    def __str__(self):
+        return f"{self.original_name} ({self.status})"
+    
+    @property
+    def progress(self):
+        """Percentage of the file sent to storage"""
+        if not self.size:
+            return 100 if self.status == 'done' else 0
+        return min(100, round(self.bytes_uploaded * 100 / self.size))
+
+
+class GitHubResponse(models.Model):
+    """
+    Last response to a GitHub API request, replayed when GitHub answers 304.
+    
+    Rows are written by portfolio.github_sync, never edited by hand.
+    """
+    url = models.CharField(max_length=500, unique=True)
+    etag = models.CharField(max_length=200, blank=True)
+    data = models.JSONField(default=dict)
+    next_url = models.CharField(max_length=500, blank=True, help_text="Next page from the Link header")
+    updated = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return self.url
+
+
+class ScheduledJob(models.Model):
+    """
+    A management command run periodically by the run_scheduler worker.
+    
+    Schedules are cron expressions (see portfolio.cron) in the project time
+    zone. ``locked_until`` is the distributed lock: a worker holding it is
+    running the job and no other worker will start it.
+    """
+    STATUS_CHOICES = [
+        ('running', 'Running'),
+        ('success', 'Success'),
+        ('failed', 'Failed'),
+    ]
+    
+    name = models.CharField(max_length=100, unique=True)
+    command = models.CharField(max_length=100, help_text="Management command to run, e.g. sync_github_repos")
+    arguments = models.CharField(max_length=500, blank=True, help_text="Command-line arguments, e.g. --username octocat")
+    schedule = models.CharField(max_length=100, help_text="Cron expression, e.g. '0 3 * * *' or '@hourly'")
+    enabled = models.BooleanField(default=True)
+    next_run_at = models.DateTimeField(null=True, blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True, editable=False)
+    locked_by = models.CharField(max_length=200, blank=True, editable=False)
+    last_run_at = models.DateTimeField(null=True, blank=True, editable=False)
+    last_status = models.CharField(max_length=10, choices=STATUS_CHOICES, blank=True, editable=False)
+    
+    class Meta:
+        ordering = ['name']
+        # Partial, as SQLite cannot look up a bare boolean column in an index
+        indexes = [
+            models.Index(fields=['next_run_at'], condition=models.Q(enabled=True), name='portfolio_job_due'),
+        ]
+    
+    def __str__(self):
+        return self.name
+    
+    def clean(self):
+        from django.core.management import get_commands
+        
+        errors = {}
+        try:
+            CronSchedule(self.schedule)
+        except ValueError as e:
+            errors['schedule'] = str(e)
+        if self.command not in get_commands():
+            errors['command'] = f"Unknown management command '{self.command}'"
+        if errors:
+            raise ValidationError(errors)
+    
+    def save(self, *args, **kwargs):
+        if self.next_run_at is None and self.enabled:
+            self.next_run_at = CronSchedule(self.schedule).next_after()
+        super().save(*args, **kwargs)
+
+
+class JobRun(models.Model):
+    """One run of a scheduled job, kept as its history"""
+    job = models.ForeignKey(ScheduledJob, on_delete=models.CASCADE, related_name='runs')
+    status = models.CharField(max_length=10, choices=ScheduledJob.STATUS_CHOICES, default='running')
+    worker = models.CharField(max_length=200)
+    started_at = models.DateTimeField(default=timezone.now)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    duration = models.FloatField(null=True, blank=True, help_text="Seconds")
+    output = models.TextField(blank=True)
+    
+    class Meta:
+        ordering = ['-started_at']
+        indexes = [models.Index(fields=['job', '-started_at'], name='portfolio_jobrun_recent')]
+    
+    def __str__(self):
+        return f"{self.job} at {self.started_at:%Y-%m-%d %H:%M} ({self.status})"
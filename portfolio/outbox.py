@@ -0,0 +1,273 @@
+"""
+Outbox for contact-form email.
+
+Submitting the contact form queues the admin notification and the auto-reply
+as ``OutgoingEmail`` rows, which a background thread sends once the
+request's transaction commits (see ``portfolio.background``), so the mail
+server is never contacted on the request path. Failed sends are retried with
+exponential backoff and given up after ``PORTFOLIO_EMAIL_MAX_ATTEMPTS``;
+retries are picked up by ``send_queued_email`` (the Procfile worker, or the
+scheduler's ``send-queued-email`` job where no worker runs). Delivery status
+is mirrored onto the ``ContactMessage``.
+
+Set ``PORTFOLIO_EMAIL_WORKER = True`` where the worker process runs to
+leave every send to it instead of the web process's threads.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from . import background
+from .models import ContactMessage, OutgoingEmail, PersonalInfo
+
+logger = logging.getLogger(__name__)
+
+MAX_RETRY_DELAY = 6 * 60 * 60
+
+# A claimed email is skipped by other workers for this long; if its worker
+# dies mid-batch the email becomes due again afterwards
+CLAIM_TIMEOUT = 5 * 60
+
+BACKGROUND_KEY = 'contact-email'
+
+# ContactMessage field mirroring the delivery of each kind of email
+STATUS_FIELDS = {
+    'notification': 'notification_status',
+    'auto_reply': 'auto_reply_status',
+}
+
+
+def notification_email(contact_message, personal_info):
+    """Subject and body of the email telling the owner about a new message"""
+    admin_subject_prefix = getattr(settings, 'ADMIN_EMAIL_SUBJECT_PREFIX', '[Portfolio Contact] ')
+    admin_subject = f"{admin_subject_prefix}{contact_message.subject}"
+    
+    # Professional email template
+    website_info = f"\n🌐 Website: {personal_info.website_url}" if personal_info and personal_info.website_url else ""
+    location_info = f"\n📍 Location: {personal_info.location}" if personal_info and personal_info.location else ""
+    
+    admin_message = f"""
+📧 NEW PORTFOLIO CONTACT SUBMISSION
+{'=' * 50}
+
+👤 CONTACT DETAILS:
+Name: {contact_message.name}
+Email: {contact_message.email}
+Subject: {contact_message.subject}
+Submitted: {contact_message.created.strftime('%B %d, %Y at %I:%M %p')}
+
+💬 MESSAGE:
+{'-' * 50}
+{contact_message.message}
+{'-' * 50}
+
+🔄 NEXT STEPS:
+• Reply directly to: {contact_message.email}
+• View in dashboard: http://127.0.0.1:8000/dashboard/messages/
+• Mark as read after responding
+
+{'=' * 50}
+🏷️ PORTFOLIO INFORMATION:
+Owner: {personal_info.full_name if personal_info else 'Portfolio Owner'}
+Portfolio: {personal_info.portfolio_name if personal_info else 'My Portfolio'}{website_info}{location_info}
+
+---
+⚡ This notification was automatically generated from your portfolio contact form.
+📱 You can manage all messages from your dashboard.
+    """
+    
+    return admin_subject, admin_message
+
+
+def auto_reply_email(contact_message, personal_info):
+    """Subject and body of the confirmation sent back to the sender"""
+    # Professional auto-reply subject
+    portfolio_name = personal_info.portfolio_name if personal_info else "My Portfolio"
+    auto_reply_subject = f"Thank you for contacting {portfolio_name}!"
+    
+    # Professional auto-reply template
+    full_name = personal_info.full_name if personal_info else "Portfolio Owner"
+    current_role = f"\n{personal_info.current_role}" if personal_info and personal_info.current_role else ""
+    email_contact = f"\n📧 Email: {personal_info.email}" if personal_info and personal_info.email else ""
+    phone_contact = f"\n📞 Phone: {personal_info.phone}" if personal_info and personal_info.phone else ""
+    website_link = f"\n🌐 Portfolio: {personal_info.website_url}" if personal_info and personal_info.website_url else ""
+    linkedin_link = f"\n💼 LinkedIn: {personal_info.linkedin_url}" if personal_info and personal_info.linkedin_url else ""
+    
+    auto_reply_message = f"""
+Hello {contact_message.name},
+
+✨ Thank you for reaching out through my portfolio website!
+
+I have successfully received your message regarding "{contact_message.subject}" and truly appreciate you taking the time to contact me.
+
+📋 MESSAGE CONFIRMATION:
+Your inquiry has been logged and I will respond personally within 24-48 hours. Here's a copy of your message for your records:
+
+{'-' * 50}
+{contact_message.message}
+{'-' * 50}
+
+🚀 WHAT'S NEXT:
+• I'll review your message carefully
+• You'll receive a personalized response soon
+• Feel free to follow up if you have additional questions
+
+📞 FOR URGENT MATTERS:
+If you have time-sensitive inquiries, please don't hesitate to reach out directly using the contact information below.
+
+{'=' * 50}
+🏷️ CONTACT INFORMATION:
+{full_name}{current_role}{email_contact}{phone_contact}{website_link}{linkedin_link}
+
+Best regards,
+{full_name}
+{portfolio_name}
+
+---
+🤖 This is an automated confirmation. Please do not reply to this email.
+💬 I'll be in touch with you personally very soon!
+    """
+    
+    return auto_reply_subject, auto_reply_message
+
+
+def queue_contact_emails(contact_message):
+    """Queue the admin notification and, if enabled, the auto-reply for a message"""
+    personal_info = PersonalInfo.get_active()
+    contact_email = getattr(settings, 'CONTACT_EMAIL', settings.DEFAULT_FROM_EMAIL)
+    
+    subject, body = notification_email(contact_message, personal_info)
+    emails = [OutgoingEmail(
+        contact_message=contact_message, kind='notification', subject=subject, body=body,
+        from_email=settings.DEFAULT_FROM_EMAIL, to=contact_email,
+    )]
+    if getattr(settings, 'SEND_AUTO_REPLY', True):
+        subject, body = auto_reply_email(contact_message, personal_info)
+        emails.append(OutgoingEmail(
+            contact_message=contact_message, kind='auto_reply', subject=subject, body=body,
+            from_email=settings.DEFAULT_FROM_EMAIL, to=contact_message.email,
+        ))
+    emails = OutgoingEmail.objects.bulk_create(emails)
+    
+    ContactMessage.objects.filter(pk=contact_message.pk).update(
+        **{STATUS_FIELDS[email.kind]: 'queued' for email in emails}
+    )
+    for email in emails:
+        setattr(contact_message, STATUS_FIELDS[email.kind], 'queued')
+    
+    if not getattr(settings, 'PORTFOLIO_EMAIL_WORKER', False):
+        for email in emails:
+            background.debounce_on_commit(BACKGROUND_KEY, 0, send_queued, email)
+    return emails
+
+
+def send_queued(emails):
+    """Send emails queued by requests, unless a worker claimed them first"""
+    return send_batch(claim(emails))
+
+
+def claim(emails):
+    """Reserve the given emails unless a worker already has; returns the ones reserved"""
+    now = timezone.now()
+    return [
+        email for email in emails
+        if OutgoingEmail.objects.filter(pk=email.pk, status='queued', next_attempt_at__lte=now)
+        .update(next_attempt_at=now + timedelta(seconds=CLAIM_TIMEOUT))
+    ]
+
+
+def claim_batch(batch_size=20):
+    """Reserve up to ``batch_size`` due emails for this worker"""
+    now = timezone.now()
+    with transaction.atomic():
+        emails = list(
+            OutgoingEmail.objects.select_for_update(skip_locked=True)
+            .filter(status='queued', next_attempt_at__lte=now)
+            .order_by('next_attempt_at')[:batch_size]
+        )
+        OutgoingEmail.objects.filter(pk__in=[email.pk for email in emails]).update(
+            next_attempt_at=now + timedelta(seconds=CLAIM_TIMEOUT)
+        )
+    return emails
+
+
+def _record(email, **fields):
+    """Save delivery fields on an email and mirror its status onto the message"""
+    for name, value in fields.items():
+        setattr(email, name, value)
+    # Queryset updates skip model signals, which would purge the page cache
+    OutgoingEmail.objects.filter(pk=email.pk).update(**fields)
+    if email.contact_message_id:
+        ContactMessage.objects.filter(pk=email.contact_message_id).update(
+            **{STATUS_FIELDS[email.kind]: email.status}
+        )
+
+
+def _failed(email, error):
+    # Read here rather than at import so they follow override_settings
+    max_attempts = getattr(settings, 'PORTFOLIO_EMAIL_MAX_ATTEMPTS', 5)
+    # Seconds before the first retry; doubled after every failed attempt
+    retry_delay = getattr(settings, 'PORTFOLIO_EMAIL_RETRY_DELAY', 60)
+    attempts = email.attempts + 1
+    if attempts >= max_attempts:
+        logger.error(f"Giving up on {email} after {attempts} attempts: {error}")
+        _record(email, attempts=attempts, status='failed', last_error=str(error))
+        return
+    delay = min(retry_delay * 2 ** (attempts - 1), MAX_RETRY_DELAY)
+    logger.warning(f"Sending {email} failed, retrying in {delay}s: {error}")
+    _record(
+        email, attempts=attempts, last_error=str(error),
+        next_attempt_at=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def send_batch(emails):
+    """
+    Send emails over a single mail server connection.
+    
+    Returns (sent, failed) counts; failures are rescheduled or given up on.
+    """
+    if not emails:
+        return 0, 0
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as e:
+        for email in emails:
+            _failed(email, e)
+        return 0, len(emails)
+    
+    sent = 0
+    try:
+        for email in emails:
+            message = EmailMessage(
+                subject=email.subject, body=email.body, from_email=email.from_email,
+                to=[email.to], connection=connection,
+            )
+            try:
+                message.send()
+            except Exception as e:
+                _failed(email, e)
+            else:
+                _record(email, attempts=email.attempts + 1, status='sent',
+                        sent_at=timezone.now(), last_error='')
+                sent += 1
+    finally:
+        connection.close()
+    return sent, len(emails) - sent
+
+
+def send_due(batch_size=20):
+    """Send every email that is due, one batch at a time"""
+    sent = failed = 0
+    while True:
+        emails = claim_batch(batch_size)
+        if not emails:
+            return sent, failed
+        batch_sent, batch_failed = send_batch(emails)
+        sent += batch_sent
+        failed += batch_failed
@@ -0,0 +1,110 @@
+"""
+Full-page response cache for anonymous visitors.
+
+Rendered responses are stored per absolute URL (including the query string)
+under the site-wide content generation from ``portfolio.cache``. Any change
+to a public model bumps that generation, so an edit purges every cached page
+at once instead of waiting for a TTL. Responses carry a strong ETag and
+conditional GETs are answered with 304 Not Modified.
+
+Purging relies on every web worker seeing the bumped generation, so unless
+``PORTFOLIO_PAGE_CACHE`` says otherwise the page cache is only on outside
+DEBUG with a shared cache backend; with a per-process LocMemCache other
+workers would keep serving the old pages.
+"""
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+
+from portfolio_project.metrics import record_cache, timed
+
+from .cache import CACHE_PREFIX, CACHE_TIMEOUT, get_content_generation, is_shared_cache
+
+
+def page_cache_enabled():
+    """PORTFOLIO_PAGE_CACHE, or when unset whether DEBUG is off and the cache is shared"""
+    enabled = getattr(settings, 'PORTFOLIO_PAGE_CACHE', None)
+    if enabled is None:
+        return not settings.DEBUG and is_shared_cache()
+    return enabled
+
+
+def _is_cacheable_request(request):
+    """Only anonymous GET/HEAD requests without pending messages are cached"""
+    if not page_cache_enabled():
+        return False
+    if request.method not in ('GET', 'HEAD'):
+        return False
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return False
+    # len() loads the stored messages without marking them as consumed
+    if len(get_messages(request)):
+        return False
+    return True
+
+
+def _is_cacheable_response(request, response):
+    return (
+        response.status_code == 200
+        and not response.streaming
+        and not response.cookies
+        and not response.has_header('Cache-Control')
+        and not request.META.get('CSRF_COOKIE_NEEDS_UPDATE')
+    )
+
+
+def page_cache_key(request):
+    """Return the cache key for a request under the current content generation"""
+    url = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+    return f'{CACHE_PREFIX}:page:{get_content_generation()}:{url}'
+
+
+def _build_response(entry):
+    response = HttpResponse(entry['content'], content_type=entry['content_type'])
+    response['ETag'] = entry['etag']
+    return response
+
+
+def cache_public_page(view_func):
+    """
+    Serve a view from the full-page cache for anonymous visitors.
+
+    Usage: ``@method_decorator(cache_public_page, name='dispatch')``
+    """
+    @wraps(view_func)
+    def _wrapped_view(request, *args, **kwargs):
+        if not _is_cacheable_request(request):
+            return view_func(request, *args, **kwargs)
+
+        key = page_cache_key(request)
+        entry = cache.get(key)
+        record_cache(hit=entry is not None)
+        if entry is not None:
+            response = _build_response(entry)
+            response['X-Page-Cache'] = 'HIT'
+            return get_conditional_response(request, etag=entry['etag'], response=response)
+
+        response = view_func(request, *args, **kwargs)
+        if hasattr(response, 'render') and callable(response.render):
+            with timed('template'):
+                response = response.render()
+        if not _is_cacheable_response(request, response):
+            return response
+
+        entry = {
+            'content': response.content,
+            'content_type': response['Content-Type'],
+            'etag': '"%s"' % hashlib.md5(response.content).hexdigest(),
+        }
+        cache.set(key, entry, CACHE_TIMEOUT)
+        response['ETag'] = entry['etag']
+        response['X-Page-Cache'] = 'MISS'
+        return get_conditional_response(request, etag=entry['etag'], response=response)
+
+    return _wrapped_view
@@ -0,0 +1,247 @@
+"""
+Keyset (cursor) pagination.
+
+Numbered pages cost a ``COUNT(*)`` plus an ``OFFSET`` that grows with the
+page number. ``CursorPaginator`` instead remembers the ordering values of
+the last (or first) row shown and asks for the rows after (or before) them,
+so every page is a single indexed range query however deep it is. Pages
+only link to their neighbours and there is no total.
+
+The ordering must end in a unique field (``('-created', '-id')``) so it is
+total and rows are never skipped or repeated between pages; the fields must
+not be nullable. ``CursorPaginationMixin`` plugs the paginator into a
+``ListView`` that declares a ``cursor_ordering``.
+
+``approximate_count()`` replaces exact counts of large tables with the
+PostgreSQL planner's estimate.
+"""
+import base64
+import json
+
+from django.conf import settings
+from django.core.paginator import InvalidPage
+from django.db import connections
+from django.db.models import Q
+from django.db.models.query import QuerySet
+from django.http import Http404
+
+# Row counts below this are always counted exactly
+EXACT_COUNT_LIMIT = getattr(settings, 'PORTFOLIO_EXACT_COUNT_LIMIT', 10000)
+
+
+class InvalidCursor(InvalidPage):
+    pass
+
+
+def _encode(direction, values):
+    values = [value.isoformat() if hasattr(value, 'isoformat') else value for value in values]
+    data = json.dumps([direction] + values, separators=(',', ':'))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip('=')
+
+
+def _follows(values, mark, descending):
+    """Whether a row's ordering ``values`` come after ``mark``"""
+    for value, marked, desc in zip(values, mark, descending):
+        if value != marked:
+            return value < marked if desc else value > marked
+    return False
+
+
+class CursorPage:
+    """One page of a CursorPaginator"""
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return f'<Cursor page of {len(self.object_list)} rows>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self):
+        if not self._has_next:
+            return None
+        return _encode('next', self.paginator.values_of(self.object_list[-1]))
+
+    @property
+    def previous_cursor(self):
+        if not self._has_previous:
+            return None
+        return _encode('previous', self.paginator.values_of(self.object_list[0]))
+
+
+class CursorPaginator:
+    """
+    Paginate ``object_list`` by ``ordering`` (field names, '-' for descending).
+
+    Querysets are ordered by ``ordering`` here; lists (such as a cached
+    listing) must already be in that order.
+    """
+
+    def __init__(self, object_list, per_page, ordering, model=None):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.ordering = list(ordering)
+        self.fields = [name.lstrip('-') for name in self.ordering]
+        self.descending = [name.startswith('-') for name in self.ordering]
+        self.model = model or getattr(object_list, 'model', None)
+
+    def values_of(self, row):
+        return [getattr(row, field) for field in self.fields]
+
+    def encode(self, direction, values):
+        """Return a cursor to the rows after (or before) ordering ``values``, as CursorPage makes"""
+        return _encode(direction, values)
+
+    def decode(self, cursor):
+        """Return (direction, values) of a cursor made by CursorPage"""
+        try:
+            data = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+            direction, values = data[0], data[1:]
+            if direction not in ('next', 'previous') or len(values) != len(self.fields):
+                raise ValueError(cursor)
+            return direction, [
+                self.model._meta.get_field(field).to_python(value)
+                for field, value in zip(self.fields, values)
+            ]
+        except Exception:
+            raise InvalidCursor('That page cursor is not valid')
+
+    def keyset_filter(self, mark, descending=None):
+        """Q matching rows after ``mark`` (default: in the paginator's ordering)"""
+        descending = self.descending if descending is None else descending
+        condition = Q()
+        for index, (field, desc) in enumerate(zip(self.fields, descending)):
+            step = Q(**{f'{field}__{"lt" if desc else "gt"}': mark[index]})
+            for previous in range(index):
+                step &= Q(**{self.fields[previous]: mark[previous]})
+            condition |= step
+        return condition
+
+    def _descending(self, direction):
+        # Walking backwards is walking forwards in the reversed order
+        return [desc != (direction == 'previous') for desc in self.descending]
+
+    def _page_queryset(self, descending, mark):
+        queryset = self.object_list.order_by(*(
+            f'-{field}' if desc else field for field, desc in zip(self.fields, descending)
+        ))
+        if mark is not None:
+            queryset = queryset.filter(self.keyset_filter(mark, descending))
+        # One row more than a page tells whether another follows
+        return queryset[:self.per_page + 1]
+
+    def page_queryset(self, cursor=None):
+        """The query ``page(cursor)`` runs when paginating a queryset"""
+        direction, mark = self.decode(cursor) if cursor else ('next', None)
+        return self._page_queryset(self._descending(direction), mark)
+
+    def page(self, cursor=None):
+        direction, mark = self.decode(cursor) if cursor else ('next', None)
+        backwards = direction == 'previous'
+        descending = self._descending(direction)
+
+        if isinstance(self.object_list, QuerySet):
+            rows = list(self._page_queryset(descending, mark))
+        else:
+            rows = list(reversed(self.object_list)) if backwards else list(self.object_list)
+            if mark is not None:
+                rows = [row for row in rows if _follows(self.values_of(row), mark, descending)]
+            rows = rows[:self.per_page + 1]
+
+        more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if backwards:
+            if not more:
+                # Back at the start: show a full first page
+                return self.page()
+            return CursorPage(rows[::-1], self, has_next=True, has_previous=True)
+        return CursorPage(rows, self, has_next=more, has_previous=mark is not None)
+
+
+class CursorPaginationMixin:
+    """
+    ListView mixin paginating by cursor instead of page number.
+
+    Views opt in with a ``cursor_ordering``; ``get_cursor_ordering()`` may
+    return None for requests that need numbered pages (such as search results
+    ordered by rank). ``cursor_pagination`` turns cursors on for the view;
+    None follows the PORTFOLIO_CURSOR_PAGINATION setting.
+    """
+    cursor_ordering = None
+    cursor_pagination = None
+    cursor_kwarg = 'cursor'
+
+    @classmethod
+    def cursor_enabled(cls):
+        if cls.cursor_pagination is None:
+            return getattr(settings, 'PORTFOLIO_CURSOR_PAGINATION', False)
+        return cls.cursor_pagination
+
+    def get_cursor_ordering(self):
+        return self.cursor_ordering
+
+    def paginate_queryset(self, queryset, page_size):
+        ordering = self.get_cursor_ordering()
+        if not ordering or not self.cursor_enabled():
+            return super().paginate_queryset(queryset, page_size)
+        paginator = CursorPaginator(queryset, page_size, ordering, model=self.model)
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidCursor as e:
+            raise Http404(str(e))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+def _estimate(queryset):
+    """PostgreSQL's estimate of the rows in ``queryset``, or None if it has none"""
+    connection = connections[queryset.db]
+    with connection.cursor() as cursor:
+        if not queryset.query.where:
+            # Table statistics kept by VACUUM/ANALYZE; -1 until the first one
+            cursor.execute(
+                'SELECT reltuples FROM pg_class WHERE oid = %s::regclass',
+                [connection.ops.quote_name(queryset.model._meta.db_table)],
+            )
+            row = cursor.fetchone()
+            return int(row[0]) if row and row[0] >= 0 else None
+        sql, params = queryset.query.sql_with_params()
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def approximate_count(queryset):
+    """
+    Count ``queryset``, estimating on PostgreSQL when it is large.
+
+    Returns (count, exact). Below EXACT_COUNT_LIMIT rows, and on other
+    databases, the count is exact.
+    """
+    if connections[queryset.db].vendor == 'postgresql':
+        estimate = _estimate(queryset)
+        if estimate is not None and estimate >= EXACT_COUNT_LIMIT:
+            return estimate, False
+    return queryset.count(), True
@@ -0,0 +1,143 @@
+"""
+Query plans for the listing queries.
+
+``listing_queries()`` builds the queries behind the public and dashboard
+listings from the views themselves (their ``get_queryset()`` and
+pagination), plus the background workers' due-item polls, each with the
+index it is meant to use (see the models' ``Meta.indexes``). ``explain()``
+runs EXPLAIN on one and reports whether that index appears in the plan.
+
+``benchmark()`` times each query with its index and, inside a transaction
+that is rolled back, without it. Dropping an index locks its table until
+the rollback, so run it against a seeded copy (``manage.py
+seed_benchmark_data``), not the live database. Used by ``manage.py
+explain_queries``.
+"""
+import statistics
+import time
+from collections import namedtuple
+
+from django.db import connections, transaction
+from django.test import RequestFactory
+from django.utils import timezone
+
+from dashboard import views as dashboard_views
+from .models import OutgoingEmail, PendingUpload, Project, ScheduledJob, Skill
+from .pagination import CursorPaginator
+from .views import BlogListView, ProjectListView
+
+ListingQuery = namedtuple('ListingQuery', ['label', 'queryset', 'index'])
+QueryPlan = namedtuple('QueryPlan', ['query', 'plan', 'uses_index'])
+QueryTiming = namedtuple('QueryTiming', ['query', 'indexed_ms', 'unindexed_ms'])
+
+
+def _view(view_class, **params):
+    view = view_class()
+    view.setup(RequestFactory().get('/', params))
+    return view
+
+
+def _first_page(view_class, **params):
+    """Query for the first page a listing view shows for a GET with ``params``"""
+    view = _view(view_class, **params)
+    queryset = view.get_queryset()
+    page_size = view.get_paginate_by(queryset)
+    ordering = view.get_cursor_ordering() if hasattr(view, 'get_cursor_ordering') else None
+    if ordering and view.cursor_enabled():
+        # A cursor page is fetched as it is paginated; take the query instead
+        return CursorPaginator(queryset, page_size, ordering, model=view.model).page_queryset()
+    paginator, page, object_list, is_paginated = view.paginate_queryset(queryset, page_size)
+    return object_list
+
+
+def _next_page(view_class, **params):
+    """Query for a cursor page after the first, for a view ordered by ('-created', '-id')"""
+    view = _view(view_class, **params)
+    queryset = view.get_queryset()
+    paginator = CursorPaginator(
+        queryset, view.get_paginate_by(queryset), view.cursor_ordering, model=view.model
+    )
+    return paginator.page_queryset(paginator.encode('next', [timezone.now(), 2 ** 31]))
+
+
+def listing_queries():
+    """The queries each index exists for, as ListingQuery(label, queryset, index)"""
+    now = timezone.now()
+    messages = dashboard_views.ContactMessageListView
+    return [
+        ListingQuery('Project listing', _first_page(ProjectListView),
+                     'portfolio_project_listing'),
+        # As HomeView
+        ListingQuery('Featured projects', Project.objects.for_listing().filter(is_featured=True)[:3],
+                     'portfolio_project_listing'),
+        ListingQuery('Dashboard projects', _first_page(dashboard_views.ProjectListView),
+                     'portfolio_project_recent'),
+        ListingQuery('Blog listing', _first_page(BlogListView),
+                     'portfolio_post_published'),
+        ListingQuery('Blog listing, next page', _next_page(BlogListView),
+                     'portfolio_post_published'),
+        ListingQuery('Dashboard posts', _first_page(dashboard_views.BlogPostListView),
+                     'portfolio_post_recent'),
+        ListingQuery('Skills by category', Skill.objects.all(), 'portfolio_skill_order'),
+        ListingQuery('Messages', _first_page(messages), 'portfolio_message_recent'),
+        ListingQuery('Unread messages', _first_page(messages, status='unread'),
+                     'portfolio_message_unread'),
+        ListingQuery('Unread messages, next page', _next_page(messages, status='unread'),
+                     'portfolio_message_unread'),
+        ListingQuery('Outbox due', OutgoingEmail.objects.filter(
+            status='queued', next_attempt_at__lte=now).order_by('next_attempt_at')[:20],
+            'portfolio_outbox_due'),
+        ListingQuery('Uploads due', PendingUpload.objects.filter(
+            status='queued', next_attempt_at__lte=now).order_by('next_attempt_at')[:10],
+            'portfolio_upload_due'),
+        ListingQuery('Scheduled jobs due', ScheduledJob.objects.filter(
+            enabled=True, next_run_at__lte=now).order_by('next_run_at')[:1],
+            'portfolio_job_due'),
+    ]
+
+
+def _prefer_indexes(connection):
+    """
+    Make PostgreSQL plan with indexes wherever it can.
+
+    On small tables the planner rightly prefers a sequential scan, so this
+    shows whether an index *could* serve the query. Must run in a transaction.
+    """
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+
+
+def explain(query, prefer_indexes=False):
+    """Return the QueryPlan of a ListingQuery"""
+    queryset = query.queryset
+    with transaction.atomic(using=queryset.db):
+        if prefer_indexes:
+            _prefer_indexes(connections[queryset.db])
+        plan = queryset.explain()
+    return QueryPlan(query, plan, query.index in plan)
+
+
+def _time(queryset, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        list(queryset.all())
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def benchmark(queries=None, repeat=20):
+    """Median milliseconds of each ListingQuery with and without its index"""
+    results = []
+    for query in listing_queries() if queries is None else queries:
+        queryset = query.queryset
+        connection = connections[queryset.db]
+        indexed = _time(queryset, repeat)
+        with transaction.atomic(using=queryset.db):
+            with connection.cursor() as cursor:
+                cursor.execute(f'DROP INDEX {connection.ops.quote_name(query.index)}')
+            unindexed = _time(queryset, repeat)
+            transaction.set_rollback(True, using=queryset.db)
+        results.append(QueryTiming(query, indexed, unindexed))
+    return results
@@ -0,0 +1,239 @@
+"""
+Precomputed related content for project and blog detail pages.
+
+Similarity is scored outside the request path and stored as the top-N
+neighbours of each object (``RelatedProject`` / ``RelatedBlogPost``), so a
+detail page's "related" block is a single indexed lookup.
+
+A candidate's score combines shared tags, tech stack overlap (projects only)
+and how recent the candidate is, with a small bonus for featured projects so
+every page still has something to show when nothing overlaps.
+
+Signals call ``schedule()`` whenever content or tags change. Once the
+transaction commits, the change is queued and scored on a background thread
+(see ``portfolio.background``) ``PORTFOLIO_RELATED_REFRESH_DELAY`` seconds
+later, so the save and the tag changes of one edit are scored once and never
+inside the request. A single changed object goes through
+``refresh(model, pk)``, which rewrites its own neighbours and only those other
+lists the change can affect; anything more is a full ``rebuild(model)``. The
+scheduler's ``related-content`` job (and
+``manage.py rebuild_related_content``) rebuilds everything, which also covers
+changes queued by a process that exited before scoring them.
+"""
+from collections import defaultdict, namedtuple
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from . import background
+from .cache import bump_content_generation, bump_generation
+from .models import Project, BlogPost, RelatedProject, RelatedBlogPost
+
+RELATED_LIMIT = getattr(settings, 'PORTFOLIO_RELATED_LIMIT', 6)
+
+TAG_WEIGHT = 3.0
+TECH_WEIGHT = 2.0
+FEATURED_BONUS = 0.5
+# Age (in days) at which the recency component has dropped to half
+RECENCY_SCALE_DAYS = 180
+
+Features = namedtuple('Features', 'pk tags tech created featured')
+
+
+def _tokens(value):
+    return frozenset(part.strip().lower() for part in value.split(',') if part.strip())
+
+
+def _jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _recency(created, now):
+    age_days = max((now - created).days, 0)
+    return 1.0 / (1.0 + age_days / RECENCY_SCALE_DAYS)
+
+
+def project_features():
+    """Similarity features for every project, keyed by pk"""
+    features = {}
+    for project in Project.objects.only(
+        'id', 'tech_stack', 'created_at', 'is_featured'
+    ).prefetch_related('tags'):
+        features[project.pk] = Features(
+            pk=project.pk,
+            tags=frozenset(tag.pk for tag in project.tags.all()),
+            tech=_tokens(project.tech_stack),
+            created=project.created_at,
+            featured=project.is_featured,
+        )
+    return features
+
+
+def blog_post_features():
+    """Similarity features for every published blog post, keyed by pk"""
+    features = {}
+    for post in BlogPost.objects.filter(is_published=True).only(
+        'id', 'created'
+    ).prefetch_related('tags'):
+        features[post.pk] = Features(
+            pk=post.pk,
+            tags=frozenset(tag.pk for tag in post.tags.all()),
+            tech=frozenset(),
+            created=post.created,
+            featured=False,
+        )
+    return features
+
+
+INDEXES = {
+    Project: (RelatedProject, project_features),
+    BlogPost: (RelatedBlogPost, blog_post_features),
+}
+
+
+def score(source, candidate, now):
+    """How related ``candidate`` is to ``source``"""
+    value = (
+        TAG_WEIGHT * _jaccard(source.tags, candidate.tags) +
+        TECH_WEIGHT * _jaccard(source.tech, candidate.tech) +
+        _recency(candidate.created, now)
+    )
+    if candidate.featured:
+        value += FEATURED_BONUS
+    return value
+
+
+def _rank(candidate, value):
+    # Ties go to the newer candidate, then the higher pk, so lists are stable
+    return (value, candidate.created, candidate.pk)
+
+
+def top_neighbours(source, features, now):
+    """Return [(pk, score)] of the best candidates for ``source``"""
+    ranked = sorted(
+        (
+            _rank(candidate, score(source, candidate, now))
+            for candidate in features.values()
+            if candidate.pk != source.pk
+        ),
+        reverse=True,
+    )
+    return [(pk, value) for value, created, pk in ranked[:RELATED_LIMIT]]
+
+
+def _write(entry_model, lists):
+    """Replace the stored neighbours of every source in ``lists``"""
+    with transaction.atomic():
+        entry_model.objects.filter(source_id__in=list(lists)).delete()
+        entry_model.objects.bulk_create([
+            entry_model(source_id=source_pk, related_id=pk, score=value)
+            for source_pk, neighbours in lists.items()
+            for pk, value in neighbours
+        ])
+
+
+def rebuild(model):
+    """Recompute the related index of every object of ``model``"""
+    entry_model, get_features = INDEXES[model]
+    features = get_features()
+    now = timezone.now()
+    with transaction.atomic():
+        entry_model.objects.all().delete()
+        _write(entry_model, {
+            pk: top_neighbours(source, features, now)
+            for pk, source in features.items()
+        })
+    return len(features)
+
+
+def refresh(model, pk):
+    """
+    Update the related index after object ``pk`` of ``model`` changed or was deleted.
+
+    The instance's own neighbours are recomputed from scratch. Another
+    object's list only changes if it currently contains the instance (or an
+    object that is no longer eligible), if the instance now outranks its
+    weakest neighbour, or if it came up short because a deleted neighbour
+    cascaded away; only those lists are rewritten.
+    """
+    entry_model, get_features = INDEXES[model]
+    features = get_features()
+    now = timezone.now()
+    changed = features.get(pk)
+
+    current = defaultdict(list)
+    for source_pk, related_pk, value in entry_model.objects.values_list(
+        'source_id', 'related_id', 'score'
+    ):
+        current[source_pk].append((related_pk, value))
+
+    lists = {pk: top_neighbours(changed, features, now) if changed else []}
+    full = min(RELATED_LIMIT, len(features) - 1)
+    for source_pk, source in features.items():
+        if source_pk == pk:
+            continue
+        neighbours = current.get(source_pk, [])
+        stale = any(
+            related_pk == pk or related_pk not in features
+            for related_pk, value in neighbours
+        )
+        if not stale and len(neighbours) >= full:
+            if changed is None or _rank(changed, score(source, changed, now)) <= min(
+                _rank(features[related_pk], value) for related_pk, value in neighbours
+            ):
+                continue
+        new = top_neighbours(source, features, now)
+        if new != neighbours:
+            lists[source_pk] = new
+
+    _write(entry_model, lists)
+
+
+# Key of queued rescoring in portfolio.background
+BACKGROUND_KEY = 'related-content'
+
+
+def schedule(model, pk=None):
+    """Score object ``pk`` of ``model`` (all of them when None) once the transaction commits"""
+    delay = getattr(settings, 'PORTFOLIO_RELATED_REFRESH_DELAY', 5)
+    background.debounce_on_commit(BACKGROUND_KEY, delay, refresh_changes, (model, pk))
+
+
+def refresh_changes(changes):
+    """Score (model, pk) changes, pk None meaning every object; returns the models whose index was updated"""
+    # model -> set of changed pks, or None to rebuild it all
+    pending = {}
+    for model, pk in changes:
+        if pk is None or pending.get(model, set()) is None:
+            pending[model] = None
+        else:
+            pending.setdefault(model, set()).add(pk)
+    for model, pks in pending.items():
+        if pks is not None and len(pks) == 1:
+            refresh(model, next(iter(pks)))
+        else:
+            # Each refresh loads every object anyway; one pass covers them all
+            rebuild(model)
+        # The index tables skip the cache signals (see portfolio.signals)
+        bump_generation(INDEXES[model][0])
+    if pending:
+        bump_content_generation()
+    return list(pending)
+
+
+def refresh_pending():
+    """Score every queued change now; returns the models whose index was updated"""
+    return background.flush(BACKGROUND_KEY) or []
+
+
+def related_for(instance, limit=3):
+    """The stored neighbours of ``instance``, best first (one indexed query)"""
+    entry_model = INDEXES[type(instance)][0]
+    entries = entry_model.objects.filter(source=instance).select_related('related')
+    if entry_model is RelatedBlogPost:
+        # Posts unpublished since the index was last refreshed
+        entries = entries.filter(related__is_published=True)
+    return [entry.related for entry in entries.order_by('-score')[:limit]]
@@ -0,0 +1,111 @@
+"""
+Resume delivery.
+
+All five resume endpoints (``/resume/latest/``, ``/resume/download/``,
+``/resume-download/``, ``/download-resume/``, ``/cv/``) and the
+``{% resume_download_url %}`` tag read one cached record per upload instead
+of calling ``resume.url`` on every hit, which for Cloudinary storage signs a
+new URL each time.
+
+The record is keyed by the profile and the resume's file name, so a new
+upload gets a new record. Remote URLs are cached for
+``PORTFOLIO_RESUME_URL_TTL`` seconds less a refresh margin, so a signed URL
+is never handed out shortly before it expires.
+"""
+import logging
+import os
+
+from django.conf import settings
+from django.http import Http404
+from django.shortcuts import redirect
+from django.utils.cache import patch_cache_control
+
+from . import media_server
+from .cache import get_or_build
+from .models import PersonalInfo
+
+logger = logging.getLogger(__name__)
+
+# How long a resolved resume URL stays valid, and how long before that it is
+# re-signed
+URL_TTL = getattr(settings, 'PORTFOLIO_RESUME_URL_TTL', 3600)
+REFRESH_MARGIN = getattr(settings, 'PORTFOLIO_RESUME_URL_REFRESH_MARGIN', 300)
+
+
+def _with_param(url, param):
+    return url + ('&' if '?' in url else '?') + param
+
+
+def _build_record(personal_info):
+    resume = personal_info.resume
+    filename = os.path.basename(resume.name) or 'resume.pdf'
+    try:
+        url = resume.url
+    except Exception as e:
+        logger.warning(f"Could not resolve resume URL for {resume.name}: {e}")
+        url = ''
+    if url and not url.startswith(('http', '/')):
+        url = settings.MEDIA_URL.rstrip('/') + '/' + url.lstrip('/')
+
+    if 'cloudinary' in url.lower():
+        download_url = _with_param(url, 'fl_attachment')
+    else:
+        download_url = _with_param(url, 'download=1') if url else ''
+
+    return {
+        'name': resume.name,
+        'filename': filename,
+        # Local storage root, or None when the file only exists remotely
+        'root': getattr(resume.storage, 'location', None),
+        'url': url,
+        'download_url': download_url,
+    }
+
+
+def get_record(personal_info=None):
+    """Cached delivery record for a profile's resume (default: the active one), or None"""
+    if personal_info is None:
+        personal_info = PersonalInfo.get_active()
+    if not personal_info or not personal_info.resume or not personal_info.resume.name:
+        return None
+    return get_or_build(
+        'resume_delivery', [PersonalInfo],
+        lambda: _build_record(personal_info),
+        parts=(personal_info.pk, personal_info.resume.name),
+        timeout=max(URL_TTL - REFRESH_MARGIN, 1),
+    )
+
+
+def deliver(request, as_attachment=True, max_age=3600):
+    """
+    Respond to a resume endpoint.
+
+    A file in local storage is served directly (with conditional and range
+    support), publicly cacheable for ``max_age`` seconds; otherwise the
+    visitor is redirected to the cached remote URL.
+    """
+    record = get_record()
+    if record is None:
+        raise Http404("Resume not found")
+
+    if record['root']:
+        try:
+            media_file = media_server.resolve(record['root'], record['name'])
+        except Http404:
+            media_file = None
+        if media_file:
+            response = media_server.serve(
+                request,
+                media_file,
+                content_type=media_file.content_type or 'application/pdf',
+                as_attachment=as_attachment,
+                filename=record['filename'],
+            )
+            response['X-Content-Type-Options'] = 'nosniff'
+            patch_cache_control(response, public=True, max_age=max_age)
+            return response
+
+    url = record['download_url'] if as_attachment else record['url']
+    if not url:
+        raise Http404("Resume file not found")
+    return redirect(url)
@@ -0,0 +1,148 @@
+"""
+Periodic jobs.
+
+``ScheduledJob`` rows name a management command and a cron schedule (see
+``portfolio.cron``); the ``run_scheduler`` worker runs each one when it is
+due, off the request path. Any number of workers may run against the same
+database: a worker takes a job by setting its ``locked_until`` lease in the
+same transaction that selects it (``select_for_update(skip_locked=True)`` on
+PostgreSQL), so only one of them starts each run. A lease left by a worker
+that died expires after ``PORTFOLIO_SCHEDULER_LOCK_TIMEOUT`` seconds.
+
+Runs that are missed while no worker is up are not caught up; the job runs
+once and is scheduled from the current time. Each run is recorded as a
+``JobRun`` with its duration, outcome and output, shown in the dashboard.
+"""
+import logging
+import os
+import shlex
+import socket
+import time
+import traceback
+from datetime import timedelta
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .cache import is_shared_cache
+from .cron import CronSchedule
+from .models import JobRun, ScheduledJob
+
+logger = logging.getLogger(__name__)
+
+# How long a worker may hold a job before other workers consider it dead
+LOCK_TIMEOUT = getattr(settings, 'PORTFOLIO_SCHEDULER_LOCK_TIMEOUT', 60 * 60)
+
+# Runs kept per job
+HISTORY_SIZE = getattr(settings, 'PORTFOLIO_SCHEDULER_HISTORY', 50)
+
+# Characters of command output kept per run (the end is kept)
+OUTPUT_LIMIT = 20000
+
+WORKER_ID = f'{socket.gethostname()}:{os.getpid()}'
+
+
+def default_jobs():
+    """Jobs created by the worker on startup, as (name, command, arguments, schedule)"""
+    jobs = [
+        ('fix-cloudinary-urls', 'fix_cloudinary_urls', '', '30 3 * * *'),
+        ('media-check', 'test_media_serving', '', '45 3 * * *'),
+        # Catches up on changes whose background rescoring was lost with its process
+        ('related-content', 'rebuild_related_content', '', '15 * * * *'),
+        # Renditions of uploads whose background thread was lost (see portfolio/images.py)
+        ('image-renditions', 'generate_image_renditions', '', '25 * * * *'),
+    ]
+    warm_url = getattr(settings, 'PORTFOLIO_WARM_CACHE_URL', '')
+    if warm_url:
+        jobs.append(('warm-cache', 'warm_cache', f'--quiet --url {shlex.quote(warm_url)}', '*/30 * * * *'))
+    elif is_shared_cache():
+        jobs.append(('warm-cache', 'warm_cache', '--quiet', '*/30 * * * *'))
+    if not getattr(settings, 'PORTFOLIO_EMAIL_WORKER', False):
+        # Retries of contact email sent from the request (see portfolio/outbox.py)
+        jobs.append(('send-queued-email', 'send_queued_email', '--once', '*/5 * * * *'))
+    if not getattr(settings, 'PORTFOLIO_UPLOAD_WORKER', False):
+        # Uploads whose background thread was lost in a restart (see portfolio/uploads.py)
+        jobs.append(('process-uploads', 'process_uploads', '--once', '* * * * *'))
+    username = getattr(settings, 'PORTFOLIO_GITHUB_USERNAME', '')
+    if username:
+        jobs.append(('github-sync', 'sync_github_repos', f'--username {username}', '0 4 * * *'))
+    return jobs
+
+
+def ensure_default_jobs():
+    """Create missing default jobs; existing ones keep their edited schedules"""
+    for name, command, arguments, schedule in default_jobs():
+        ScheduledJob.objects.get_or_create(
+            name=name, defaults={'command': command, 'arguments': arguments, 'schedule': schedule},
+        )
+
+
+def claim(worker=WORKER_ID):
+    """Lock one due job for ``worker`` and start its run; returns (job, run) or None"""
+    now = timezone.now()
+    due = ScheduledJob.objects.filter(enabled=True, next_run_at__lte=now).filter(
+        Q(locked_until__isnull=True) | Q(locked_until__lte=now)
+    )
+    with transaction.atomic():
+        job = due.select_for_update(skip_locked=True).order_by('next_run_at').first()
+        if job is None:
+            return None
+        try:
+            next_run_at = CronSchedule(job.schedule).next_after(now)
+        except ValueError as e:
+            # Run once more and stop until the schedule is fixed
+            logger.error(f"Job {job} has an invalid schedule: {e}")
+            next_run_at = None
+        ScheduledJob.objects.filter(pk=job.pk).update(
+            locked_until=now + timedelta(seconds=LOCK_TIMEOUT), locked_by=worker,
+            next_run_at=next_run_at, last_run_at=now, last_status='running',
+        )
+        # Runs still marked running lost their worker before finishing
+        job.runs.filter(status='running').update(status='failed', finished_at=now)
+        run = JobRun.objects.create(job=job, worker=worker, started_at=now)
+    job.next_run_at = next_run_at
+    return job, run
+
+
+def execute(job, run, worker=WORKER_ID):
+    """Run a claimed job's command, record the outcome and release the lock"""
+    output = StringIO()
+    start = time.perf_counter()
+    try:
+        call_command(job.command, *shlex.split(job.arguments), stdout=output, stderr=output)
+    except Exception:
+        status = 'failed'
+        output.write(traceback.format_exc())
+        logger.exception(f"Scheduled job {job} failed")
+    else:
+        status = 'success'
+    duration = time.perf_counter() - start
+
+    JobRun.objects.filter(pk=run.pk).update(
+        status=status, finished_at=timezone.now(), duration=duration,
+        output=output.getvalue()[-OUTPUT_LIMIT:],
+    )
+    # Queryset updates skip model signals; only release a lock this worker still holds
+    ScheduledJob.objects.filter(pk=job.pk, locked_by=worker).update(
+        locked_until=None, locked_by='', last_status=status,
+    )
+    stale = job.runs.values_list('pk', flat=True)[HISTORY_SIZE:]
+    JobRun.objects.filter(pk__in=list(stale)).delete()
+    return status == 'success'
+
+
+def run_due(worker=WORKER_ID):
+    """Run every job that is due, one at a time; returns (succeeded, failed)"""
+    succeeded = failed = 0
+    while True:
+        claimed = claim(worker)
+        if claimed is None:
+            return succeeded, failed
+        if execute(*claimed, worker=worker):
+            succeeded += 1
+        else:
+            failed += 1
@@ -0,0 +1,133 @@
+"""
+Full-text search for projects and blog posts.
+
+On PostgreSQL each searchable model keeps a weighted ``search_vector``
+(title > tags/excerpt > body) backed by a GIN index. Results are ranked with
+``SearchRank``; when nothing matches, a trigram similarity search on the
+title catches typos. Other databases (SQLite in local development) fall back
+to ``icontains`` filters so the same views work everywhere.
+
+Vectors are kept current by ``portfolio.signals``; rows that predate the
+column are filled in by migration 0021, and ``manage.py
+update_search_vectors`` rebuilds them all.
+"""
+from django.conf import settings
+from django.contrib.postgres.search import (
+    SearchQuery, SearchRank, SearchVector, TrigramSimilarity
+)
+from django.db import connection
+from django.db.models import Exists, F, Q, TextField, Value
+
+from .models import Project, BlogPost
+
+SEARCH_CONFIG = getattr(settings, 'PORTFOLIO_SEARCH_CONFIG', 'english')
+TRIGRAM_THRESHOLD = getattr(settings, 'PORTFOLIO_SEARCH_TRIGRAM_THRESHOLD', 0.3)
+
+
+def is_postgres():
+    """Full-text search is only available on PostgreSQL"""
+    return connection.vendor == 'postgresql'
+
+
+_trigram_available = None
+
+
+def has_trigram():
+    """Whether the pg_trgm extension is installed (checked once per process)"""
+    global _trigram_available
+    if _trigram_available is None:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            _trigram_available = cursor.fetchone() is not None
+    return _trigram_available
+
+
+def project_document(project):
+    """Return (text, weight) pairs that make up a project's search vector"""
+    tags = ' '.join(tag.name for tag in project.tags.all())
+    return [
+        (project.title, 'A'),
+        (f'{tags} {project.tech_stack}', 'B'),
+        (project.description, 'C'),
+    ]
+
+
+def blog_post_document(post):
+    """Return (text, weight) pairs that make up a blog post's search vector"""
+    tags = ' '.join(tag.name for tag in post.tags.all())
+    return [
+        (post.title, 'A'),
+        (f'{post.excerpt} {tags}', 'B'),
+        (post.body, 'C'),
+    ]
+
+
+SEARCH_DOCUMENTS = {
+    Project: project_document,
+    BlogPost: blog_post_document,
+}
+
+
+def build_search_vector(instance):
+    """Build the weighted SearchVector expression for a model instance"""
+    vector = None
+    for text, weight in SEARCH_DOCUMENTS[type(instance)](instance):
+        part = SearchVector(
+            Value(text or '', output_field=TextField()),
+            weight=weight,
+            config=SEARCH_CONFIG,
+        )
+        vector = part if vector is None else vector + part
+    return vector
+
+
+def update_search_vector(instance):
+    """Refresh the stored search vector of a single instance"""
+    if not is_postgres() or type(instance) not in SEARCH_DOCUMENTS:
+        return
+    # update() skips save signals, so this never re-triggers itself
+    type(instance).objects.filter(pk=instance.pk).update(
+        search_vector=build_search_vector(instance)
+    )
+
+
+def _search(queryset, query, fallback):
+    if not is_postgres():
+        # Joined lookups (tags) can repeat rows, hence distinct()
+        return queryset.filter(fallback).distinct()
+
+    search_query = SearchQuery(query, search_type='websearch', config=SEARCH_CONFIG)
+    ordering = queryset.model._meta.ordering
+    matches = Q(search_vector=search_query)
+    ranked = queryset.annotate(rank=SearchRank(F('search_vector'), search_query))
+    if not has_trigram():
+        return ranked.filter(matches).order_by('-rank', *ordering)
+
+    # Typo-tolerant title matches only when nothing matched exactly, decided
+    # in the same query the paginator runs rather than by probing first
+    similar = Q(similarity__gt=TRIGRAM_THRESHOLD) & ~Exists(queryset.filter(matches).values('pk'))
+    return ranked.annotate(
+        similarity=TrigramSimilarity('title', query)
+    ).filter(matches | similar).order_by('-rank', '-similarity', *ordering)
+
+
+def search_projects(queryset, query):
+    """Filter a Project queryset by a free-text query, best matches first"""
+    fallback = (
+        Q(title__icontains=query) |
+        Q(description__icontains=query) |
+        Q(tech_stack__icontains=query) |
+        Q(tags__name__icontains=query)
+    )
+    return _search(queryset, query, fallback)
+
+
+def search_blog_posts(queryset, query):
+    """Filter a BlogPost queryset by a free-text query, best matches first"""
+    fallback = (
+        Q(title__icontains=query) |
+        Q(body__icontains=query) |
+        Q(excerpt__icontains=query) |
+        Q(tags__name__icontains=query)
+    )
+    return _search(queryset, query, fallback)
@@ -0,0 +1,201 @@
+"""
+Signal handlers that keep the versioned page cache in sync with the database.
+
+Any save, delete or many-to-many change on a portfolio model bumps that
+model's generation counter, so dashboard and admin edits are visible on the
+next request. Models rendered on public pages also bump the site-wide content
+generation, which purges the full-page cache.
+
+Projects and blog posts additionally refresh their full-text search vector
+(see ``portfolio.search``) and queue their precomputed related content for
+rescoring off the request path (see ``portfolio.related``) whenever their
+content or tags change. Newly uploaded images are queued for resized
+renditions, and replaced or deleted ones for removal of theirs (see
+``portfolio.images``). With ``PORTFOLIO_WARM_CACHE_ON_CHANGE`` the purged
+pages are rebuilt in the background shortly after (see ``portfolio.warmup``).
+"""
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete, m2m_changed
+
+from .cache import bump_generation, bump_content_generation
+from .images import RESPONSIVE_IMAGE_FIELDS, image_names
+from .images import schedule as schedule_renditions
+from .models import Project, BlogPost, Tag
+from .related import schedule as schedule_related
+from .search import update_search_vector
+
+# Models that never appear on public pages; a contact form submission should
+# not purge every cached page
+PAGE_CACHE_IGNORED_MODELS = {'portfolio.contactmessage'}
+
+# Derived tables rewritten in bulk alongside the content they index; wiring
+# them up would turn every bulk delete into a row-by-row one. The email outbox
+# is never cached
+CACHE_SIGNAL_EXCLUDED_MODELS = {
+    'portfolio.relatedproject', 'portfolio.relatedblogpost', 'portfolio.outgoingemail',
+    'portfolio.pendingupload', 'portfolio.githubresponse', 'portfolio.scheduledjob',
+    'portfolio.jobrun',
+}
+
+
+def _bump(model):
+    bump_generation(model)
+    if model._meta.label_lower not in PAGE_CACHE_IGNORED_MODELS:
+        bump_content_generation()
+        if getattr(settings, 'PORTFOLIO_WARM_CACHE_ON_CHANGE', False):
+            transaction.on_commit(_schedule_warmup)
+
+
+def _schedule_warmup():
+    # Imported here: warmup imports the views
+    from .warmup import schedule
+    schedule()
+
+
+def invalidate_model_cache(sender, **kwargs):
+    """Bump the generation of a model after a save or delete"""
+    _bump(sender)
+
+
+def invalidate_m2m_cache(sender, instance, action, model, **kwargs):
+    """Bump both sides of a many-to-many relation after it changes"""
+    if not action.startswith('post_'):
+        return
+    _bump(type(instance))
+    _bump(model)
+
+
+def connect_cache_signals():
+    """Connect the invalidation handlers to every model in the portfolio app"""
+    for model in apps.get_app_config('portfolio').get_models():
+        uid = model._meta.label_lower
+        if uid in CACHE_SIGNAL_EXCLUDED_MODELS:
+            continue
+        post_save.connect(invalidate_model_cache, sender=model,
+                          dispatch_uid=f'portfolio_cache_save:{uid}')
+        post_delete.connect(invalidate_model_cache, sender=model,
+                            dispatch_uid=f'portfolio_cache_delete:{uid}')
+        for field in model._meta.local_many_to_many:
+            through = field.remote_field.through
+            m2m_changed.connect(invalidate_m2m_cache, sender=through,
+                                dispatch_uid=f'portfolio_cache_m2m:{through._meta.label_lower}')
+
+
+def update_search_vector_on_save(sender, instance, raw=False, **kwargs):
+    """Refresh the search vector of a saved project or blog post"""
+    if raw:
+        return
+    update_search_vector(instance)
+
+
+def update_search_vector_on_tag_change(sender, instance, raw=False, **kwargs):
+    """Refresh every project and blog post that uses a renamed tag"""
+    if raw:
+        return
+    for project in instance.project_set.all():
+        update_search_vector(project)
+    for post in instance.blogpost_set.all():
+        update_search_vector(post)
+
+
+def update_search_vector_on_tags_changed(sender, instance, action, model, pk_set, **kwargs):
+    """Refresh search vectors after tags are added to or removed from content"""
+    if not action.startswith('post_'):
+        return
+    if isinstance(instance, (Project, BlogPost)):
+        update_search_vector(instance)
+    elif pk_set:
+        # Reverse side: tag.project_set.add(...) / tag.blogpost_set.add(...)
+        for obj in model.objects.filter(pk__in=pk_set):
+            update_search_vector(obj)
+
+
+def connect_search_signals():
+    """Keep full-text search vectors in sync with their content"""
+    for model in (Project, BlogPost):
+        post_save.connect(update_search_vector_on_save, sender=model,
+                          dispatch_uid=f'portfolio_search_save:{model._meta.label_lower}')
+    post_save.connect(update_search_vector_on_tag_change, sender=Tag,
+                      dispatch_uid='portfolio_search_tag_save')
+    for model in (Project, BlogPost):
+        m2m_changed.connect(update_search_vector_on_tags_changed, sender=model.tags.through,
+                            dispatch_uid=f'portfolio_search_tags:{model._meta.label_lower}')
+
+
+def refresh_related_on_change(sender, instance, raw=False, **kwargs):
+    """Queue related content for rescoring after a project or blog post is saved or deleted"""
+    if raw:
+        return
+    schedule_related(sender, instance.pk)
+
+
+def refresh_related_on_tags_changed(sender, instance, action, model, pk_set, **kwargs):
+    """Queue related content for rescoring after tags are added to or removed from content"""
+    if not action.startswith('post_'):
+        return
+    if isinstance(instance, (Project, BlogPost)):
+        schedule_related(type(instance), instance.pk)
+    elif action == 'post_clear':
+        # A tag cleared of its content does not say which content it was
+        schedule_related(model)
+    else:
+        for pk in pk_set or ():
+            schedule_related(model, pk)
+
+
+def rebuild_related_on_tag_delete(sender, instance, **kwargs):
+    """Deleting a tag drops it from content without m2m signals; rescore all"""
+    schedule_related(Project)
+    schedule_related(BlogPost)
+
+
+def connect_related_signals():
+    """Keep the precomputed related-content index in sync with its content"""
+    for model in (Project, BlogPost):
+        uid = model._meta.label_lower
+        post_save.connect(refresh_related_on_change, sender=model,
+                          dispatch_uid=f'portfolio_related_save:{uid}')
+        post_delete.connect(refresh_related_on_change, sender=model,
+                            dispatch_uid=f'portfolio_related_delete:{uid}')
+        m2m_changed.connect(refresh_related_on_tags_changed, sender=model.tags.through,
+                            dispatch_uid=f'portfolio_related_tags:{uid}')
+    post_delete.connect(rebuild_related_on_tag_delete, sender=Tag,
+                        dispatch_uid='portfolio_related_tag_delete')
+
+
+def remember_images_before_save(sender, instance, raw=False, **kwargs):
+    """Note the stored image names so a save that replaces one can clean up after it"""
+    if raw or instance.pk is None:
+        return
+    fields = RESPONSIVE_IMAGE_FIELDS[sender]
+    instance._saved_image_names = sender.objects.filter(pk=instance.pk).values(*fields).first() or {}
+
+
+def generate_renditions_on_save(sender, instance, raw=False, **kwargs):
+    """Queue renditions for images uploaded with a save, and removal of replaced ones"""
+    if raw:
+        return
+    current = image_names(instance)
+    saved = getattr(instance, '_saved_image_names', {})
+    stale = [(field_name, name) for field_name, name in saved.items()
+             if name and current.get(field_name) != name]
+    schedule_renditions(instance, stale)
+
+
+def delete_renditions_on_delete(sender, instance, **kwargs):
+    """Queue removal of a deleted object's renditions"""
+    schedule_renditions(instance, stale=image_names(instance).items(), generate=False)
+
+
+def connect_image_signals():
+    """Resize uploaded images after they are saved, off the request path"""
+    for model in RESPONSIVE_IMAGE_FIELDS:
+        uid = model._meta.label_lower
+        pre_save.connect(remember_images_before_save, sender=model,
+                         dispatch_uid=f'portfolio_images_presave:{uid}')
+        post_save.connect(generate_renditions_on_save, sender=model,
+                          dispatch_uid=f'portfolio_images_save:{uid}')
+        post_delete.connect(delete_renditions_on_delete, sender=model,
+                            dispatch_uid=f'portfolio_images_delete:{uid}')
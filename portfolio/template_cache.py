@@ -0,0 +1,147 @@
+"""
+Compiled template cache.
+
+Production settings load templates through Django's cached loader
+(``CACHED_TEMPLATE_LOADERS`` in settings), which parses each template once
+per process and keeps the compiled nodes. ``prewarm()`` compiles the site's
+templates up front, so the first visitor to each page after a worker starts
+does not pay for parsing; the WSGI and ASGI entry points call it when
+``PORTFOLIO_PREWARM_TEMPLATES`` is set (by default when DEBUG is off).
+
+``benchmark()`` renders pages with the compiled templates dropped (cold) and
+kept (warm), for ``manage.py benchmark_templates``.
+"""
+import logging
+import re
+import statistics
+import time
+from collections import namedtuple
+from pathlib import Path
+
+from django.conf import settings
+from django.template import TemplateSyntaxError, engines
+from django.template.loader import get_template
+from django.template.loaders.cached import Loader as CachedLoader
+from django.test.utils import override_settings
+from django.urls import resolve, reverse
+
+from .warmup import public_urls, site_client
+
+logger = logging.getLogger(__name__)
+
+PREWARM_ON_STARTUP = getattr(settings, 'PORTFOLIO_PREWARM_TEMPLATES', not settings.DEBUG)
+
+# Directories under the project templates directory compiled on startup,
+# besides the top-level templates (base.html, error pages)
+PREWARM_DIRS = ('portfolio', 'dashboard', 'includes')
+
+TemplateTiming = namedtuple(
+    'TemplateTiming', ['url', 'cold_ms', 'warm_ms', 'cold_template_ms', 'warm_template_ms']
+)
+
+_SERVER_TIMING_TEMPLATE = re.compile(r'tpl;dur=([\d.]+)')
+
+
+def _loaders():
+    return [
+        loader for engine in engines.all() if hasattr(engine, 'engine')
+        for loader in engine.engine.template_loaders
+    ]
+
+
+def is_cached():
+    """Whether templates are loaded through the cached loader"""
+    return any(isinstance(loader, CachedLoader) for loader in _loaders())
+
+
+def reset():
+    """Drop every compiled template, as in a freshly started worker"""
+    for loader in _loaders():
+        if isinstance(loader, CachedLoader):
+            loader.reset()
+
+
+def template_names(dirs=PREWARM_DIRS):
+    """Names of the templates under ``dirs`` of each project templates directory"""
+    names = set()
+    for engine in engines.all():
+        for root in map(Path, getattr(getattr(engine, 'engine', None), 'dirs', [])):
+            files = [path for path in root.glob('*') if path.is_file()]
+            for directory in dirs:
+                files += [path for path in (root / directory).rglob('*') if path.is_file()]
+            names.update(path.relative_to(root).as_posix() for path in files)
+    return sorted(names)
+
+
+def prewarm(dirs=PREWARM_DIRS):
+    """
+    Compile every template under ``dirs`` into the cached loader.
+
+    Returns the names that failed to compile; each failure is logged, so a
+    broken template only breaks its own pages.
+    """
+    start = time.perf_counter()
+    names = template_names(dirs)
+    failed = []
+    for name in names:
+        try:
+            get_template(name)
+        except TemplateSyntaxError:
+            logger.exception(f"Template {name} does not compile")
+            failed.append(name)
+    logger.info(
+        f"Compiled {len(names) - len(failed)} templates in "
+        f"{(time.perf_counter() - start) * 1000:.1f} ms"
+    )
+    return failed
+
+
+def benchmark_urls():
+    """One URL per public view, from the warm_cache list plus the contact page"""
+    urls = {}
+    for url in public_urls() + [reverse('portfolio:contact')]:
+        urls.setdefault(resolve(url.split('?')[0]).view_name, url)
+    return list(urls.values())
+
+
+def _request(client, url, secure):
+    start = time.perf_counter()
+    response = client.get(url, secure=secure)
+    total = (time.perf_counter() - start) * 1000
+    if response.status_code != 200:
+        raise ValueError(f'{url} returned {response.status_code}')
+    match = _SERVER_TIMING_TEMPLATE.search(response.get('Server-Timing', ''))
+    return total, float(match.group(1)) if match else None
+
+
+def _median(values):
+    values = [value for value in values if value is not None]
+    return statistics.median(values) if values else None
+
+
+def benchmark(urls=None, repeat=5):
+    """
+    Time each page with cold and warm compiled templates.
+
+    Data caches are filled by a first request and the page cache is off, so
+    the difference is the cost of loading and parsing templates. Returns a
+    TemplateTiming per URL with medians over ``repeat`` runs; the template
+    times come from the Server-Timing header, which is turned on for the run.
+    """
+    urls = benchmark_urls() if urls is None else list(urls)
+    client, secure = site_client()
+    results = []
+    with override_settings(PORTFOLIO_PAGE_CACHE=False, PORTFOLIO_SERVER_TIMING=True):
+        for url in urls:
+            _request(client, url, secure)
+            cold, warm = [], []
+            for _ in range(repeat):
+                reset()
+                cold.append(_request(client, url, secure))
+                warm.append(_request(client, url, secure))
+            results.append(TemplateTiming(
+                url,
+                _median(total for total, _ in cold), _median(total for total, _ in warm),
+                _median(template for _, template in cold), _median(template for _, template in warm),
+            ))
+    return results
@@ -1,6 +1,14 @@
 from django import template
+from django.apps import apps
 from django.urls import reverse
 from django.conf import settings
+from django.forms.utils import flatatt
+from django.utils.html import format_html, format_html_join
+
+from portfolio.cache import get_or_build
+from portfolio.images import MIME_TYPES, lookup, rendition_url
+from portfolio.models import Skill
+from portfolio.resume import get_record
 
 register = template.Library()
 
@@ -29,8 +37,19 @@ def get_whatsapp_link(phone_number):
 
 @register.simple_tag
 def get_skills_by_category(skills, category):
-    """Get skills filtered by category"""
-    return skills.filter(category=category).order_by('order', 'name')
+    """
+    Get skills filtered by category.
+    
+    Reads from the cached grouping built by Skill.get_grouped(); when a
+    subset of skills is passed, only those skills are kept.
+    Usage: {% get_skills_by_category skills 'backend' as backend_skills %}
+    """
+    category_name = dict(Skill.SKILL_CATEGORIES).get(category, category)
+    grouped = Skill.get_grouped().get(category_name, [])
+    if skills is None:
+        return grouped
+    allowed = {skill.pk for skill in skills}
+    return [skill for skill in grouped if skill.pk in allowed]
 
 @register.filter
 def split(value, delimiter=','):
@@ -148,73 +167,15 @@ def resume_download_url(personal_info):
     """
     Get the resume download URL with production fallback.
     
-    This function handles both cloud storage and local storage scenarios
-    and provides multiple fallback options for maximum compatibility.
+    The URL is resolved once per upload and cached (see portfolio/resume.py);
+    if it cannot be resolved, the resume download view is used instead.
     
     Usage: {% resume_download_url personal_info as resume_url %}
     """
-    if not personal_info or not personal_info.resume:
+    record = get_record(personal_info)
+    if record is None:
         return ''
-    
-    import logging
-    logger = logging.getLogger(__name__)
-    
-    # Check if file has a name first
-    if not hasattr(personal_info.resume, 'name') or not personal_info.resume.name:
-        logger.warning("Resume file has no name attribute")
-        return ''
-    
-    try:
-        # Always prioritize local storage (Railway persistent volume)
-        # Try direct file URL first
-        try:
-            url = personal_info.resume.url
-            if url:
-                # For local storage, ensure proper URL formatting
-                if not url.startswith('http') and not url.startswith('/'):
-                    # Add media URL prefix if needed
-                    media_url = getattr(settings, 'MEDIA_URL', '/media/')
-                    url = media_url.rstrip('/') + '/' + url.lstrip('/')
-                
-                logger.info(f"Using direct resume URL: {url}")
-                return url
-        except (ValueError, AttributeError, OSError) as e:
-            logger.warning(f"Direct resume URL failed: {e}")
-        
-        # Primary fallback: New production-ready resume view
-        try:
-            url = reverse('portfolio:latest_resume_download')
-            logger.info(f"Using latest_resume_download URL: {url}")
-            return url
-        except Exception as e:
-            logger.error(f"latest_resume_download URL failed: {e}")
-        
-        # Secondary fallback: Legacy serve_resume view
-        try:
-            url = reverse('portfolio:serve_resume')
-            logger.info(f"Using serve_resume fallback URL: {url}")
-            return url
-        except Exception as e:
-            logger.error(f"serve_resume URL failed: {e}")
-        
-        # Last resort fallbacks
-        try:
-            return reverse('portfolio:download_resume')
-        except Exception as e:
-            logger.error(f"download_resume URL failed: {e}")
-            try:
-                return reverse('portfolio:cv_download')
-            except Exception as e2:
-                logger.error(f"All resume URL options failed: {e}, {e2}")
-                return ''
-            
-    except Exception as e:
-        logger.error(f"Unexpected error in resume_download_url: {e}")
-        # Emergency fallback
-        try:
-            return reverse('portfolio:serve_resume')
-        except:
-            return ''
+    return record['url'] or reverse('portfolio:latest_resume_download')
 
 
 @register.filter
@@ -239,3 +200,140 @@ def file_exists(file_field):
         return False
     except (ValueError, AttributeError, OSError):
         return False
+
+
+@register.simple_tag
+def responsive_image(image_file, sizes='100vw', **attrs):
+    """
+    Render an image with srcset/sizes over its AVIF, WebP and JPEG renditions.
+    
+    Falls back to a plain <img> of the original until renditions exist.
+    Extra keyword arguments become attributes of the <img>.
+    Usage: {% responsive_image project.image sizes="(min-width: 992px) 33vw, 100vw" class="card-img-top" alt=project.title %}
+    """
+    if not image_file:
+        return ''
+    attrs.setdefault('loading', 'lazy')
+    attrs.setdefault('decoding', 'async')
+    
+    entry = lookup(image_file)
+    if not entry or not entry['renditions']:
+        return format_html('<img src="{}"{}>', media_url_fallback(image_file), flatatt(attrs))
+    
+    if 'width' not in attrs and 'height' not in attrs:
+        # Intrinsic size lets the browser reserve space before the image loads
+        attrs['width'] = entry['width']
+        attrs['height'] = entry['height']
+    
+    def srcset(candidates):
+        return ', '.join(f'{url} {width}w' for width, url in candidates)
+    
+    renditions = entry['renditions']
+    fallback = renditions.get('jpeg') or next(iter(renditions.values()))
+    sources = format_html_join(
+        '', '<source type="{}" srcset="{}" sizes="{}">',
+        (
+            (MIME_TYPES[image_format], srcset(candidates), sizes)
+            for image_format, candidates in renditions.items()
+            if candidates is not fallback
+        )
+    )
+    return format_html(
+        '<picture>{}<img src="{}" srcset="{}" sizes="{}"{}></picture>',
+        sources, fallback[-1][1], srcset(fallback), sizes, flatatt(attrs)
+    )
+
+
+@register.filter
+def image_rendition(image_file, width):
+    """
+    URL of the smallest rendition at least ``width`` pixels wide, or the original.
+    
+    Usage: <img src="{{ project.image|image_rendition:100 }}" width="50" height="50">
+    """
+    if not image_file:
+        return ''
+    return rendition_url(image_file, int(width)) or media_url_fallback(image_file)
+
+
+@register.simple_tag(takes_context=True)
+def page_query(context, **changes):
+    """
+    The current query string with its pagination parameters replaced.
+    
+    Filters such as ``tag`` and ``search`` are kept; empty values are left out.
+    Usage: <a href="{% page_query cursor=page_obj.next_cursor %}">
+    """
+    query = context['request'].GET.copy()
+    for key in ('page', 'cursor'):
+        query.pop(key, None)
+    for key, value in changes.items():
+        if value not in (None, ''):
+            query[key] = value
+    return f'?{query.urlencode()}'
+
+
+@register.filter
+def elided_pages(page_obj):
+    """
+    Page numbers around the current page plus the first and last, with gaps as None.
+    
+    Usage: {% for num in page_obj|elided_pages %}
+    """
+    return [
+        None if num == page_obj.paginator.ELLIPSIS else num
+        for num in page_obj.paginator.get_elided_page_range(page_obj.number, on_each_side=2, on_ends=1)
+    ]
+
+
+class CacheSectionNode(template.Node):
+    def __init__(self, nodelist, name, models, vary_on):
+        self.nodelist = nodelist
+        self.name = name
+        self.models = models
+        self.vary_on = vary_on
+
+    def render(self, context):
+        name = self.name.resolve(context)
+        parts = [var.resolve(context) for var in self.vary_on]
+        return get_or_build(
+            f'section:{name}', self.models, lambda: self.nodelist.render(context), parts=parts
+        )
+
+
+@register.tag
+def cache_section(parser, token):
+    """
+    Cache the rendered block until one of the listed models changes.
+    
+    The key embeds each model's generation counter (see portfolio.cache), so
+    the section is rendered once per content change. Values after ``on`` are
+    added to the key, for output that also depends on something else.
+    Usage: {% cache_section 'about:timeline' 'portfolio.CareerTimeline' on month %}...{% endcache_section %}
+    """
+    bits = token.split_contents()
+    if len(bits) < 3:
+        raise template.TemplateSyntaxError(
+            f"'{bits[0]}' takes a section name and at least one model label"
+        )
+    labels, vary_on = bits[2:], []
+    if 'on' in labels:
+        index = labels.index('on')
+        labels, vary_on = labels[:index], labels[index + 1:]
+    models = []
+    for label in labels:
+        if label[0] != label[-1] or label[0] not in '"\'':
+            raise template.TemplateSyntaxError(f"'{bits[0]}' model labels must be quoted: {label}")
+        try:
+            models.append(apps.get_model(label[1:-1]))
+        except (LookupError, ValueError):
+            raise template.TemplateSyntaxError(f"'{bits[0]}' got an unknown model: {label}")
+    if not models:
+        raise template.TemplateSyntaxError(f"'{bits[0]}' needs at least one model label")
+
+    nodelist = parser.parse(('endcache_section',))
+    parser.delete_first_token()
+    return CacheSectionNode(
+        nodelist, parser.compile_filter(bits[1]), models,
+        [parser.compile_filter(bit) for bit in vary_on],
+    )
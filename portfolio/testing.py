@@ -0,0 +1,84 @@
+"""
+Query-budget test harness shared by the portfolio and dashboard test suites.
+
+``QueryBudgetTestCase`` seeds a large dataset once (``seed_benchmark_data``),
+requests a route with an empty cache and fails when the route runs more
+queries than its committed budget or is pathologically slow to render.
+Set ``PORTFOLIO_BUDGET_REPORT=1`` to print a per-route table of query counts
+and render times after each suite, e.g. when updating budgets.
+"""
+import os
+import time
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import get_resolver
+
+# Render time ceiling per route. Query counts are the real budget; this only
+# catches pathological regressions without making the suite timing-sensitive
+RENDER_TIME_BUDGET_MS = 3000
+
+
+def route_names(namespace):
+    """Every named route in a URL namespace, e.g. {'portfolio:home', ...}"""
+    resolver = get_resolver().namespace_dict[namespace][1]
+    return {
+        f'{namespace}:{name}' for name in resolver.reverse_dict
+        if isinstance(name, str)
+    }
+
+
+@override_settings(PORTFOLIO_PAGE_CACHE=False)
+class QueryBudgetTestCase(TestCase):
+    """Base class for suites that hold routes to a fixed query budget"""
+
+    # {route name: maximum queries for one cold-cache request}
+    budgets = {}
+    seed_options = {}
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_benchmark_data', stdout=StringIO(), **cls.seed_options)
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.results = []
+
+    @classmethod
+    def tearDownClass(cls):
+        if os.environ.get('PORTFOLIO_BUDGET_REPORT'):
+            print(f'\n{cls.__name__}')
+            for name, url, queries, budget, elapsed in cls.results:
+                print(f'  {name:40} {queries:>4}/{budget:<4} queries {elapsed:8.1f} ms  {url}')
+        super().tearDownClass()
+
+    def assertWithinBudget(self, name, url, status=200):
+        """Request ``url`` with a cold cache and check it against its budget"""
+        budget = self.budgets[name]
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = self.client.get(url)
+            elapsed = (time.perf_counter() - start) * 1000
+        self.results.append((name, url, len(queries), budget, elapsed))
+
+        self.assertEqual(response.status_code, status, f'{name} ({url})')
+        executed = '\n'.join(query['sql'] for query in queries.captured_queries)
+        self.assertLessEqual(
+            len(queries), budget,
+            f'{name} ({url}) ran {len(queries)} queries, budget is {budget}:\n{executed}'
+        )
+        self.assertLess(
+            elapsed, RENDER_TIME_BUDGET_MS,
+            f'{name} ({url}) took {elapsed:.0f} ms to render'
+        )
+        return response
+
+    def assertBudgetsCover(self, namespace):
+        """Fail when a route is added without committing a budget for it"""
+        self.assertEqual(route_names(namespace), set(self.budgets))
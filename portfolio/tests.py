@@ -1,3 +1,1808 @@
-from django.test import TestCase
+import json
+import os
+import shutil
+import smtplib
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from importlib import import_module
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO, StringIO
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.http import Http404
+from django.template import Context, RequestContext, Template, TemplateSyntaxError
+from django.template.loaders.filesystem import Loader as FilesystemLoader
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+
+from portfolio_project.cache_backends import TieredCache
+
+from .checks import check_static_manifest, verify_static_manifest
+from .cron import CronSchedule
+from .cloudinary_migration import CloudinaryMigration
+from . import images, media_server, uploads
+from .github_sync import GitHubSync
+from .images import rendition_url
+from .models import (
+    Tag, Project, BlogPost, ResponsiveImage, ContactMessage, OutgoingEmail, PersonalInfo,
+    PendingUpload, GitHubResponse, ScheduledJob, JobRun, CareerTimeline, Skill, FooterLink,
+    LISTING_PREVIEW_CHARS,
+)
+from .outbox import claim_batch, send_due
+from .page_cache import page_cache_enabled
+from .search import has_trigram, search_blog_posts, search_projects
+from .pagination import CursorPaginator, InvalidCursor, approximate_count
+from .warmup import public_urls, warm
+from . import background, outbox, query_plans, related, scheduler, template_cache, warmup
+from .testing import QueryBudgetTestCase
+
+
+class ListingQuerysetTests(TestCase):
+    """Listing querysets load previews instead of full text, and tags in one query"""
+
+    @classmethod
+    def setUpTestData(cls):
+        tags = [Tag.objects.create(name=f'Tag {i}') for i in range(6)]
+        for i in range(12):
+            project = Project.objects.create(
+                title=f'Project {i}',
+                description='Lorem ipsum dolor sit amet. ' * 200,
+                tech_stack='Python, Django, PostgreSQL',
+                is_featured=i < 4,
+            )
+            project.tags.set(tags[i % 4:i % 4 + 3])
+            post = BlogPost.objects.create(
+                title=f'Post {i}',
+                slug=f'post-{i}',
+                excerpt='' if i % 2 else 'Short excerpt',
+                body='Lorem ipsum dolor sit amet. ' * 500,
+                is_published=True,
+                is_featured=i == 0,
+            )
+            post.tags.set(tags[i % 3:i % 3 + 2])
+
+    def setUp(self):
+        cache.clear()
+
+    def test_listing_previews_avoid_full_text(self):
+        project = Project.objects.for_listing().get(title='Project 0')
+        post = BlogPost.objects.for_listing().get(slug='post-1')
+        self.assertIn('description', project.get_deferred_fields())
+        self.assertIn('body', post.get_deferred_fields())
+        self.assertTrue(project.description_preview.startswith('Lorem ipsum'))
+        self.assertLessEqual(len(post.body_preview), 600)
+
+    def test_project_listing_queries(self):
+        # The projects, then every project's tags in one prefetch
+        with self.assertNumQueries(2):
+            projects = list(Project.objects.for_listing())
+            previews = {project.title: project.description_preview for project in projects}
+            tags = {project.title: [tag.name for tag in project.tags.all()] for project in projects}
+        self.assertEqual(len(projects), 12)
+        self.assertEqual(tags['Project 1'], ['Tag 1', 'Tag 2', 'Tag 3'])
+        description = Project.objects.get(title='Project 0').description
+        self.assertEqual(previews['Project 0'], description[:LISTING_PREVIEW_CHARS])
+        self.assertEqual(set(projects[0].get_deferred_fields()), {'description', 'search_vector'})
+        with self.assertNumQueries(1):
+            self.assertEqual(projects[0].description, description)
+
+    def test_blog_listing_queries(self):
+        with self.assertNumQueries(2):
+            posts = list(BlogPost.objects.for_listing().filter(is_published=True))
+            previews = {post.slug: post.body_preview for post in posts}
+            tags = {post.slug: [tag.name for tag in post.tags.all()] for post in posts}
+        self.assertEqual(len(posts), 12)
+        self.assertEqual(tags['post-2'], ['Tag 2', 'Tag 3'])
+        body = BlogPost.objects.get(slug='post-1').body
+        self.assertEqual(previews['post-1'], body[:LISTING_PREVIEW_CHARS])
+        self.assertEqual(set(posts[0].get_deferred_fields()), {'body', 'search_vector'})
+
+    @override_settings(PORTFOLIO_PAGE_CACHE=False)
+    def test_project_list_fetches_one_page(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('portfolio:projects_list'))
+        self.assertEqual(len(response.context['projects']), 6)
+        self.assertTrue(any(
+            'FROM "portfolio_project"' in query['sql'] and 'LIMIT 6' in query['sql']
+            for query in queries
+        ))
+
+    @override_settings(PORTFOLIO_PAGE_CACHE=False)
+    def test_blog_list_fetches_one_page(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('portfolio:blog_list'))
+        self.assertEqual(len(response.context['blog_posts']), 6)
+        self.assertTrue(any(
+            'FROM "portfolio_blogpost"' in query['sql'] and 'LIMIT 6' in query['sql']
+            for query in queries
+        ))
+
+    def test_tag_counts_in_one_query(self):
+        with self.assertNumQueries(1):
+            counts = {tag.name: (tag.project_count, tag.post_count) for tag in Tag.objects.with_counts()}
+        for tag in Tag.objects.all():
+            with self.subTest(tag.name):
+                # Both joins at once must not multiply each other's rows
+                self.assertEqual(counts[tag.name], (tag.project_set.count(), tag.blogpost_set.count()))
+        self.assertEqual(counts['Tag 2'], (9, 8))
+        self.assertEqual(counts['Tag 5'], (3, 0))
+
+
+class SkillGroupingTests(TestCase):
+    """Skills grouped by category are built from one query and cached"""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_grouped_skills_in_one_cached_query(self):
+        Skill.objects.create(name='Django', category='backend', order=1)
+        Skill.objects.create(name='React', category='frontend', order=1)
+        with self.assertNumQueries(1):
+            grouped = Skill.get_grouped()
+        self.assertEqual(list(grouped), ['Front-End Development', 'Back-End Development'])
+        with self.assertNumQueries(0):
+            Skill.get_grouped()
+
+        Skill.objects.create(name='Docker', category='devops', order=1)
+        with self.assertNumQueries(1):
+            self.assertIn('DevOps & Cloud', Skill.get_grouped())
+
+
+class PublicRouteBudgetTests(QueryBudgetTestCase):
+    """Every public route stays within its query budget on a large dataset"""
+
+    budgets = {
+        'portfolio:home': 7,
+        'portfolio:about': 9,
+        # Full-text search on PostgreSQL checks for pg_trgm once per process
+        'portfolio:projects_list': 9,
+        'portfolio:project_detail': 6,
+        'portfolio:blog_list': 7,
+        'portfolio:blog_detail': 5,
+        'portfolio:contact': 2,
+        'portfolio:healthz': 0,
+        'portfolio:health_simple': 0,
+        'portfolio:railway_status': 0,
+        'portfolio:latest_resume_view': 2,
+        'portfolio:latest_resume_download': 2,
+        'portfolio:serve_media': 2,
+        'portfolio:serve_profile_image': 2,
+        'portfolio:serve_resume': 2,
+        'portfolio:download_resume': 2,
+        'portfolio:cv_download': 2,
+    }
+
+    def test_budgets_cover_every_route(self):
+        self.assertBudgetsCover('portfolio')
+
+    def test_pages(self):
+        for name in ['home', 'about', 'projects_list', 'blog_list', 'contact']:
+            with self.subTest(name):
+                self.assertWithinBudget(f'portfolio:{name}', reverse(f'portfolio:{name}'))
+
+    def test_filtered_listings(self):
+        self.assertWithinBudget(
+            'portfolio:projects_list', reverse('portfolio:projects_list') + '?tag=Topic 3'
+        )
+        self.assertWithinBudget(
+            'portfolio:projects_list', reverse('portfolio:projects_list') + '?search=Project 1&page=2'
+        )
+        self.assertWithinBudget(
+            'portfolio:blog_list', reverse('portfolio:blog_list') + '?tag=Topic 3'
+        )
+        self.assertWithinBudget(
+            'portfolio:blog_list', reverse('portfolio:blog_list') + '?page=3'
+        )
+
+    def test_detail_pages(self):
+        project = Project.objects.get(slug='benchmark-project-5')
+        post = BlogPost.objects.filter(is_published=True).get(slug='benchmark-post-1')
+        self.assertWithinBudget('portfolio:project_detail', project.get_absolute_url())
+        self.assertWithinBudget('portfolio:blog_detail', post.get_absolute_url())
+
+    def test_health_checks(self):
+        for name in ['healthz', 'health_simple', 'railway_status']:
+            with self.subTest(name):
+                self.assertWithinBudget(f'portfolio:{name}', reverse(f'portfolio:{name}'))
+
+    def test_media_and_resume(self):
+        # The seeded profile has no image or resume uploaded; the 404 page
+        # itself renders the site header and footer
+        for name, status in MEDIA_ROUTE_STATUSES.items():
+            with self.subTest(name):
+                if name == 'portfolio:serve_media':
+                    url = reverse(name, kwargs={'path': 'images/missing.jpg'})
+                else:
+                    url = reverse(name)
+                self.assertWithinBudget(name, url, status=status)
+
+
+MEDIA_ROUTE_STATUSES = {
+    'portfolio:latest_resume_view': 404,
+    'portfolio:latest_resume_download': 404,
+    'portfolio:serve_media': 404,
+    'portfolio:serve_profile_image': 404,
+    'portfolio:serve_resume': 404,
+    'portfolio:download_resume': 404,
+    'portfolio:cv_download': 404,
+}
+
+
+class AdminChangelistBudgetTests(QueryBudgetTestCase):
+    """Admin changelists of the portfolio's listed models stay within their query budget"""
+
+    budgets = {
+        'admin:portfolio_tag_changelist': 6,
+        'admin:portfolio_project_changelist': 10,
+        'admin:portfolio_blogpost_changelist': 10,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.user = get_user_model().objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+
+    def test_changelists(self):
+        self.client.force_login(self.user)
+        for name in self.budgets:
+            with self.subTest(name):
+                self.assertWithinBudget(name, reverse(name))
+
+
+class ResponsiveImageTests(TestCase):
+    """Uploaded images get resized renditions that templates serve via srcset"""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+        self.start_timer = self.enterContext(mock.patch.object(background, '_start_timer'))
+        self.enterContext(mock.patch.object(background, '_tasks', {}))
+        cache.clear()
+
+    def upload(self, width, height, name='shot.png'):
+        buffer = BytesIO()
+        Image.new('RGBA', (width, height), (30, 120, 200, 128)).save(buffer, 'PNG')
+        return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+    def render(self, source):
+        return Template(
+            '{% load portfolio_extras %}{% responsive_image project.image sizes="50vw" alt=project.title %}'
+        ).render(Context({'project': Project.objects.get(pk=source.pk)}))
+
+    def create(self, width, height):
+        # What the background thread does once the save has committed
+        with self.captureOnCommitCallbacks(execute=True):
+            project = Project.objects.create(
+                title='Screenshot', description='...', tech_stack='Python', image=self.upload(width, height)
+            )
+        images.process_pending()
+        return project
+
+    def test_renditions_generated_on_upload(self):
+        project = self.create(700, 350)
+        image = ResponsiveImage.objects.get(source=project.image.name)
+        self.assertEqual((image.width, image.height), (700, 350))
+        # Never upscaled past the original width
+        self.assertEqual([width for width, name in image.renditions['jpeg']], [160, 320, 640, 700])
+        width, name = image.renditions['webp'][1]
+        self.assertTrue(name.endswith('.320w.webp'))
+        with project.image.storage.open(name) as handle:
+            self.assertEqual(Image.open(handle).size, (320, 160))
+
+    def test_template_tag_renders_srcset(self):
+        project = self.create(1000, 500)
+        html = self.render(project)
+        self.assertIn('<picture>', html)
+        self.assertIn('type="image/webp"', html)
+        self.assertIn('.640w.webp 640w', html)
+        self.assertIn('.1000w.jpg 1000w', html)
+        self.assertIn('sizes="50vw"', html)
+        self.assertIn('width="1000"', html)
+        self.assertIn('height="500"', html)
+        self.assertIn('loading="lazy"', html)
+        self.assertIn(rendition_url(project.image, 100), html)
+
+    @override_settings(PORTFOLIO_IMAGE_RENDITIONS_ON_SAVE=False)
+    def test_falls_back_to_original_until_generated(self):
+        project = Project.objects.create(
+            title='Screenshot', description='...', tech_stack='Python', image=self.upload(400, 300)
+        )
+        html = self.render(project)
+        self.assertNotIn('srcset', html)
+        self.assertIn(f'src="{project.image.url}"', html)
+        self.assertIsNone(rendition_url(project.image, 100))
+
+    def test_generated_after_commit_off_the_request(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            project = Project.objects.create(
+                title='Screenshot', description='...', tech_stack='Python', image=self.upload(400, 300)
+            )
+            project.save()
+            self.start_timer.assert_not_called()
+        self.start_timer.assert_any_call(1, images.BACKGROUND_KEY)
+        self.assertEqual(len(background._tasks[images.BACKGROUND_KEY].items), 2)
+        self.assertFalse(ResponsiveImage.objects.exists())
+
+        self.assertEqual(images.process_pending(), (1, 0))
+        self.assertTrue(ResponsiveImage.objects.filter(source=project.image.name).exists())
+
+    def test_replaced_image_renditions_are_deleted(self):
+        project = self.create(400, 300)
+        old = ResponsiveImage.objects.get(source=project.image.name)
+        old_files = [name for renditions in old.renditions.values() for width, name in renditions]
+
+        project.image = self.upload(500, 250, name='other.png')
+        with self.captureOnCommitCallbacks(execute=True):
+            project.save()
+        self.assertEqual(images.process_pending(), (1, 1))
+        self.assertEqual(list(ResponsiveImage.objects.values_list('source', flat=True)), [project.image.name])
+        self.assertFalse(any(project.image.storage.exists(name) for name in old_files))
+
+    def test_deleted_object_renditions_are_deleted(self):
+        project = self.create(400, 300)
+        with self.captureOnCommitCallbacks(execute=True):
+            project.delete()
+        self.assertEqual(images.process_pending(), (0, 1))
+        self.assertFalse(ResponsiveImage.objects.exists())
+
+    def test_urls_come_from_the_field_storage(self):
+        project = self.create(400, 300)
+        cdn = FileSystemStorage(location=settings.MEDIA_ROOT, base_url='https://cdn.example.com/media/')
+        image_file = Project.objects.get(pk=project.pk).image
+        image_file.storage = cdn
+        self.assertTrue(rendition_url(image_file, 100).startswith('https://cdn.example.com/media/images/'))
+        self.assertTrue(rendition_url(project.image, 100).startswith(settings.MEDIA_URL))
+
+    def test_renditions_are_cached_per_image(self):
+        first, second = self.create(400, 300), self.create(500, 250)
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(images.lookup(first.image)['width'], 400)
+        self.assertEqual(len(queries), 1)
+        self.assertIn(first.image.name, queries[0]['sql'])
+        self.assertNotIn(second.image.name, queries[0]['sql'])
+        with self.assertNumQueries(0):
+            images.lookup(first.image)
+        with self.assertNumQueries(1):
+            self.assertEqual(images.lookup(second.image)['width'], 500)
+
+    def test_scheduler_backfills_renditions(self):
+        with override_settings(PORTFOLIO_IMAGE_RENDITIONS_ON_SAVE=False):
+            project = self.create(400, 300)
+        self.assertFalse(ResponsiveImage.objects.exists())
+        job = {job[0]: job for job in scheduler.default_jobs()}['image-renditions']
+        call_command(job[1], stdout=StringIO())
+        self.assertTrue(ResponsiveImage.objects.filter(source=project.image.name).exists())
+
+
+@override_settings(
+    EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+    CONTACT_EMAIL='owner@example.com',
+    SEND_AUTO_REPLY=True,
+)
+class ContactOutboxTests(TestCase):
+    """Contact form email is queued by the request and sent off it, after it commits or by the worker"""
+
+    def setUp(self):
+        patcher = mock.patch.object(background, '_start_timer')
+        self.start_timer = patcher.start()
+        self.addCleanup(patcher.stop)
+        tasks = mock.patch.object(background, '_tasks', {})
+        tasks.start()
+        self.addCleanup(tasks.stop)
+
+    def submit(self):
+        response = self.client.post(reverse('portfolio:contact'), {
+            'name': 'Ada', 'email': 'ada@example.com',
+            'subject': 'Hello', 'message': 'Are you available?',
+        })
+        self.assertEqual(response.status_code, 302)
+        return ContactMessage.objects.get()
+
+    @override_settings(PORTFOLIO_EMAIL_WORKER=True)
+    def test_submission_only_queues(self):
+        message = self.submit()
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(
+            sorted(message.emails.values_list('kind', 'to')),
+            [('auto_reply', 'ada@example.com'), ('notification', 'owner@example.com')]
+        )
+        self.assertEqual((message.notification_status, message.auto_reply_status), ('queued', 'queued'))
+
+    def test_worker_sends_batch_over_one_connection(self):
+        message = self.submit()
+        with mock.patch('django.core.mail.backends.locmem.EmailBackend.open') as open_connection:
+            self.assertEqual(send_due(), (2, 0))
+        self.assertEqual(open_connection.call_count, 1)
+        self.assertEqual(
+            sorted(email.to[0] for email in mail.outbox), ['ada@example.com', 'owner@example.com']
+        )
+        message.refresh_from_db()
+        self.assertEqual((message.notification_status, message.auto_reply_status), ('sent', 'sent'))
+        self.assertEqual(send_due(), (0, 0))
+
+    @override_settings(PORTFOLIO_EMAIL_MAX_ATTEMPTS=3, PORTFOLIO_EMAIL_RETRY_DELAY=120)
+    def test_failures_retry_with_backoff_then_give_up(self):
+        message = self.submit()
+        error = smtplib.SMTPServerDisconnected('Connection unexpectedly closed')
+        with mock.patch('django.core.mail.backends.locmem.EmailBackend.send_messages', side_effect=error):
+            self.assertEqual(send_due(), (0, 2))
+            email = OutgoingEmail.objects.get(kind='notification')
+            self.assertEqual((email.status, email.attempts), ('queued', 1))
+            self.assertGreater(email.next_attempt_at, timezone.now() + timedelta(seconds=110))
+            # Not due again until the backoff has passed
+            self.assertEqual(send_due(), (0, 0))
+
+            for attempt in range(2):
+                OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+                send_due()
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), ('failed', 3))
+        self.assertIn('unexpectedly closed', email.last_error)
+        message.refresh_from_db()
+        self.assertEqual(message.notification_status, 'failed')
+
+    @override_settings(PORTFOLIO_EMAIL_WORKER=False)
+    def test_without_worker_sends_on_a_background_thread(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with mock.patch('django.core.mail.backends.locmem.EmailBackend.send_messages') as send:
+                message = self.submit()
+        send.assert_not_called()
+        self.start_timer.assert_called_once_with(0, outbox.BACKGROUND_KEY)
+        self.assertEqual(background.flush(outbox.BACKGROUND_KEY), (2, 0))
+        self.assertEqual(len(mail.outbox), 2)
+        message.refresh_from_db()
+        self.assertEqual(message.notification_status, 'sent')
+
+    @override_settings(PORTFOLIO_EMAIL_WORKER=False)
+    def test_without_worker_failures_are_retried_by_the_scheduler(self):
+        error = smtplib.SMTPServerDisconnected('Connection unexpectedly closed')
+        with self.captureOnCommitCallbacks(execute=True):
+            message = self.submit()
+        with mock.patch('django.core.mail.backends.locmem.EmailBackend.send_messages', side_effect=error):
+            background.flush(outbox.BACKGROUND_KEY)
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(OutgoingEmail.objects.filter(status='queued', attempts=1).count(), 2)
+
+        scheduler.ensure_default_jobs()
+        job = ScheduledJob.objects.get(name='send-queued-email')
+        self.assertEqual((job.command, job.arguments), ('send_queued_email', '--once'))
+        OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+        ScheduledJob.objects.exclude(pk=job.pk).update(enabled=False)
+        ScheduledJob.objects.filter(pk=job.pk).update(next_run_at=timezone.now())
+        self.assertEqual(scheduler.run_due('test:1'), (1, 0))
+        self.assertEqual(len(mail.outbox), 2)
+        message.refresh_from_db()
+        self.assertEqual(message.notification_status, 'sent')
+
+    @override_settings(PORTFOLIO_EMAIL_WORKER=False)
+    def test_request_does_not_resend_email_a_worker_claimed(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.submit()
+        self.assertEqual(len(claim_batch()), 2)
+        self.assertEqual(background.flush(outbox.BACKGROUND_KEY), (0, 0))
+        self.assertEqual(mail.outbox, [])
+
+
+class StaticManifestCheckTests(TestCase):
+    """Production refuses to start without a collected static manifest"""
+
+    def setUp(self):
+        self.static_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.static_root)
+
+    def production_static(self, manifest_paths=None):
+        """Static settings of a production deploy, after collectstatic wrote ``manifest_paths``"""
+        if manifest_paths is not None:
+            with open(os.path.join(self.static_root, 'staticfiles.json'), 'w') as manifest:
+                json.dump({'paths': manifest_paths, 'version': '1.1', 'hash': 'test'}, manifest)
+        return override_settings(
+            DEBUG=False,
+            STATIC_ROOT=self.static_root,
+            STATICFILES_STORAGE='whitenoise.storage.CompressedManifestStaticFilesStorage',
+        )
+
+    def test_missing_manifest_fails_fast(self):
+        with self.production_static():
+            self.assertEqual([error.id for error in check_static_manifest()], ['portfolio.E001'])
+            with self.assertRaises(ImproperlyConfigured):
+                verify_static_manifest()
+
+    def test_manifest_without_site_assets(self):
+        with self.production_static({'admin/css/base.css': 'admin/css/base.1a2b3c.css'}):
+            self.assertEqual([error.id for error in check_static_manifest()], ['portfolio.E002'])
+
+    def test_complete_manifest(self):
+        with self.production_static({
+            'css/styles.css': 'css/styles.1a2b3c.css',
+            'js/main.js': 'js/main.4d5e6f.js',
+        }):
+            verify_static_manifest()
+            self.assertFalse(any(error.is_serious() for error in check_static_manifest()))
+
+    @override_settings(DEBUG=True, STATICFILES_STORAGE='whitenoise.storage.StaticFilesStorage')
+    def test_development_needs_no_manifest(self):
+        self.assertEqual(check_static_manifest(), [])
+
+
+class MediaServerTests(TestCase):
+    """Local media is served with validators, byte ranges and proxy hand-off"""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        self.enterContext(override_settings(MEDIA_ROOT=self.media_root, PORTFOLIO_MEDIA_SENDFILE=''))
+        os.makedirs(os.path.join(self.media_root, 'files'))
+        self.path = os.path.join(self.media_root, 'files', 'notes.txt')
+        with open(self.path, 'wb') as handle:
+            handle.write(b'0123456789')
+        self.url = reverse('portfolio:serve_media', kwargs={'path': 'files/notes.txt'})
+
+    def test_full_response_has_validators(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'0123456789')
+        self.assertEqual(response['Content-Length'], '10')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertTrue(response['ETag'])
+        self.assertTrue(response['Last-Modified'])
+
+    def test_conditional_get(self):
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_changed_file_gets_new_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        with open(self.path, 'wb') as handle:
+            handle.write(b'changed')
+        os.utime(self.path, ns=(0, 10 ** 18))
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(b''.join(response.streaming_content), b'changed')
+
+    def test_byte_ranges(self):
+        for header, status, body, content_range in [
+            ('bytes=2-5', 206, b'2345', 'bytes 2-5/10'),
+            ('bytes=7-', 206, b'789', 'bytes 7-9/10'),
+            ('bytes=-3', 206, b'789', 'bytes 7-9/10'),
+            ('bytes=0-1,4-5', 200, b'0123456789', None),
+        ]:
+            with self.subTest(header):
+                response = self.client.get(self.url, HTTP_RANGE=header)
+                self.assertEqual(response.status_code, status)
+                self.assertEqual(b''.join(response.streaming_content), body)
+                self.assertEqual(response['Content-Length'], str(len(body)))
+                self.assertEqual(response.get('Content-Range'), content_range)
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=10-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], 'bytes */10')
+
+    def test_stale_if_range_sends_whole_file(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=2-5', HTTP_IF_RANGE='"stale"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'0123456789')
+
+    def test_head(self):
+        response = self.client.head(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Length'], '10')
+        self.assertEqual(response.content, b'')
+
+    def test_paths_outside_media_root(self):
+        outside = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, outside)
+        os.symlink(outside, os.path.join(self.media_root, 'escape'))
+        with open(os.path.join(outside, 'secret.txt'), 'w') as handle:
+            handle.write('secret')
+        for name in ['../secret.txt', 'escape/secret.txt', outside + '/secret.txt', 'files', 'files/missing.txt']:
+            with self.subTest(name):
+                with self.assertRaises(Http404):
+                    media_server.resolve(self.media_root, name)
+
+    def test_proxy_hand_off(self):
+        with override_settings(PORTFOLIO_MEDIA_SENDFILE='x-accel-redirect'):
+            response = self.client.get(self.url)
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/files/notes.txt')
+        self.assertEqual(response.content, b'')
+
+        with override_settings(PORTFOLIO_MEDIA_SENDFILE='x-sendfile'):
+            response = self.client.get(self.url)
+        self.assertEqual(response['X-Sendfile'], os.path.realpath(self.path))
+
+    def test_resume_download_supports_ranges(self):
+        with open(os.path.join(self.media_root, 'files', 'cv.pdf'), 'wb') as handle:
+            handle.write(b'%PDF-1.4 resume')
+        PersonalInfo.objects.create(full_name='Ada', email='ada@example.com', resume='files/cv.pdf')
+        storage = PersonalInfo._meta.get_field('resume').storage
+        self.enterContext(mock.patch.object(storage, 'location', self.media_root))
+
+        response = self.client.get(reverse('portfolio:latest_resume_download'), HTTP_RANGE='bytes=0-3')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b''.join(response.streaming_content), b'%PDF')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="cv.pdf"')
+        self.assertIn('public', response['Cache-Control'])
+
+
+class ResumeDeliveryTests(TestCase):
+    """Resume endpoints and the template tag share one cached record per upload"""
+
+    REMOTE_URL = 'https://res.cloudinary.com/demo/raw/authenticated/s--sig--/v1/resumes/cv.pdf'
+
+    def setUp(self):
+        cache.clear()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        self.storage = PersonalInfo._meta.get_field('resume').storage
+        self.enterContext(mock.patch.object(self.storage, 'location', self.media_root))
+        self.url = self.enterContext(
+            mock.patch.object(type(self.storage), 'url', return_value=self.REMOTE_URL)
+        )
+        self.profile = PersonalInfo.objects.create(
+            full_name='Ada', email='ada@example.com', resume='resumes/cv.pdf'
+        )
+
+    def render_tag(self):
+        return Template(
+            '{% load portfolio_extras %}{% resume_download_url info as url %}{{ url }}'
+        ).render(Context({'info': PersonalInfo.objects.get(pk=self.profile.pk)}))
+
+    def test_url_resolved_once_per_upload(self):
+        for name in ['latest_resume_view', 'serve_resume', 'download_resume', 'cv_download']:
+            self.client.get(reverse(f'portfolio:{name}'))
+        self.assertEqual(self.render_tag(), self.REMOTE_URL)
+        self.assertEqual(self.url.call_count, 1)
+
+        self.profile.resume = 'resumes/cv-2024.pdf'
+        self.profile.save()
+        self.render_tag()
+        self.assertEqual(self.url.call_count, 2)
+
+    def test_remote_resume_redirects(self):
+        response = self.client.get(reverse('portfolio:latest_resume_view'))
+        self.assertRedirects(response, self.REMOTE_URL, fetch_redirect_response=False)
+        for name in ['latest_resume_download', 'cv_download']:
+            with self.subTest(name):
+                response = self.client.get(reverse(f'portfolio:{name}'))
+                self.assertRedirects(
+                    response, self.REMOTE_URL + '?fl_attachment', fetch_redirect_response=False
+                )
+
+    def test_local_resume_served_from_disk(self):
+        os.makedirs(os.path.join(self.media_root, 'resumes'))
+        with open(os.path.join(self.media_root, 'resumes', 'cv.pdf'), 'wb') as handle:
+            handle.write(b'%PDF-1.4 resume')
+        response = self.client.get(reverse('portfolio:cv_download'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="cv.pdf"')
+        self.assertEqual(response['X-Frame-Options'], 'DENY')
+        self.assertEqual(b''.join(response.streaming_content), b'%PDF-1.4 resume')
+
+
+@override_settings(PORTFOLIO_UPLOAD_WORKER=True)
+class BackgroundUploadTests(TestCase):
+    """Dashboard uploads are staged, then moved into storage in chunks outside the request"""
+
+    def setUp(self):
+        self.staging_root = tempfile.mkdtemp()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.staging_root)
+        self.addCleanup(shutil.rmtree, self.media_root)
+        self.enterContext(override_settings(PORTFOLIO_UPLOAD_STAGING_ROOT=self.staging_root))
+        storage = PersonalInfo._meta.get_field('resume').storage
+        self.enterContext(mock.patch.object(storage, 'location', self.media_root))
+        self.profile = PersonalInfo.objects.create(full_name='Ada', email='ada@example.com')
+        self.data = os.urandom(3 * uploads.PROGRESS_INTERVAL + 10)
+
+    def test_upload_moved_into_storage(self):
+        upload = uploads.queue_upload(self.profile, 'resume', SimpleUploadedFile('cv.pdf', self.data))
+        self.assertEqual(upload.status, 'queued')
+        self.assertTrue(os.path.exists(os.path.join(self.staging_root, upload.staged_name)))
+
+        with mock.patch.object(uploads, '_record', wraps=uploads._record) as record:
+            self.assertEqual(uploads.process_due(), (1, 0))
+        progress = [call.kwargs['bytes_uploaded'] for call in record.call_args_list]
+        self.assertEqual(progress[-1], len(self.data))
+        self.assertGreaterEqual(len(progress), 4)
+
+        upload.refresh_from_db()
+        self.assertEqual((upload.status, upload.progress), ('done', 100))
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.resume.name, 'resumes/cv.pdf')
+        with self.profile.resume.open('rb') as handle:
+            self.assertEqual(handle.read(), self.data)
+        self.assertEqual(os.listdir(self.staging_root), [])
+
+    def test_failed_upload_retries_with_backoff(self):
+        upload = uploads.queue_upload(self.profile, 'resume', SimpleUploadedFile('cv.pdf', self.data))
+        with mock.patch('django.db.models.fields.files.FieldFile.save', side_effect=OSError('disk full')):
+            self.assertEqual(uploads.process_due(), (0, 1))
+        upload.refresh_from_db()
+        self.assertEqual((upload.status, upload.attempts, upload.last_error), ('queued', 1, 'disk full'))
+        self.assertGreater(upload.next_attempt_at, timezone.now())
+        # Not due again until the backoff has passed
+        self.assertEqual(uploads.process_due(), (0, 0))
+
+        PendingUpload.objects.update(next_attempt_at=timezone.now())
+        self.assertEqual(uploads.process_due(), (1, 0))
+
+    def test_background_thread_without_worker(self):
+        with override_settings(PORTFOLIO_UPLOAD_WORKER=False), \
+                mock.patch.object(uploads, 'start_thread') as start_thread, \
+                self.captureOnCommitCallbacks(execute=True):
+            upload = uploads.queue_upload(self.profile, 'resume', SimpleUploadedFile('cv.pdf', b'%PDF'))
+        start_thread.assert_called_once_with(upload.pk)
+
+    def test_thread_retries_after_the_backoff(self):
+        upload = uploads.queue_upload(self.profile, 'resume', SimpleUploadedFile('cv.pdf', b'%PDF'))
+        with mock.patch.object(background, '_tasks', {}), \
+                mock.patch.object(background, '_start_timer') as start_timer:
+            uploads.start_thread(upload.pk)
+            with mock.patch('django.db.models.fields.files.FieldFile.save', side_effect=OSError('disk full')):
+                background.flush(f'upload:{upload.pk}')
+            # The failed attempt queued its own retry
+            self.assertEqual(start_timer.call_count, 2)
+            self.assertGreater(start_timer.call_args.args[0], 0)
+            PendingUpload.objects.update(next_attempt_at=timezone.now())
+            background.flush(f'upload:{upload.pk}')
+        upload.refresh_from_db()
+        self.assertEqual((upload.status, upload.attempts), ('done', 2))
+
+    @override_settings(PORTFOLIO_UPLOAD_MAX_ATTEMPTS=1)
+    def test_admin_retry_restarts_thread_without_worker(self):
+        upload = uploads.queue_upload(self.profile, 'resume', SimpleUploadedFile('cv.pdf', b'%PDF'))
+        with mock.patch('django.db.models.fields.files.FieldFile.save', side_effect=OSError('disk full')):
+            self.assertEqual(uploads.process_due(), (0, 1))
+        upload.refresh_from_db()
+        self.assertEqual(upload.status, 'failed')
+
+        with override_settings(PORTFOLIO_UPLOAD_WORKER=False), \
+                mock.patch.object(uploads, 'start_thread') as start_thread, \
+                self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(uploads.retry(PendingUpload.objects.all()), 1)
+        start_thread.assert_called_once_with(upload.pk)
+        upload.refresh_from_db()
+        self.assertEqual((upload.status, upload.attempts), ('queued', 0))
+
+    def test_scheduler_picks_up_uploads_lost_in_a_restart(self):
+        with override_settings(PORTFOLIO_UPLOAD_WORKER=False), \
+                mock.patch.object(uploads, 'start_thread'), \
+                self.captureOnCommitCallbacks(execute=True):
+            upload = uploads.queue_upload(self.profile, 'resume', SimpleUploadedFile('cv.pdf', b'%PDF'))
+            scheduler.ensure_default_jobs()
+        # The process died mid-upload: the claim expires and the job takes it over
+        uploads.claim(pk=upload.pk)
+        PendingUpload.objects.update(next_attempt_at=timezone.now())
+        ScheduledJob.objects.exclude(name='process-uploads').update(enabled=False)
+        ScheduledJob.objects.update(next_run_at=timezone.now())
+        self.assertEqual(scheduler.run_due('test:1'), (1, 0))
+        upload.refresh_from_db()
+        self.assertEqual(upload.status, 'done')
+
+    @override_settings(PORTFOLIO_UPLOAD_CHUNK_SIZE=1024)
+    def test_large_pdf_uploaded_to_cloudinary_in_chunks(self):
+        from portfolio_project.storages import PublicPDFStorage
+
+        storage = PublicPDFStorage()
+        with mock.patch('cloudinary.uploader.upload_large') as upload_large, \
+                mock.patch('cloudinary.uploader.upload') as upload:
+            storage._save('files/large.pdf', ContentFile(b'x' * 4096, name='large.pdf'))
+            storage._save('files/small.pdf', ContentFile(b'x' * 100, name='small.pdf'))
+        self.assertEqual(upload_large.call_args.kwargs['chunk_size'], 1024)
+        self.assertEqual(upload_large.call_args.kwargs['public_id'], 'files/large.pdf')
+        # Small files are passed as a file object, not read into bytes first
+        self.assertIsInstance(upload.call_args.args[0], ContentFile)
+
+
+@override_settings(PORTFOLIO_IMAGE_RENDITIONS_ON_SAVE=False)
+class CloudinaryMigrationTests(TestCase):
+    """Image migration uploads each distinct file once and resumes from its checkpoint"""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+        self.manifest = os.path.join(media_root, 'manifest.json')
+        self.uploads = []
+
+    def upload(self, path, folder):
+        self.uploads.append(folder)
+        return {'secure_url': f'https://res.cloudinary.com/demo/{folder}/{os.path.basename(path)}'}
+
+    def project(self, slug, content):
+        return Project.objects.create(
+            title=slug, slug=slug, description='...', tech_stack='Python',
+            image=SimpleUploadedFile(f'{slug}.png', content),
+        )
+
+    def migrate(self, upload=None):
+        return CloudinaryMigration(
+            self.manifest, concurrency=4, checkpoint_every=2, upload=upload or self.upload
+        ).run()
+
+    def test_duplicates_uploaded_once(self):
+        first = self.project('first', b'same image')
+        second = self.project('second', b'same image')
+        self.project('third', b'other image')
+
+        stats = self.migrate()
+        self.assertEqual((stats.migrated, stats.uploaded, stats.deduplicated), (3, 2, 1))
+        self.assertEqual(len(self.uploads), 2)
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertTrue(first.image.name.startswith('https://res.cloudinary.com/'))
+        self.assertEqual(first.image.name, second.image.name)
+
+        with open(self.manifest) as handle:
+            self.assertEqual(len(json.load(handle)['done']), 3)
+
+    def test_rerun_only_processes_failures(self):
+        self.project('first', b'first image')
+        broken = self.project('second', b'second image')
+
+        def flaky(path, folder):
+            if folder == 'projects/second':
+                raise ConnectionError('timed out')
+            return self.upload(path, folder)
+
+        stats = self.migrate(flaky)
+        self.assertEqual((stats.migrated, stats.failed), (1, 1))
+
+        self.uploads.clear()
+        stats = self.migrate()
+        self.assertEqual((stats.migrated, stats.skipped, stats.failed), (1, 1, 0))
+        self.assertEqual(self.uploads, ['projects/second'])
+        broken.refresh_from_db()
+        self.assertIn('cloudinary', broken.image.name)
+
+    def test_replaced_field_is_migrated_again(self):
+        project = self.project('first', b'first image')
+        self.migrate()
+        project.refresh_from_db()
+        with open(self.manifest) as handle:
+            self.assertEqual(json.load(handle)['done'][f'portfolio.project:{project.pk}:image']['name'],
+                             project.image.name)
+
+        project.image = SimpleUploadedFile('replacement.png', b'new image')
+        project.save()
+        self.uploads.clear()
+        stats = self.migrate()
+        self.assertEqual((stats.migrated, stats.skipped), (1, 0))
+        self.assertEqual(self.uploads, ['projects/first'])
+        project.refresh_from_db()
+        self.assertTrue(project.image.name.endswith('/replacement.png'))
+
+
+class FakeGitHub(BaseHTTPRequestHandler):
+    """Minimal GitHub API: paginated repositories, topics and languages, with ETags"""
+
+    def do_GET(self):
+        api = self.server.api
+        path, _, query = self.path.partition('?')
+        page = int(dict(p.split('=') for p in query.split('&') if p).get('page', 1))
+        headers = {}
+        if path == '/users/octo/repos':
+            per_page = 2
+            body = api.repos[(page - 1) * per_page:page * per_page]
+            if page * per_page < len(api.repos):
+                url = f'http://{self.headers["Host"]}{path}?{query}&page={page + 1}'
+                headers['Link'] = f'<{url}>; rel="next"'
+        elif path.endswith('/topics'):
+            body = {'names': api.topics.get(path.split('/')[3], [])}
+        elif path.endswith('/languages'):
+            body = {'Python': 1000, 'HTML': 200}
+        else:
+            self.send_error(404)
+            return
+
+        content = json.dumps(body).encode()
+        etag = f'"{hash(content) & 0xffffffff:x}"'
+        with api.lock:
+            api.requests += 1
+            if self.headers.get('If-None-Match') == etag:
+                api.not_modified += 1
+                self.send_response(304)
+                self.end_headers()
+                return
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('ETag', etag)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+def fake_repo(name, stars=1, private=False):
+    return {
+        'name': name, 'full_name': f'octo/{name}', 'private': private,
+        'description': f'{name} description', 'language': 'Python',
+        'html_url': f'https://github.com/octo/{name}', 'homepage': '', 'has_pages': False,
+        'owner': {'login': 'octo'}, 'stargazers_count': stars, 'forks_count': 0,
+    }
+
+
+class GitHubSyncTests(TestCase):
+    """The GitHub sync pages through repositories and reuses unchanged responses"""
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), FakeGitHub)
+        self.server.api = self
+        self.repos = [fake_repo('alpha'), fake_repo('beta-app'), fake_repo('secret', private=True)]
+        self.topics = {'alpha': ['django', 'api'], 'beta-app': ['react']}
+        self.requests = self.not_modified = 0
+        self.lock = threading.Lock()
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+    def sync(self):
+        url = f'http://127.0.0.1:{self.server.server_port}'
+        return GitHubSync('octo', max_repos=10, concurrency=4, api_url=url, log=lambda line: None).run()
+
+    def test_creates_projects_from_every_page(self):
+        Tag.objects.create(name='django')
+        Project.objects.create(title='Alpha', slug='alpha', description='...', tech_stack='Go')
+
+        result = self.sync()
+        self.assertEqual((result.fetched, len(result.created)), (2, 2))
+        alpha = Project.objects.get(github_repo='octo/alpha')
+        self.assertEqual(alpha.slug, 'alpha-1')
+        self.assertEqual(alpha.tech_stack, 'Python, HTML, django, api')
+        self.assertEqual(
+            sorted(alpha.tags.values_list('name', flat=True)), ['GitHub', 'Python', 'api', 'django']
+        )
+        self.assertEqual(Tag.objects.filter(name__iexact='django').count(), 1)
+        self.assertFalse(Project.objects.filter(github_repo='octo/secret').exists())
+
+    def test_unchanged_data_is_not_modified(self):
+        self.sync()
+        self.requests = self.not_modified = 0
+
+        # Cached responses, then existing projects inside the transaction
+        with self.assertNumQueries(4):
+            result = self.sync()
+        # Two repository pages plus topics and languages of both public repositories
+        self.assertEqual((self.requests, self.not_modified), (6, 6))
+        self.assertEqual((result.created, result.updated, result.unchanged), ([], [], 2))
+
+    def test_changed_repository_is_updated(self):
+        self.sync()
+        self.repos[1] = fake_repo('beta-app', stars=42)
+
+        result = self.sync()
+        self.assertEqual([project.github_repo for project in result.updated], ['octo/beta-app'])
+        self.assertEqual(Project.objects.get(github_repo='octo/beta-app').github_stars, 42)
+        cached = GitHubResponse.objects.get(url__endswith='/users/octo/repos?type=owner&sort=updated&per_page=10')
+        self.assertEqual(cached.data[1]['stargazers_count'], 42)
+
+
+def local(*args):
+    return timezone.make_aware(datetime(*args))
+
+
+class CronScheduleTests(TestCase):
+    """Cron expressions find the next matching minute"""
+
+    def test_next_after(self):
+        cases = [
+            ('*/15 * * * *', local(2026, 3, 2, 10, 7), local(2026, 3, 2, 10, 15)),
+            ('0 3 * * *', local(2026, 3, 2, 3, 0), local(2026, 3, 3, 3, 0)),
+            ('@weekly', local(2026, 3, 2, 12, 0), local(2026, 3, 8, 0, 0)),
+            ('30 9 * * 1-5', local(2026, 3, 6, 10, 0), local(2026, 3, 9, 9, 30)),
+            # Either day field matches when both are restricted
+            ('0 0 13 * 5', local(2026, 3, 1, 0, 0), local(2026, 3, 6, 0, 0)),
+            ('0 0 1 1,7 *', local(2026, 3, 1, 0, 0), local(2026, 7, 1, 0, 0)),
+        ]
+        for expression, moment, expected in cases:
+            with self.subTest(expression):
+                self.assertEqual(CronSchedule(expression).next_after(moment), expected)
+
+    def test_invalid_expressions(self):
+        for expression in ['* * * *', '60 * * * *', '*/0 * * * *', '5-1 * * * *', 'a * * * *']:
+            with self.subTest(expression), self.assertRaises(ValueError):
+                CronSchedule(expression)
+
+    def test_job_validation(self):
+        job = ScheduledJob(name='bad', command='no_such_command', schedule='every day')
+        with self.assertRaises(ValidationError) as raised:
+            job.full_clean()
+        self.assertEqual(set(raised.exception.message_dict), {'command', 'schedule'})
+
+
+class SchedulerTests(TestCase):
+    """Due jobs run once under a lock and leave a run history"""
+
+    def job(self, command='check', arguments='', **fields):
+        return ScheduledJob.objects.create(
+            name=f'{command} {arguments}', command=command, arguments=arguments, schedule='@hourly',
+            next_run_at=timezone.now() - timedelta(minutes=1), **fields,
+        )
+
+    def test_runs_due_jobs(self):
+        job = self.job()
+        self.job('migrate', 'no_such_app')
+        ScheduledJob.objects.create(name='later', command='check', schedule='@hourly')
+
+        self.assertEqual(scheduler.run_due('test:1'), (1, 1))
+        job.refresh_from_db()
+        self.assertEqual((job.last_status, job.locked_by, job.locked_until), ('success', '', None))
+        self.assertGreater(job.next_run_at, timezone.now())
+        run = job.runs.get()
+        self.assertEqual((run.status, run.worker), ('success', 'test:1'))
+        self.assertGreaterEqual(run.duration, 0)
+        failed = JobRun.objects.get(status='failed')
+        self.assertIn('CommandError', failed.output)
+        self.assertEqual(scheduler.run_due('test:1'), (0, 0))
+
+    def test_locked_job_is_skipped_until_lease_expires(self):
+        job = self.job(locked_by='test:2', locked_until=timezone.now() + timedelta(minutes=5))
+        stale = job.runs.create(worker='test:2')
+        self.assertIsNone(scheduler.claim('test:1'))
+
+        ScheduledJob.objects.filter(pk=job.pk).update(locked_until=timezone.now() - timedelta(seconds=1))
+        claimed, run = scheduler.claim('test:1')
+        self.assertEqual(claimed, job)
+        self.assertIsNone(scheduler.claim('test:3'))
+        stale.refresh_from_db()
+        self.assertEqual(stale.status, 'failed')
+        self.assertEqual(run.status, 'running')
+
+    def test_default_jobs_keep_edits(self):
+        with override_settings(PORTFOLIO_GITHUB_USERNAME='octo'):
+            scheduler.ensure_default_jobs()
+        job = ScheduledJob.objects.get(name='github-sync')
+        self.assertEqual(job.arguments, '--username octo')
+        ScheduledJob.objects.filter(pk=job.pk).update(schedule='@hourly')
+        scheduler.ensure_default_jobs()
+        self.assertEqual(ScheduledJob.objects.get(name='github-sync').schedule, '@hourly')
+
+
+@override_settings(
+    PORTFOLIO_PAGE_CACHE=True, PORTFOLIO_SITE_URL='https://example.com',
+    ALLOWED_HOSTS=['example.com'],
+)
+class WarmCacheTests(TransactionTestCase):
+    """Cache warming requests every public page as visitors would"""
+
+    def setUp(self):
+        cache.clear()
+        # Content changes commit at once here; keep related rescoring off the timer thread
+        self.enterContext(mock.patch.object(background, '_start_timer'))
+        self.enterContext(mock.patch.object(background, '_tasks', {}))
+        django = Tag.objects.create(name='Django')
+        for i in range(7):
+            project = Project.objects.create(
+                title=f'Project {i}', slug=f'project-{i}', description='...', tech_stack='Python'
+            )
+            project.tags.add(django)
+        BlogPost.objects.create(title='Published', slug='published', body='...', is_published=True)
+        BlogPost.objects.create(title='Draft', slug='draft', body='...', is_published=False)
+
+    def test_public_urls(self):
+        urls = public_urls()
+        for url in ['/', '/about/', '/projects/', '/projects/?page=2', '/projects/?tag=Django',
+                    '/projects/?tag=Django&page=2', '/projects/project-6/', '/blog/',
+                    '/blog/published/']:
+            self.assertIn(url, urls)
+        self.assertNotIn('/blog/draft/', urls)
+        self.assertNotIn('/blog/?page=2', urls)
+
+    def test_warmed_pages_are_hits_for_visitors(self):
+        results = warm(concurrency=3)
+        self.assertTrue(all(result.status == 200 for result in results), results)
+        self.assertEqual({result.cache for result in results if result.url == '/projects/'}, {'MISS'})
+
+        response = self.client.get('/projects/?page=2', secure=True, HTTP_HOST='example.com')
+        self.assertEqual(response['X-Page-Cache'], 'HIT')
+
+    def test_command_reports_timings(self):
+        output = StringIO()
+        with mock.patch('portfolio.warmup.is_shared_cache', return_value=True):
+            call_command('warm_cache', stdout=output)
+        self.assertIn('/blog/published/', output.getvalue())
+        self.assertRegex(output.getvalue(), r'Warmed (\d+) of \1 pages')
+
+    def test_command_skips_a_per_process_cache(self):
+        output = StringIO()
+        with mock.patch('portfolio.management.commands.warm_cache.warm') as warm_pages:
+            call_command('warm_cache', stdout=output)
+        warm_pages.assert_not_called()
+        self.assertIn('Skipped', output.getvalue())
+
+        with mock.patch('portfolio.management.commands.warm_cache.warm', return_value=[]) as warm_pages:
+            call_command('warm_cache', '--url', 'http://web:8000', stdout=StringIO())
+        self.assertEqual(warm_pages.call_args.kwargs['base_url'], 'http://web:8000')
+
+    def test_scheduled_job_needs_a_shared_cache_or_url(self):
+        self.assertNotIn('warm-cache', [job[0] for job in scheduler.default_jobs()])
+        with mock.patch('portfolio.scheduler.is_shared_cache', return_value=True):
+            jobs = {job[0]: job for job in scheduler.default_jobs()}
+        self.assertEqual(jobs['warm-cache'][2], '--quiet')
+        with override_settings(PORTFOLIO_WARM_CACHE_URL='http://web:8000'):
+            jobs = {job[0]: job for job in scheduler.default_jobs()}
+        self.assertEqual(jobs['warm-cache'][2], '--quiet --url http://web:8000')
+
+    def test_content_change_schedules_warmup(self):
+        with override_settings(PORTFOLIO_WARM_CACHE_ON_CHANGE=True), \
+                mock.patch('portfolio.warmup.schedule') as schedule:
+            Project.objects.create(title='New', slug='new', description='...', tech_stack='Go')
+        schedule.assert_called()
+
+    def test_changes_warm_once_per_burst(self):
+        with mock.patch('portfolio.warmup.warm', return_value=[]) as warm_pages:
+            warmup.schedule()
+            warmup.schedule()
+            background.flush('warm-cache')
+        warm_pages.assert_called_once_with()
+
+
+def tiered_cache(**options):
+    # A shared LocMemCache stands in for Redis; each instance is one worker
+    return TieredCache('tiered-tests', {
+        'OPTIONS': {'L2_BACKEND': 'django.core.cache.backends.locmem.LocMemCache', **options},
+    })
+
+
+class TieredCacheTests(TestCase):
+    """The two-tier cache serves hot keys locally and stays coherent across workers"""
+
+    def setUp(self):
+        self.worker = tiered_cache(VOLATILE_TIMEOUT=0.05)
+        self.other = tiered_cache(VOLATILE_TIMEOUT=0.05)
+        self.worker.clear()
+
+    def test_hot_keys_skip_l2(self):
+        self.worker.set('portfolio:personal_info:1', {'name': 'Ada'})
+        self.assertEqual(self.other.get('portfolio:personal_info:1'), {'name': 'Ada'})
+        with mock.patch.object(self.other.l2, 'get', side_effect=AssertionError), \
+                mock.patch.object(self.other.l2, 'get_many', side_effect=AssertionError):
+            self.assertEqual(self.other.get('portfolio:personal_info:1'), {'name': 'Ada'})
+            self.assertEqual(self.other.get_many(['portfolio:personal_info:1']),
+                             {'portfolio:personal_info:1': {'name': 'Ada'}})
+
+    def test_generation_changes_reach_other_workers(self):
+        self.worker.set('portfolio:gen:portfolio.project', 1, None)
+        self.assertEqual(self.other.get('portfolio:gen:portfolio.project'), 1)
+
+        self.assertEqual(self.worker.incr('portfolio:gen:portfolio.project'), 2)
+        self.assertEqual(self.worker.get('portfolio:gen:portfolio.project'), 2)
+        time.sleep(0.1)
+        self.assertEqual(self.other.get('portfolio:gen:portfolio.project'), 2)
+
+    def test_other_keys_always_read_l2(self):
+        self.worker.set('session:abc', 'anonymous')
+        self.assertEqual(self.other.get('session:abc'), 'anonymous')
+        self.worker.set('session:abc', 'logged in')
+        self.assertEqual(self.other.get('session:abc'), 'logged in')
+        self.worker.delete('session:abc')
+        self.assertIsNone(self.other.get('session:abc'))
+
+    def test_l1_is_bounded_and_copies_values(self):
+        cache = tiered_cache(L1_MAX_ENTRIES=2)
+        for i in range(3):
+            cache.set(f'portfolio:page:{i}', [i])
+        with mock.patch.object(cache.l2, 'get', return_value='from L2'):
+            self.assertEqual(cache.get('portfolio:page:0'), 'from L2')
+            self.assertEqual(cache.get('portfolio:page:2'), [2])
+        cache.get('portfolio:page:2').append('mutated')
+        self.assertEqual(cache.get('portfolio:page:2'), [2])
+
+
+@override_settings(PORTFOLIO_PAGE_CACHE=False)
+class CacheSectionTests(TestCase):
+    """About page sections are rendered once per change of the models they show"""
+
+    def setUp(self):
+        cache.clear()
+        self.entry = CareerTimeline.objects.create(
+            job_title='Engineer', company='Acme', start_date=datetime(2020, 1, 1).date(),
+            description='...', technologies='Python, Django',
+        )
+
+    def render(self, source, **context):
+        return Template('{% load portfolio_extras %}' + source).render(Context(context))
+
+    def test_section_is_reused_until_its_model_changes(self):
+        source = "{% cache_section 'test' 'portfolio.CareerTimeline' %}{{ value }}{% endcache_section %}"
+        self.assertEqual(self.render(source, value='first'), 'first')
+        self.assertEqual(self.render(source, value='second'), 'first')
+
+        # Other models leave the section alone
+        Tag.objects.create(name='Django')
+        self.assertEqual(self.render(source, value='second'), 'first')
+
+        self.entry.save()
+        self.assertEqual(self.render(source, value='second'), 'second')
+
+    def test_vary_on(self):
+        source = "{% cache_section 'test' 'portfolio.Skill' on key %}{{ value }}{% endcache_section %}"
+        self.assertEqual(self.render(source, key=1, value='first'), 'first')
+        self.assertEqual(self.render(source, key=2, value='second'), 'second')
+        self.assertEqual(self.render(source, key=1, value='third'), 'first')
+
+    def test_invalid_arguments(self):
+        for source in [
+            "{% cache_section 'test' %}{% endcache_section %}",
+            "{% cache_section 'test' portfolio.Skill %}{% endcache_section %}",
+            "{% cache_section 'test' 'portfolio.Missing' %}{% endcache_section %}",
+            "{% cache_section 'test' on key %}{% endcache_section %}",
+        ]:
+            with self.subTest(source):
+                with self.assertRaises(TemplateSyntaxError):
+                    self.render(source)
+
+    def test_about_page_follows_edits(self):
+        response = self.client.get(reverse('portfolio:about'))
+        self.assertContains(response, 'Acme')
+        self.assertContains(response, '01/2020 - Present')
+
+        self.entry.company = 'Globex'
+        self.entry.save()
+        response = self.client.get(reverse('portfolio:about'))
+        self.assertContains(response, 'Globex')
+        self.assertNotContains(response, 'Acme')
+
+    def test_duration_is_computed_once(self):
+        with mock.patch('portfolio.models.timezone.now', wraps=timezone.now) as now:
+            self.assertEqual(self.entry.duration, self.entry.duration)
+        self.assertEqual(now.call_count, 1)
+
+
+def cached_templates(**options):
+    # The production TEMPLATES setting
+    return override_settings(TEMPLATES=[{
+        **settings.TEMPLATES[0], 'APP_DIRS': False,
+        'OPTIONS': {**settings.TEMPLATES[0]['OPTIONS'], 'loaders': settings.CACHED_TEMPLATE_LOADERS},
+        **options,
+    }])
+
+
+@override_settings(PORTFOLIO_PAGE_CACHE=False)
+class TemplateCacheTests(TestCase):
+    """Production workers compile every template once, on startup"""
+
+    def test_template_names(self):
+        names = template_cache.template_names()
+        for name in ['base.html', 'portfolio/about.html', 'dashboard/jobs.html',
+                     'dashboard/projects/list.html', 'includes/cv_download.html']:
+            self.assertIn(name, names)
+
+    @cached_templates()
+    def test_prewarmed_pages_parse_nothing(self):
+        self.assertTrue(template_cache.is_cached())
+        template_cache.reset()
+        self.assertEqual(template_cache.prewarm(), [])
+
+        with mock.patch.object(FilesystemLoader, 'get_contents', autospec=True) as get_contents:
+            for url in ['/', '/about/', '/projects/', '/contact/']:
+                self.assertEqual(self.client.get(url).status_code, 200)
+        # Form widgets come from the form renderer's own engine
+        origins = [call.args[1] for call in get_contents.call_args_list]
+        parsed = [origin.template_name for origin in origins
+                  if origin.name.startswith(str(settings.BASE_DIR))]
+        self.assertEqual(parsed, [])
+
+    def test_prewarm_logs_broken_templates(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        os.makedirs(os.path.join(directory, 'portfolio'))
+        with open(os.path.join(directory, 'portfolio', 'broken.html'), 'w') as f:
+            f.write('{% if %}')
+        with open(os.path.join(directory, 'portfolio', 'fine.html'), 'w') as f:
+            f.write('{{ value }}')
+
+        with cached_templates(DIRS=[directory]), self.assertLogs('portfolio.template_cache', 'ERROR'):
+            self.assertEqual(template_cache.prewarm(), ['portfolio/broken.html'])
+
+    @cached_templates()
+    def test_benchmark_command(self):
+        output = StringIO()
+        call_command('benchmark_templates', '/about/', '/contact/', '--repeat', '2', stdout=output)
+        self.assertIn('/contact/', output.getvalue())
+        self.assertIn('per page on average over 2 pages', output.getvalue())
+
+
+class CursorPaginationTests(TestCase):
+    """Cursor pages cover every row once, in order, in both directions"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tag = Tag.objects.create(name='Django')
+        for i in range(11):
+            post = BlogPost.objects.create(title=f'Post {i}', slug=f'post-{i}', body='...', is_published=True)
+            post.tags.add(cls.tag)
+            Project.objects.create(
+                title=f'Project {i}', slug=f'project-{i}', description='...', tech_stack='Python',
+                is_featured=i % 3 == 0,
+            )
+        # Ties on the timestamp are broken by id
+        moment = timezone.now()
+        BlogPost.objects.filter(slug__in=['post-3', 'post-4', 'post-5']).update(created=moment)
+        Project.objects.filter(slug__in=['project-3', 'project-6']).update(created_at=moment)
+
+    def walk(self, paginator):
+        pages, page = [], paginator.page()
+        while True:
+            pages.append([row.pk for row in page])
+            if not page.has_next():
+                break
+            page = paginator.page(page.next_cursor)
+        backwards = [[row.pk for row in page]]
+        while page.has_previous():
+            page = paginator.page(page.previous_cursor)
+            backwards.insert(0, [row.pk for row in page])
+        self.assertEqual(backwards, pages)
+        return pages
+
+    def test_pages_follow_the_ordering(self):
+        for model, ordering in [(BlogPost, ['-created', '-id']),
+                                (Project, ['-is_featured', '-created_at', '-id'])]:
+            with self.subTest(model.__name__):
+                expected = list(model.objects.order_by(*ordering).values_list('pk', flat=True))
+                pages = self.walk(CursorPaginator(model.objects.all(), 4, ordering))
+                self.assertEqual([len(page) for page in pages], [4, 4, 3])
+                self.assertEqual(sum(pages, []), expected)
+
+                # Cached listings are lists already in order
+                rows = list(model.objects.order_by(*ordering))
+                self.assertEqual(self.walk(CursorPaginator(rows, 4, ordering, model=model)), pages)
+
+    def test_each_page_is_one_query(self):
+        paginator = CursorPaginator(BlogPost.objects.all(), 4, ['-created', '-id'])
+        cursor = paginator.page().next_cursor
+        with self.assertNumQueries(1):
+            self.assertEqual(len(paginator.page(cursor)), 4)
+
+    def test_invalid_cursor(self):
+        paginator = CursorPaginator(BlogPost.objects.all(), 4, ['-created', '-id'])
+        for cursor in ['nonsense', 'WyJuZXh0Il0', paginator.page().next_cursor[:-3]]:
+            with self.subTest(cursor), self.assertRaises(InvalidCursor):
+                paginator.page(cursor)
+
+    @override_settings(PORTFOLIO_CURSOR_PAGINATION=True, PORTFOLIO_PAGE_CACHE=False)
+    def test_listing_links(self):
+        response = self.client.get(reverse('portfolio:blog_list'), {'tag': 'Django'})
+        page = response.context['page_obj']
+        self.assertFalse(page.has_previous())
+        self.assertContains(response, f'?tag=Django&amp;cursor={page.next_cursor}')
+
+        response = self.client.get(reverse('portfolio:blog_list'), {'tag': 'Django', 'cursor': page.next_cursor})
+        self.assertEqual(len(response.context['blog_posts']), 5)
+        self.assertTrue(response.context['page_obj'].has_previous())
+
+        response = self.client.get(reverse('portfolio:projects_list'), {'cursor': 'nonsense'})
+        self.assertEqual(response.status_code, 404)
+
+        # Search results are ordered by rank and keep numbered pages
+        response = self.client.get(reverse('portfolio:projects_list'), {'search': 'Project'})
+        self.assertEqual(response.context['page_obj'].number, 1)
+
+        self.assertNotIn('/blog/?page=2', public_urls())
+
+    @override_settings(PORTFOLIO_CURSOR_PAGINATION=False, PORTFOLIO_PAGE_CACHE=False)
+    def test_numbered_pages_keep_filters(self):
+        response = self.client.get(reverse('portfolio:blog_list'), {'tag': 'Django'})
+        self.assertContains(response, '?tag=Django&amp;page=2')
+
+    @override_settings(PORTFOLIO_CURSOR_PAGINATION=False, PORTFOLIO_PAGE_CACHE=False)
+    def test_tag_filter_ignores_case(self):
+        response = self.client.get(reverse('portfolio:blog_list'), {'tag': 'django'})
+        self.assertEqual(response.context['paginator'].count, 11)
+
+    def test_approximate_count(self):
+        self.assertEqual(approximate_count(BlogPost.objects.all()), (11, True))
+
+    @skipUnless(connection.vendor == 'postgresql', 'Row estimates come from the PostgreSQL planner')
+    def test_approximate_count_estimates_large_results(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {BlogPost._meta.db_table}')
+        with mock.patch('portfolio.pagination.EXACT_COUNT_LIMIT', 0):
+            count, exact = approximate_count(BlogPost.objects.all())
+            self.assertFalse(exact)
+            self.assertEqual(count, 11)
+            count, exact = approximate_count(BlogPost.objects.filter(title__startswith='Post 1'))
+            self.assertFalse(exact)
+            self.assertGreaterEqual(count, 1)
+
+
+class QueryPlanTests(TestCase):
+    """The listing queries are served by their indexes"""
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_benchmark_data', projects=12, posts=12, messages=30, stdout=StringIO())
+
+    def test_every_listing_query_uses_its_index(self):
+        for query in query_plans.listing_queries():
+            with self.subTest(query.label):
+                plan = query_plans.explain(query, prefer_indexes=True)
+                self.assertTrue(plan.uses_index, plan.plan)
+
+    @override_settings(PORTFOLIO_PAGE_CACHE=False)
+    def test_listing_queries_are_the_views_queries(self):
+        queries = {query.label: query for query in query_plans.listing_queries()}
+        for label, url in [('Project listing', '/projects/'), ('Blog listing', '/blog/')]:
+            with self.subTest(label):
+                with CaptureQueriesContext(connection) as explained:
+                    list(queries[label].queryset)
+                with CaptureQueriesContext(connection) as served:
+                    self.client.get(url)
+                self.assertIn(explained[0]['sql'], [query['sql'] for query in served])
+
+    def test_command_reports_misses(self):
+        out = StringIO()
+        call_command('explain_queries', '--prefer-indexes', stdout=out)
+        self.assertIn('All 13 queries use their index', out.getvalue())
+
+        query = query_plans.listing_queries()[0]
+        with mock.patch('portfolio.query_plans.listing_queries',
+                        return_value=[query._replace(index='portfolio_no_such_index')]):
+            with self.assertRaisesMessage(CommandError, '1 of 1 queries do not use their index'):
+                call_command('explain_queries', stdout=StringIO())
+
+    def test_benchmark_keeps_the_indexes(self):
+        queries = query_plans.listing_queries()[:2]
+        timings = query_plans.benchmark(queries, repeat=1)
+        self.assertEqual([timing.query for timing in timings], queries)
+        self.assertTrue(all(query_plans.explain(query, prefer_indexes=True).uses_index for query in queries))
+
+    def test_skills_stay_grouped_by_category(self):
+        grouped = Skill.get_grouped()
+        labels = dict(Skill.SKILL_CATEGORIES)
+        self.assertEqual(list(grouped), [name for key, name in Skill.SKILL_CATEGORIES if name in grouped])
+        for name, skills in grouped.items():
+            self.assertEqual({labels[skill.category] for skill in skills}, {name})
+            self.assertEqual(skills, sorted(skills, key=lambda skill: (skill.order, skill.name)))
+
+
+@override_settings(PORTFOLIO_PAGE_CACHE=False)
+class SearchTests(TestCase):
+    """Project and blog search ranks matches on PostgreSQL and filters elsewhere"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tag = Tag.objects.create(name='Kubernetes')
+        cls.title_match = Project.objects.create(
+            title='Django Portfolio', slug='django-portfolio', description='A personal site',
+            tech_stack='Python',
+        )
+        cls.body_match = Project.objects.create(
+            title='Weather App', slug='weather-app', description='Written with Django and React',
+            tech_stack='JavaScript',
+        )
+        cls.tagged = Project.objects.create(
+            title='Cluster Tools', slug='cluster-tools', description='Ops scripts', tech_stack='Go',
+        )
+        cls.tagged.tags.add(cls.tag)
+        Project.objects.create(title='Unrelated', slug='unrelated', description='Nothing here', tech_stack='C')
+        cls.post = BlogPost.objects.create(
+            title='Scaling Postgres', slug='scaling-postgres', body='Indexes and vacuum', is_published=True,
+        )
+        cls.post.tags.add(cls.tag)
+
+    def search(self, query):
+        return list(search_projects(Project.objects.all(), query))
+
+    @skipUnless(connection.vendor == 'postgresql', 'Full-text search needs PostgreSQL')
+    def test_ranked_search_prefers_title_matches(self):
+        self.assertEqual(self.search('django'), [self.title_match, self.body_match])
+        self.assertEqual(self.search('kubernetes'), [self.tagged])
+        self.assertEqual(list(search_blog_posts(BlogPost.objects.all(), 'vacuum')), [self.post])
+
+        # Matches are ranked in the query that fetches them, with no probe first
+        has_trigram()
+        with self.assertNumQueries(1):
+            self.search('django')
+
+        response = self.client.get(reverse('portfolio:projects_list'), {'search': 'django'})
+        self.assertEqual(list(response.context['projects']), [self.title_match, self.body_match])
+
+    @skipUnless(connection.vendor == 'postgresql', 'Full-text search needs PostgreSQL')
+    def test_trigram_fallback_catches_typos(self):
+        if not has_trigram():
+            self.skipTest('pg_trgm is not installed')
+        self.assertEqual(self.search('Portfolo'), [self.title_match])
+
+    def test_icontains_fallback(self):
+        with mock.patch('portfolio.search.is_postgres', return_value=False):
+            self.assertEqual(set(self.search('django')), {self.title_match, self.body_match})
+            # Tag matches join the tag table without repeating rows
+            self.assertEqual(self.search('kuber'), [self.tagged])
+            self.assertEqual(list(search_blog_posts(BlogPost.objects.all(), 'vacuum')), [self.post])
+            self.assertEqual(list(search_blog_posts(BlogPost.objects.all(), 'kuber')), [self.post])
+
+    @skipUnless(connection.vendor == 'postgresql', 'Full-text search needs PostgreSQL')
+    def test_migration_backfills_missing_vectors(self):
+        backfill = import_module('portfolio.migrations.0021_backfill_search_vectors').backfill_search_vectors
+        Project.objects.update(search_vector=None)
+        BlogPost.objects.update(search_vector=None)
+        self.assertEqual(self.search('django'), [])
+
+        with connection.schema_editor() as schema_editor:
+            backfill(django_apps, schema_editor)
+        self.assertEqual(self.search('django'), [self.title_match, self.body_match])
+        self.assertEqual(self.search('kubernetes'), [self.tagged])
+        self.assertFalse(BlogPost.objects.filter(search_vector__isnull=True).exists())
+
+
+@override_settings(PORTFOLIO_PAGE_CACHE=True)
+class PageCacheTests(TestCase):
+    """Anonymous pages are served from the cache until content changes"""
+
+    def setUp(self):
+        cache.clear()
+        self.project = Project.objects.create(
+            title='Cached Project', slug='cached-project', description='...', tech_stack='Python',
+        )
+        self.url = reverse('portfolio:projects_list')
+
+    def test_second_request_is_a_hit(self):
+        first = self.client.get(self.url)
+        self.assertEqual(first['X-Page-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+        self.assertEqual(second['X-Page-Cache'], 'HIT')
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_conditional_get_returns_not_modified(self):
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_saving_content_purges_pages(self):
+        self.client.get(self.url)
+        self.project.title = 'Renamed Project'
+        self.project.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Page-Cache'], 'MISS')
+        self.assertContains(response, 'Renamed Project')
+
+    def test_signed_in_users_bypass_the_cache(self):
+        self.client.force_login(get_user_model().objects.create_user('ada', password='x'))
+        self.assertFalse(self.client.get(self.url).has_header('X-Page-Cache'))
+
+    def test_off_by_default_with_a_per_process_cache(self):
+        redis = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache'}}
+        with override_settings(PORTFOLIO_PAGE_CACHE=None, DEBUG=False):
+            self.assertFalse(page_cache_enabled())
+            with override_settings(CACHES=redis):
+                self.assertTrue(page_cache_enabled())
+        with override_settings(PORTFOLIO_PAGE_CACHE=None, DEBUG=True, CACHES=redis):
+            self.assertFalse(page_cache_enabled())
+
+
+class RelatedContentTests(TestCase):
+    """Related content is scored off the request path, once per burst of changes"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.django, cls.react = Tag.objects.create(name='Django'), Tag.objects.create(name='React')
+        cls.api = Project.objects.create(title='API', slug='api', description='...', tech_stack='Python, Django')
+        cls.site = Project.objects.create(title='Site', slug='site', description='...', tech_stack='Python, Django')
+        cls.app = Project.objects.create(title='App', slug='app', description='...', tech_stack='JavaScript')
+        cls.api.tags.add(cls.django)
+        cls.site.tags.add(cls.django)
+        cls.app.tags.add(cls.react)
+        related.rebuild(Project)
+
+    def setUp(self):
+        self.start_timer = self.enterContext(mock.patch.object(background, '_start_timer'))
+        self.enterContext(mock.patch.object(background, '_tasks', {}))
+
+    def queued(self):
+        return background._tasks[related.BACKGROUND_KEY].items
+
+    def test_scores_shared_tags_and_tech_first(self):
+        self.assertEqual(related.related_for(self.api), [self.site, self.app])
+        with self.assertNumQueries(1):
+            related.related_for(self.site)
+
+    def test_edit_is_scored_once_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.app.tech_stack = 'Python, Django'
+            self.app.save()
+            self.app.tags.set([self.django])
+            # Nothing is scored inside the request
+            self.assertEqual(related.related_for(self.app), [self.site, self.api])
+        self.start_timer.assert_called_once()
+        self.assertEqual(set(self.queued()), {(Project, self.app.pk)})
+
+        with mock.patch.object(related, 'refresh', wraps=related.refresh) as refresh:
+            self.assertEqual(related.refresh_pending(), [Project])
+        refresh.assert_called_once_with(Project, self.app.pk)
+        self.assertEqual(related.refresh_pending(), [])
+        # Now as close to the API as the site is, and newer
+        self.assertEqual(related.related_for(self.api), [self.app, self.site])
+
+    def test_deleted_content_leaves_other_lists(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.site.delete()
+        related.refresh_pending()
+        self.assertEqual(related.related_for(self.api), [self.app])
+
+    def test_unpublished_posts_are_never_shown(self):
+        posts = [
+            BlogPost.objects.create(title=f'Post {i}', slug=f'post-{i}', body='...', is_published=True)
+            for i in range(3)
+        ]
+        for post in posts:
+            post.tags.add(self.django)
+        related.rebuild(BlogPost)
+        # Queryset updates skip the signals that would queue a refresh
+        BlogPost.objects.filter(pk=posts[1].pk).update(is_published=False)
+        with self.assertNumQueries(1):
+            self.assertEqual(related.related_for(posts[0]), [posts[2]])
+
+    def test_tag_delete_rebuilds_everything(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.django.delete()
+        self.assertEqual(set(self.queued()), {(Project, None), (BlogPost, None)})
+        with mock.patch.object(related, 'rebuild', wraps=related.rebuild) as rebuild:
+            related.refresh_pending()
+        self.assertEqual(sorted(call.args[0].__name__ for call in rebuild.call_args_list), ['BlogPost', 'Project'])
+
+    def test_scheduler_rebuilds_hourly(self):
+        scheduler.ensure_default_jobs()
+        job = ScheduledJob.objects.get(name='related-content')
+        self.assertEqual(job.command, 'rebuild_related_content')
+
+
+class BlogTagMigrationTests(TransactionTestCase):
+    """Migration 0013 moves comma-separated blog tags onto the shared Tag model"""
+
+    before = [('portfolio', '0012_search_vectors')]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        self.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_csv_tags_become_relations(self):
+        old_apps = self.migrate(self.before)
+        OldTag = old_apps.get_model('portfolio', 'Tag')
+        OldBlogPost = old_apps.get_model('portfolio', 'BlogPost')
+        OldTag.objects.create(name='Django')
+        OldBlogPost.objects.create(title='First', slug='first', body='...', tags='django, Python ,, ')
+        OldBlogPost.objects.create(title='Second', slug='second', body='...', tags='PYTHON,Docker')
+        OldBlogPost.objects.create(title='Untagged', slug='untagged', body='...', tags='')
+
+        self.migrate([('portfolio', '0013_blogpost_tag_relation')])
+        # Names differing only in case share one tag, existing ones included
+        self.assertEqual(sorted(Tag.objects.values_list('name', flat=True), key=str.lower),
+                         ['Django', 'Docker', Tag.objects.get(name__iexact='python').name])
+        tags = {post.slug: sorted(tag.name.lower() for tag in post.tags.all())
+                for post in BlogPost.objects.prefetch_related('tags')}
+        self.assertEqual(tags, {'first': ['django', 'python'], 'second': ['docker', 'python'],
+                                'untagged': []})
+        self.assertNotIn('legacy_tags', [field.name for field in BlogPost._meta.get_fields()])
+        with connection.cursor() as cursor:
+            columns = [column.name for column in
+                       connection.introspection.get_table_description(cursor, 'portfolio_blogpost')]
+        self.assertNotIn('legacy_tags', columns)
+        self.assertNotIn('tags', columns)
+
+    def test_check_blog_posts_lists_tag_names(self):
+        post = BlogPost.objects.create(title='Tagged', slug='tagged', body='...', is_featured=True,
+                                       is_published=True)
+        post.set_tags_from_string('Django, Python')
+        output = StringIO()
+        call_command('check_blog_posts', stdout=output)
+        self.assertIn('Tags: Django, Python', output.getvalue())
+
+
+class PortfolioContextTests(TestCase):
+    """The site-wide context only queries for what a template renders"""
+
+    footer = '{% for category, links in footer_links_by_category.items %}{{ category }}: {{ links|length }};{% endfor %}'
+
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(6):
+            FooterLink.objects.create(title=f'Link {i}', url=f'https://example.com/{i}',
+                                      category='quick' if i % 2 else 'social', order=i)
+
+    def setUp(self):
+        cache.clear()
+        self.request = RequestFactory().get('/')
+
+    def render(self, source):
+        with CaptureQueriesContext(connection) as queries:
+            html = Template(source).render(RequestContext(self.request))
+        return html, [query['sql'] for query in queries.captured_queries]
+
+    def test_footer_links_are_lazy(self):
+        html, queries = self.render('{{ portfolio_name }}')
+        self.assertEqual(html, 'My Portfolio')
+        self.assertFalse([sql for sql in queries if 'portfolio_footerlink' in sql], queries)
+
+    def test_footer_links_query_is_bounded(self):
+        html, queries = self.render(self.footer)
+        self.assertIn('Quick Links: 3;', html)
+        self.assertEqual(len([sql for sql in queries if 'portfolio_footerlink' in sql]), 1, queries)
+        html, cached = self.render(self.footer)
+        self.assertEqual(cached, [])
+
+        # More links still load in one query, once the save invalidates the cache
+        for i in range(6, 12):
+            FooterLink.objects.create(title=f'Link {i}', url=f'https://example.com/{i}', category='quick', order=i)
+        html, queries = self.render(self.footer)
+        self.assertIn('Quick Links: 9;', html)
+        self.assertEqual(len([sql for sql in queries if 'portfolio_footerlink' in sql]), 1, queries)
+
+    def test_failures_are_logged(self):
+        with mock.patch.object(FooterLink, 'get_grouped', side_effect=RuntimeError('no table')), \
+                self.assertLogs('portfolio.context_processors', 'WARNING') as logs:
+            html, queries = self.render(self.footer)
+        self.assertEqual(html, '')
+        self.assertIn('Footer links could not be loaded: no table', logs.output[0])
+
+
+class BackgroundTests(TestCase):
+    """Debounced background calls run once per burst, with every queued item"""
+
+    def setUp(self):
+        self.enterContext(mock.patch.object(background, '_tasks', {}))
+
+    def test_burst_runs_once_with_every_item(self):
+        fn = mock.Mock(return_value='done')
+        with mock.patch.object(background, '_start_timer') as start_timer:
+            background.debounce('test', 5, fn, 1)
+            background.debounce('test', 5, fn, 2)
+            background.debounce('test', 5, fn)
+        start_timer.assert_called_once_with(5, 'test')
+        self.assertEqual(background.flush('test'), 'done')
+        fn.assert_called_once_with([1, 2])
+        self.assertIsNone(background.flush('test'))
+
+    def test_runs_on_a_thread_after_commit(self):
+        ran = threading.Event()
+        with self.captureOnCommitCallbacks(execute=True):
+            background.debounce_on_commit('test', 0, lambda items: ran.set(), 'item')
+            self.assertNotIn('test', background._tasks)
+        self.assertTrue(ran.wait(5))
+        self.assertNotIn('test', background._tasks)
+
+    def test_failures_are_logged(self):
+        with mock.patch.object(background, '_start_timer'):
+            background.debounce('test', 0, mock.Mock(side_effect=RuntimeError('boom')))
+        with self.assertLogs('portfolio.background', 'ERROR') as logs, \
+                mock.patch.object(background.connections, 'close_all') as close_all:
+            background._run('test')
+        self.assertIn('Background task test failed', logs.output[0])
+        close_all.assert_called_once()
@@ -0,0 +1,200 @@
+"""
+Background file uploads.
+
+Uploading a CV from the dashboard only streams the file to a local staging
+directory and records a ``PendingUpload``; moving it into the field's
+storage (local media, or Cloudinary through ``PublicPDFStorage``, which
+sends large files in chunks) happens outside the request. The file is read
+in chunks throughout and progress is written to the row as it is sent, so
+the dashboard can show the upload as pending.
+
+By default each upload runs on a background thread of the web process once
+the request's transaction commits, and the scheduler's ``process-uploads``
+job picks up any upload whose thread was lost with its process (a restart
+or deploy). With ``PORTFOLIO_UPLOAD_WORKER = True`` the ``process_uploads``
+command handles them all instead. Either way it must share
+``PORTFOLIO_UPLOAD_STAGING_ROOT`` with the web process. Failed uploads are
+retried with exponential backoff and give up after
+``PORTFOLIO_UPLOAD_MAX_ATTEMPTS``.
+"""
+import logging
+import os
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from . import background
+from .models import PendingUpload
+
+logger = logging.getLogger(__name__)
+
+MAX_RETRY_DELAY = 60 * 60
+
+# An upload in progress is skipped by other workers for this long after its
+# last progress report; if its worker dies it becomes due again afterwards
+CLAIM_TIMEOUT = 10 * 60
+
+# Bytes sent between progress writes
+PROGRESS_INTERVAL = 1024 * 1024
+
+
+def staging_storage():
+    """Local storage holding uploads until they are processed"""
+    return FileSystemStorage(location=getattr(
+        settings, 'PORTFOLIO_UPLOAD_STAGING_ROOT', os.path.join(settings.BASE_DIR, 'uploads')
+    ))
+
+
+class ProgressFile(File):
+    """File that reports the running total of bytes read from it"""
+
+    def __init__(self, file, name, callback):
+        super().__init__(file, name)
+        self.callback = callback
+        self.bytes_read = 0
+
+    def read(self, *args):
+        data = self.file.read(*args)
+        self.bytes_read += len(data)
+        self.callback(self.bytes_read)
+        return data
+
+
+def queue_upload(personal_info, field_name, uploaded_file):
+    """Stage an uploaded file and queue it for the given field"""
+    name = os.path.basename(uploaded_file.name)
+    staged_name = staging_storage().save(f'{uuid.uuid4().hex}/{name}', uploaded_file)
+    upload = PendingUpload.objects.create(
+        personal_info=personal_info, field_name=field_name, staged_name=staged_name,
+        original_name=name, size=uploaded_file.size,
+    )
+    if not getattr(settings, 'PORTFOLIO_UPLOAD_WORKER', False):
+        transaction.on_commit(lambda: start_thread(upload.pk))
+    return upload
+
+
+def retry(queryset):
+    """Queue the failed uploads in ``queryset`` again; returns how many were queued"""
+    pks = list(queryset.filter(status='failed').values_list('pk', flat=True))
+    PendingUpload.objects.filter(pk__in=pks).update(
+        status='queued', attempts=0, bytes_uploaded=0, next_attempt_at=timezone.now()
+    )
+    if not getattr(settings, 'PORTFOLIO_UPLOAD_WORKER', False):
+        for pk in pks:
+            transaction.on_commit(lambda pk=pk: start_thread(pk))
+    return len(pks)
+
+
+def start_thread(pk, delay=0):
+    """Process an upload on a background thread, after ``delay`` seconds"""
+    return background.debounce(f'upload:{pk}', delay, _run_thread, pk)
+
+
+def _run_thread(pks):
+    for pk in pks:
+        for upload in claim(pk=pk):
+            if not process(upload) and upload.status == 'queued':
+                start_thread(pk, delay=(upload.next_attempt_at - timezone.now()).total_seconds())
+
+
+def claim(batch_size=1, pk=None):
+    """Reserve up to ``batch_size`` due uploads (or the upload ``pk``) for this process"""
+    now = timezone.now()
+    due = PendingUpload.objects.filter(
+        Q(status='queued') | Q(status='uploading'), next_attempt_at__lte=now
+    )
+    if pk is not None:
+        due = due.filter(pk=pk)
+    with transaction.atomic():
+        uploads = list(
+            due.select_for_update(skip_locked=True).order_by('next_attempt_at')[:batch_size]
+        )
+        PendingUpload.objects.filter(pk__in=[upload.pk for upload in uploads]).update(
+            status='uploading', next_attempt_at=now + timedelta(seconds=CLAIM_TIMEOUT)
+        )
+    for upload in uploads:
+        upload.status = 'uploading'
+    return uploads
+
+
+def _record(upload, **fields):
+    for name, value in fields.items():
+        setattr(upload, name, value)
+    # Queryset updates skip model signals, which would purge the page cache
+    PendingUpload.objects.filter(pk=upload.pk).update(**fields)
+
+
+def _failed(upload, error):
+    # Read here rather than at import so they follow override_settings
+    max_attempts = getattr(settings, 'PORTFOLIO_UPLOAD_MAX_ATTEMPTS', 3)
+    # Seconds before the first retry; doubled after every failed attempt
+    retry_delay = getattr(settings, 'PORTFOLIO_UPLOAD_RETRY_DELAY', 60)
+    attempts = upload.attempts + 1
+    if attempts >= max_attempts:
+        logger.error(f"Giving up on upload {upload} after {attempts} attempts: {error}")
+        _record(upload, attempts=attempts, status='failed', last_error=str(error),
+                finished_at=timezone.now())
+        return
+    delay = min(retry_delay * 2 ** (attempts - 1), MAX_RETRY_DELAY)
+    logger.warning(f"Upload {upload} failed, retrying in {delay}s: {error}")
+    _record(
+        upload, attempts=attempts, status='queued', last_error=str(error), bytes_uploaded=0,
+        next_attempt_at=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def process(upload):
+    """
+    Move a claimed upload into its field's storage.
+
+    Returns True on success; failures are rescheduled or given up on.
+    """
+    storage = staging_storage()
+    reported = 0
+
+    def report(bytes_read):
+        nonlocal reported
+        if bytes_read - reported >= PROGRESS_INTERVAL or bytes_read >= upload.size:
+            reported = bytes_read
+            # Each report also extends the claim on the upload
+            _record(upload, bytes_uploaded=min(bytes_read, upload.size),
+                    next_attempt_at=timezone.now() + timedelta(seconds=CLAIM_TIMEOUT))
+
+    try:
+        personal_info = upload.personal_info
+        with storage.open(upload.staged_name, 'rb') as handle:
+            content = ProgressFile(handle, upload.original_name, report)
+            getattr(personal_info, upload.field_name).save(upload.original_name, content, save=False)
+        personal_info.save(update_fields=[upload.field_name])
+    except Exception as e:
+        _failed(upload, e)
+        return False
+
+    _record(upload, status='done', attempts=upload.attempts + 1, bytes_uploaded=upload.size,
+            last_error='', finished_at=timezone.now())
+    storage.delete(upload.staged_name)
+    try:
+        os.rmdir(os.path.dirname(storage.path(upload.staged_name)))
+    except OSError:
+        pass
+    return True
+
+
+def process_due(batch_size=5):
+    """Process every upload that is due, one batch at a time"""
+    done = failed = 0
+    while True:
+        uploads = claim(batch_size)
+        if not uploads:
+            return done, failed
+        for upload in uploads:
+            if process(upload):
+                done += 1
+            else:
+                failed += 1
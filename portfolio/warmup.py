@@ -0,0 +1,171 @@
+"""
+Cache warming.
+
+``public_urls()`` lists every public page: home, about, each project and
+published blog post, every page of the project and blog listings and their
+tag filters (only the first with cursor pagination). ``warm()`` requests
+them concurrently so the page cache and the fragments in ``portfolio.cache``
+are built before visitors arrive.
+
+By default pages are rendered in-process with the Django test client, which
+fills a shared cache (Redis, Memcached, database). Page cache keys include
+the absolute URL, so requests are made as ``PORTFOLIO_SITE_URL``, the
+address visitors use. A per-process cache (the default LocMemCache) can
+only be warmed over HTTP: pass ``base_url`` to crawl a running server, such
+as ``PORTFOLIO_WARM_CACHE_URL`` for the scheduled job. ``can_warm()`` tells
+whether a run would reach the cache visitors are served from.
+
+Used by ``manage.py warm_cache``, after deploys, and after content changes
+when ``PORTFOLIO_WARM_CACHE_ON_CHANGE`` is set (see ``schedule()``).
+"""
+import logging
+import math
+import queue
+import threading
+import time
+from collections import namedtuple
+from urllib.parse import urlencode, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+from django.db import connections
+from django.db.models import Count
+from django.test import Client
+from django.urls import reverse
+
+from . import background
+from .cache import is_shared_cache
+from .models import BlogPost, Project, Tag
+from .views import BlogListView, ProjectListView
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = getattr(settings, 'PORTFOLIO_WARM_CACHE_CONCURRENCY', 4)
+
+# Seconds to wait after a content change, so a batch of edits warms once
+CHANGE_DELAY = getattr(settings, 'PORTFOLIO_WARM_CACHE_DELAY', 10)
+
+WarmResult = namedtuple('WarmResult', ['url', 'status', 'ms', 'cache'])
+
+
+def can_warm(base_url=None):
+    """Whether warming reaches the web processes: over HTTP, or in-process into a shared cache"""
+    return bool(base_url) or is_shared_cache()
+
+
+def _listing(url, count, view):
+    """A listing URL followed by its further numbered pages"""
+    if view.cursor_enabled():
+        # Cursor pages are only known by following their links
+        return [url]
+    separator = '&' if '?' in url else '?'
+    pages = math.ceil(count / view.paginate_by)
+    return [url] + [f'{url}{separator}page={page}' for page in range(2, pages + 1)]
+
+
+def public_urls():
+    """Paths of every public page, most visited first"""
+    projects_url = reverse('portfolio:projects_list')
+    blog_url = reverse('portfolio:blog_list')
+    published = BlogPost.objects.filter(is_published=True)
+
+    urls = [reverse('portfolio:home'), reverse('portfolio:about')]
+    urls += _listing(projects_url, Project.objects.count(), ProjectListView)
+    urls += _listing(blog_url, published.count(), BlogListView)
+
+    project_tags = Tag.objects.filter(project__isnull=False).annotate(uses=Count('project'))
+    for name, uses in project_tags.order_by('name').values_list('name', 'uses'):
+        urls += _listing(f'{projects_url}?{urlencode({"tag": name})}', uses, ProjectListView)
+    blog_tags = Tag.objects.filter(blogpost__is_published=True).annotate(uses=Count('blogpost'))
+    for name, uses in blog_tags.order_by('name').values_list('name', 'uses'):
+        urls += _listing(f'{blog_url}?{urlencode({"tag": name})}', uses, BlogListView)
+
+    urls += [reverse('portfolio:project_detail', kwargs={'slug': slug})
+             for slug in Project.objects.values_list('slug', flat=True)]
+    urls += [reverse('portfolio:blog_detail', kwargs={'slug': slug})
+             for slug in published.values_list('slug', flat=True)]
+    return urls
+
+
+def site_client():
+    """Test client requesting pages as PORTFOLIO_SITE_URL; returns (client, secure)"""
+    site = urlsplit(getattr(settings, 'PORTFOLIO_SITE_URL', '') or 'http://localhost')
+    return Client(HTTP_HOST=site.netloc), site.scheme == 'https'
+
+
+def _in_process_fetcher():
+    client, secure = site_client()
+
+    def fetch(url):
+        response = client.get(url, secure=secure)
+        return response.status_code, response.get('X-Page-Cache', '')
+    return fetch
+
+
+def _http_fetcher(session, base_url):
+    def fetch(url):
+        response = session.get(base_url + url, timeout=30)
+        return response.status_code, response.headers.get('X-Page-Cache', '')
+    return fetch
+
+
+def warm(urls=None, concurrency=DEFAULT_CONCURRENCY, base_url=None):
+    """
+    Request ``urls`` (default: ``public_urls()``) on ``concurrency`` threads.
+
+    Returns a WarmResult per URL, in the order given. ``status`` is None
+    when the request raised.
+    """
+    urls = public_urls() if urls is None else list(urls)
+    pending = queue.Queue()
+    for index, url in enumerate(urls):
+        pending.put((index, url))
+    results = [None] * len(urls)
+    session = None
+    if base_url:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=max(1, concurrency))
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+
+    def worker():
+        fetch = _http_fetcher(session, base_url.rstrip('/')) if base_url else _in_process_fetcher()
+        try:
+            while True:
+                try:
+                    index, url = pending.get_nowait()
+                except queue.Empty:
+                    return
+                start = time.perf_counter()
+                try:
+                    status, cache_status = fetch(url)
+                except Exception as e:
+                    logger.warning(f"Could not warm {url}: {e}")
+                    status, cache_status = None, ''
+                results[index] = WarmResult(url, status, (time.perf_counter() - start) * 1000, cache_status)
+        finally:
+            # Each thread opened its own database connection
+            connections.close_all()
+
+    threads = [threading.Thread(target=worker) for _ in range(max(1, min(concurrency, len(urls))))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if session:
+        session.close()
+    return results
+
+
+def schedule(delay=CHANGE_DELAY):
+    """Warm the cache on a background thread after ``delay`` seconds, once per burst of changes"""
+    return background.debounce('warm-cache', delay, _warm_after_change)
+
+
+def _warm_after_change(items):
+    results = warm()
+    failed = [result.url for result in results if result.status != 200]
+    logger.info(f"Warmed {len(results) - len(failed)} pages after a content change")
+    if failed:
+        logger.warning(f"Pages that could not be warmed: {', '.join(failed)}")
@@ -14,3 +14,12 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "portfolio_project.settings.prod")
 
 application = get_asgi_application()
+
+# Fail at startup rather than on the first page view if collectstatic did not run
+from portfolio.checks import verify_static_manifest
+verify_static_manifest()
+
+# Compile templates now rather than on each page's first view
+from portfolio.template_cache import PREWARM_ON_STARTUP, prewarm
+if PREWARM_ON_STARTUP:
+    prewarm()
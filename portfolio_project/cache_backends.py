@@ -0,0 +1,201 @@
+"""
+Two-tier cache backend.
+
+``TieredCache`` keeps a small in-process LRU (L1) in front of a shared cache
+(L2, Redis by default), so hot entries such as the active ``personal_info``
+are read without a network round-trip while every worker shares one L2.
+
+Coherence relies on how ``portfolio.cache`` names its keys. Values are
+stored under keys that embed the generation counters of the models they
+were built from, so an entry never changes once written and L1 may keep it
+(for at most ``L1_TIMEOUT`` seconds). The counters themselves (the
+``VOLATILE_PREFIXES`` keys) are the only entries that change in place: L1
+keeps them for ``VOLATILE_TIMEOUT`` seconds, so an edit made in one worker
+reaches the others within that delay, and at once in the worker that made
+it. Keys outside ``L1_PREFIXES`` (sessions, rate limits) always go to L2.
+
+Example::
+
+    CACHES = {
+        'default': {
+            'BACKEND': 'portfolio_project.cache_backends.TieredCache',
+            'LOCATION': 'redis://localhost:6379/1',
+            'OPTIONS': {'L1_MAX_ENTRIES': 256},
+        }
+    }
+
+Other ``OPTIONS`` are passed to the L2 backend, ``L2_BACKEND`` (default
+Django's ``RedisCache``).
+"""
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.utils.module_loading import import_string
+
+TIER_OPTIONS = {
+    'L2_BACKEND': 'django.core.cache.backends.redis.RedisCache',
+    'L1_MAX_ENTRIES': 256,
+    'L1_TIMEOUT': 60,
+    # Keys written by portfolio.cache and portfolio.page_cache
+    'L1_PREFIXES': ('portfolio:',),
+    # Generation counters, rewritten in place by portfolio.cache
+    'VOLATILE_PREFIXES': ('portfolio:gen:',),
+    'VOLATILE_TIMEOUT': 1,
+}
+
+_MISSING = object()
+
+
+class LocalTier:
+    """Thread-safe LRU of pickled values with per-entry expiry"""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            pickled, expires = entry
+            if expires <= time.monotonic():
+                del self._entries[key]
+                return _MISSING
+            self._entries.move_to_end(key)
+        return pickle.loads(pickled)
+
+    def set(self, key, value, lifetime):
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._entries[key] = (pickled, time.monotonic() + lifetime)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class TieredCache(BaseCache):
+    """Per-process L1 in front of a shared L2 cache"""
+
+    def __init__(self, location, params):
+        params = dict(params)
+        options = dict(params.get('OPTIONS', {}))
+        tier = {name: options.pop(name, default) for name, default in TIER_OPTIONS.items()}
+        params['OPTIONS'] = options
+        super().__init__(params)
+
+        self.l2 = import_string(tier['L2_BACKEND'])(location, params)
+        self.l1 = LocalTier(tier['L1_MAX_ENTRIES'])
+        self.l1_timeout = tier['L1_TIMEOUT']
+        self.l1_prefixes = tuple(tier['L1_PREFIXES'])
+        self.volatile_prefixes = tuple(tier['VOLATILE_PREFIXES'])
+        self.volatile_timeout = tier['VOLATILE_TIMEOUT']
+
+    def _l1_lifetime(self, key, timeout=DEFAULT_TIMEOUT):
+        """Seconds ``key`` may stay in L1, or 0 if it must always be read from L2"""
+        if not key.startswith(self.l1_prefixes):
+            return 0
+        lifetime = self.volatile_timeout if key.startswith(self.volatile_prefixes) else self.l1_timeout
+        timeout = self.get_backend_timeout(timeout)
+        return lifetime if timeout is None else max(0, min(lifetime, timeout))
+
+    def _remember(self, key, value, version, timeout=DEFAULT_TIMEOUT):
+        lifetime = self._l1_lifetime(key, timeout)
+        local_key = self.make_and_validate_key(key, version)
+        if lifetime:
+            self.l1.set(local_key, value, lifetime)
+        else:
+            self.l1.delete(local_key)
+
+    def get(self, key, default=None, version=None):
+        if self._l1_lifetime(key):
+            value = self.l1.get(self.make_and_validate_key(key, version))
+            if value is not _MISSING:
+                return value
+        value = self.l2.get(key, _MISSING, version=version)
+        if value is _MISSING:
+            return default
+        self._remember(key, value, version)
+        return value
+
+    def get_many(self, keys, version=None):
+        found = {}
+        remote = []
+        for key in keys:
+            value = _MISSING
+            if self._l1_lifetime(key):
+                value = self.l1.get(self.make_and_validate_key(key, version))
+            if value is _MISSING:
+                remote.append(key)
+            else:
+                found[key] = value
+        if remote:
+            fetched = self.l2.get_many(remote, version=version)
+            for key, value in fetched.items():
+                self._remember(key, value, version)
+            found.update(fetched)
+        return found
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.l2.set(key, value, timeout, version=version)
+        self._remember(key, value, version, timeout)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = self.l2.set_many(data, timeout, version=version)
+        for key, value in data.items():
+            if key not in failed:
+                self._remember(key, value, version, timeout)
+        return failed
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self.l2.add(key, value, timeout, version=version)
+        if added:
+            self._remember(key, value, version, timeout)
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.l2.touch(key, timeout, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        value = self.l2.incr(key, delta, version=version)
+        self._remember(key, value, version)
+        return value
+
+    def decr(self, key, delta=1, version=None):
+        value = self.l2.decr(key, delta, version=version)
+        self._remember(key, value, version)
+        return value
+
+    def has_key(self, key, version=None):
+        if self._l1_lifetime(key) and self.l1.get(self.make_and_validate_key(key, version)) is not _MISSING:
+            return True
+        return self.l2.has_key(key, version=version)
+
+    def delete(self, key, version=None):
+        self.l1.delete(self.make_and_validate_key(key, version))
+        return self.l2.delete(key, version=version)
+
+    def delete_many(self, keys, version=None):
+        for key in keys:
+            self.l1.delete(self.make_and_validate_key(key, version))
+        self.l2.delete_many(keys, version=version)
+
+    def clear(self):
+        # Other processes drop their L1 entries as they expire
+        self.l1.clear()
+        self.l2.clear()
+
+    def close(self, **kwargs):
+        self.l2.close(**kwargs)
@@ -0,0 +1,153 @@
+"""
+Per-request performance metrics.
+
+``PerformanceMiddleware`` (see ``portfolio_project.middleware``) opens a
+``RequestMetrics`` for every request. Code that knows more about where time
+goes reports into it through ``timed()`` and ``record_cache()``; both are
+no-ops outside a request. Finished requests are folded into a rolling
+window per URL name, shown on the dashboard performance page.
+
+Windows live in process memory, so every worker keeps its own and they reset
+on restart.
+"""
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+# Requests kept per URL name
+WINDOW_SIZE = getattr(settings, 'PORTFOLIO_PERFORMANCE_WINDOW', 500)
+
+# Upper bounds (ms) of the histogram buckets; the last bucket is open-ended
+BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500)
+
+_current = ContextVar('portfolio_request_metrics', default=None)
+
+
+class RequestMetrics:
+    """Counters for a single request (times in seconds)"""
+
+    def __init__(self):
+        self.total = 0.0
+        self.queries = 0
+        self.db = 0.0
+        self.template = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        """Database execute wrapper counting queries and their duration"""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db += time.perf_counter() - start
+
+
+def start_request():
+    """Begin collecting metrics; returns (metrics, token for finish_request)"""
+    metrics = RequestMetrics()
+    return metrics, _current.set(metrics)
+
+
+def finish_request(token):
+    _current.reset(token)
+
+
+@contextmanager
+def timed(section):
+    """Add the time spent in the block to a section ('template') of the current request"""
+    metrics = _current.get()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if metrics is not None:
+            setattr(metrics, section, getattr(metrics, section) + time.perf_counter() - start)
+
+
+def record_cache(hit):
+    """Count a cache hit or miss against the current request"""
+    metrics = _current.get()
+    if metrics is None:
+        return
+    if hit:
+        metrics.cache_hits += 1
+    else:
+        metrics.cache_misses += 1
+
+
+def _percentile(ordered, percent):
+    index = round(percent / 100 * (len(ordered) - 1))
+    return ordered[index]
+
+
+class RollingHistogram:
+    """Bounded window of recent request metrics per URL name"""
+
+    def __init__(self, size=WINDOW_SIZE):
+        self.size = size
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def add(self, name, metrics):
+        sample = (
+            metrics.total * 1000, metrics.queries, metrics.db * 1000,
+            metrics.template * 1000, metrics.cache_hits, metrics.cache_misses,
+        )
+        with self._lock:
+            if name not in self._samples:
+                self._samples[name] = deque(maxlen=self.size)
+            self._samples[name].append(sample)
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+
+    def snapshot(self):
+        """Summary per URL name, slowest p95 first"""
+        with self._lock:
+            samples = {name: list(window) for name, window in self._samples.items()}
+
+        rows = []
+        for name, window in samples.items():
+            count = len(window)
+            durations = sorted(sample[0] for sample in window)
+            hits = sum(sample[4] for sample in window)
+            lookups = hits + sum(sample[5] for sample in window)
+            buckets = [0] * (len(BUCKETS_MS) + 1)
+            for duration in durations:
+                index = next(
+                    (i for i, bound in enumerate(BUCKETS_MS) if duration <= bound),
+                    len(BUCKETS_MS),
+                )
+                buckets[index] += 1
+            rows.append({
+                'name': name,
+                'count': count,
+                'p50': _percentile(durations, 50),
+                'p95': _percentile(durations, 95),
+                'p99': _percentile(durations, 99),
+                'max': durations[-1],
+                'avg_queries': sum(sample[1] for sample in window) / count,
+                'avg_db_ms': sum(sample[2] for sample in window) / count,
+                'avg_template_ms': sum(sample[3] for sample in window) / count,
+                'cache_hit_rate': hits / lookups if lookups else None,
+                'buckets': buckets,
+            })
+        rows.sort(key=lambda row: row['p95'], reverse=True)
+        return rows
+
+
+histogram = RollingHistogram()
+
+
+def bucket_labels():
+    """Human-readable labels matching RollingHistogram bucket order"""
+    labels = [f'≤{bound}ms' for bound in BUCKETS_MS]
+    labels.append(f'>{BUCKETS_MS[-1]}ms')
+    return labels
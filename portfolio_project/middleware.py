@@ -0,0 +1,97 @@
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from . import metrics
+
+logger = logging.getLogger('portfolio.performance')
+
+
+class PerformanceMiddleware:
+    """
+    Measure where each request spends its time.
+
+    Records total time, database queries and time (via
+    ``connection.execute_wrapper``), template rendering and portfolio cache
+    hits/misses. Each request gets one structured log line and is added to
+    the rolling per-URL histogram shown on the dashboard performance page.
+    Staff get the numbers in a ``Server-Timing`` header, and so does everyone
+    with ``PORTFOLIO_SERVER_TIMING`` (on by default only under DEBUG), since
+    they reveal query counts and cache behaviour to any visitor.
+
+    Place it below WhiteNoise so static files are not measured.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.server_timing = getattr(settings, 'PORTFOLIO_SERVER_TIMING', settings.DEBUG)
+
+    def __call__(self, request):
+        request_metrics, token = metrics.start_request()
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(
+                        connection.execute_wrapper(request_metrics.execute_wrapper)
+                    )
+                response = self.get_response(request)
+        finally:
+            request_metrics.total = time.perf_counter() - start
+            metrics.finish_request(token)
+
+        match = getattr(request, 'resolver_match', None)
+        name = match.view_name if match else 'unresolved'
+        metrics.histogram.add(name, request_metrics)
+
+        if self.server_timing or self.is_staff(request):
+            response['Server-Timing'] = self.server_timing_header(request_metrics)
+        self.log(request, response, name, request_metrics)
+        return response
+
+    def process_template_response(self, request, response):
+        # Time the render the handler performs after the view returns
+        render = response.render
+
+        def timed_render():
+            with metrics.timed('template'):
+                return render()
+
+        response.render = timed_render
+        return response
+
+    @staticmethod
+    def is_staff(request):
+        user = getattr(request, 'user', None)
+        return user is not None and user.is_staff
+
+    @staticmethod
+    def server_timing_header(request_metrics):
+        return ', '.join([
+            f'db;dur={request_metrics.db * 1000:.1f};desc="{request_metrics.queries} queries"',
+            f'tpl;dur={request_metrics.template * 1000:.1f};desc="Templates"',
+            f'cache;desc="{request_metrics.cache_hits} hits, {request_metrics.cache_misses} misses"',
+            f'total;dur={request_metrics.total * 1000:.1f};desc="Total"',
+        ])
+
+    @staticmethod
+    def log(request, response, name, request_metrics):
+        fields = {
+            'view': name,
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'total_ms': round(request_metrics.total * 1000, 1),
+            'db_ms': round(request_metrics.db * 1000, 1),
+            'queries': request_metrics.queries,
+            'template_ms': round(request_metrics.template * 1000, 1),
+            'cache_hits': request_metrics.cache_hits,
+            'cache_misses': request_metrics.cache_misses,
+        }
+        logger.info(
+            ' '.join(f'{key}={value}' for key, value in fields.items()),
+            extra={'performance': fields},
+        )
@@ -54,6 +54,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "portfolio_project.middleware.PerformanceMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -81,6 +82,19 @@ TEMPLATES = [
     },
 ]
 
+# Production settings always load templates through the cached loader, which
+# compiles each template once per process (see portfolio/template_cache.py).
+# Django only picks it by default when no loaders are configured
+CACHED_TEMPLATE_LOADERS = [
+    (
+        "django.template.loaders.cached.Loader",
+        [
+            "django.template.loaders.filesystem.Loader",
+            "django.template.loaders.app_directories.Loader",
+        ],
+    ),
+]
+
 WSGI_APPLICATION = "portfolio_project.wsgi.application"
 
 # Password validation
@@ -115,14 +129,25 @@ STATICFILES_DIRS = [
     BASE_DIR / "static",
 ]
 
-# WhiteNoise configuration for static files - Fix for missing admin files
-# Use the most basic WhiteNoise storage to avoid any compression issues
-STATICFILES_STORAGE = "whitenoise.storage.StaticFilesStorage"
+# Compiled SCSS and minified JS written by `manage.py build_assets`. Listed
+# first whenever it exists, so collectstatic picks the built files over their
+# sources and development serves the same stylesheet as production once built
+STATIC_BUILD_DIR = BASE_DIR / "build" / "static"
+if STATIC_BUILD_DIR.exists():
+    STATICFILES_DIRS.insert(0, STATIC_BUILD_DIR)
 
-# WhiteNoise settings for better static file serving
+# WhiteNoise configuration for static files - development and tests serve
+# them straight from the static directories under their own names
+STATICFILES_STORAGE = "whitenoise.storage.StaticFilesStorage"
 WHITENOISE_USE_FINDERS = True
 WHITENOISE_AUTOREFRESH = True
 
+# Production settings modules switch to this storage: collectstatic writes
+# content-hashed names (served with far-future cache headers) plus gzip and
+# brotli copies, and the web process refuses to start without the manifest
+# (see portfolio/checks.py)
+MANIFEST_STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
+
 # Static files finders
 STATICFILES_FINDERS = [
     'django.contrib.staticfiles.finders.FileSystemFinder',
@@ -175,6 +200,116 @@ CONTACT_EMAIL = env('CONTACT_EMAIL', default=DEFAULT_FROM_EMAIL)
 SEND_AUTO_REPLY = env.bool('SEND_AUTO_REPLY', default=True)
 ADMIN_EMAIL_SUBJECT_PREFIX = env('ADMIN_EMAIL_SUBJECT_PREFIX', default='[Portfolio Contact] ')
 
+# Contact email outbox (see portfolio/outbox.py) - queued email is sent on a
+# background thread once the request commits and retried by the scheduler. Set
+# PORTFOLIO_EMAIL_WORKER=True where the Procfile worker process runs to leave
+# all sending to it
+PORTFOLIO_EMAIL_WORKER = env.bool('PORTFOLIO_EMAIL_WORKER', default=False)
+PORTFOLIO_EMAIL_MAX_ATTEMPTS = env.int('PORTFOLIO_EMAIL_MAX_ATTEMPTS', default=5)
+PORTFOLIO_EMAIL_RETRY_DELAY = env.int('PORTFOLIO_EMAIL_RETRY_DELAY', default=60)
+
+# Background uploads (see portfolio/uploads.py) - dashboard uploads are staged
+# here and moved into storage on a background thread (with the scheduler picking
+# up uploads lost in a restart), or by the process_uploads command when
+# PORTFOLIO_UPLOAD_WORKER=True. Both must share the staging directory.
+# Cloudinary uploads larger than PORTFOLIO_UPLOAD_CHUNK_SIZE bytes are chunked
+PORTFOLIO_UPLOAD_WORKER = env.bool('PORTFOLIO_UPLOAD_WORKER', default=False)
+PORTFOLIO_UPLOAD_STAGING_ROOT = env('PORTFOLIO_UPLOAD_STAGING_ROOT', default=str(BASE_DIR / 'uploads'))
+PORTFOLIO_UPLOAD_CHUNK_SIZE = env.int('PORTFOLIO_UPLOAD_CHUNK_SIZE', default=6 * 1024 * 1024)
+
+# GitHub sync (see portfolio/github_sync.py) - sync_github_repos makes
+# conditional requests against this API, fetching repository details on
+# PORTFOLIO_GITHUB_CONCURRENCY pooled connections
+PORTFOLIO_GITHUB_API_URL = env('PORTFOLIO_GITHUB_API_URL', default='https://api.github.com')
+PORTFOLIO_GITHUB_CONCURRENCY = env.int('PORTFOLIO_GITHUB_CONCURRENCY', default=8)
+
+# Scheduled jobs (see portfolio/scheduler.py) - the run_scheduler worker runs
+# due jobs, holding a lock on each for at most PORTFOLIO_SCHEDULER_LOCK_TIMEOUT
+# seconds. A daily GitHub sync job is created when PORTFOLIO_GITHUB_USERNAME is set
+PORTFOLIO_GITHUB_USERNAME = env('PORTFOLIO_GITHUB_USERNAME', default='')
+PORTFOLIO_SCHEDULER_LOCK_TIMEOUT = env.int('PORTFOLIO_SCHEDULER_LOCK_TIMEOUT', default=60 * 60)
+
+# Cache warming (see portfolio/warmup.py) - warm_cache requests every public
+# page as PORTFOLIO_SITE_URL (the address visitors use, since page cache keys
+# include it). A per-process cache can only be warmed over HTTP: the scheduled
+# warm-cache job crawls PORTFOLIO_WARM_CACHE_URL (the web service's address)
+# when set, and is only created otherwise when the cache is shared. With
+# PORTFOLIO_WARM_CACHE_ON_CHANGE the web process re-warms its cache in the
+# background after content edits
+PORTFOLIO_SITE_URL = env('PORTFOLIO_SITE_URL', default='')
+PORTFOLIO_WARM_CACHE_URL = env('PORTFOLIO_WARM_CACHE_URL', default='')
+PORTFOLIO_WARM_CACHE_ON_CHANGE = env.bool('PORTFOLIO_WARM_CACHE_ON_CHANGE', default=False)
+
+# Template prewarm (see portfolio/template_cache.py) - web workers compile
+# the site's templates when they start instead of on each page's first view
+PORTFOLIO_PREWARM_TEMPLATES = env.bool('PORTFOLIO_PREWARM_TEMPLATES', default=not DEBUG)
+
+# Two-tier cache (see portfolio_project/cache_backends.py) - with REDIS_URL set,
+# every process keeps a small in-memory L1 in front of the shared Redis L2.
+# Without it Django's default per-process LocMemCache is used
+REDIS_URL = env('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'portfolio_project.cache_backends.TieredCache',
+            'LOCATION': REDIS_URL,
+            'OPTIONS': {
+                'L1_MAX_ENTRIES': env.int('CACHE_L1_MAX_ENTRIES', default=256),
+            },
+        }
+    }
+
+# Public page cache (see portfolio/cache.py) - entries are invalidated by model
+# signals, so the timeout only bounds how long unused entries linger
+PORTFOLIO_CACHE_TIMEOUT = env.int('PORTFOLIO_CACHE_TIMEOUT', default=3600)
+
+# Full-page cache for anonymous visitors (see portfolio/page_cache.py) - unset,
+# it is on outside DEBUG when the cache is shared between processes (REDIS_URL)
+PORTFOLIO_PAGE_CACHE = env.bool('PORTFOLIO_PAGE_CACHE', default=None)
+
+# List pagination (see portfolio/pagination.py) - PORTFOLIO_CURSOR_PAGINATION
+# pages the public project and blog listings by cursor instead of page number
+# (dashboard messages always are). With PORTFOLIO_APPROXIMATE_COUNTS the
+# dashboard shows PostgreSQL's estimate for counts of PORTFOLIO_EXACT_COUNT_LIMIT
+# rows or more
+PORTFOLIO_CURSOR_PAGINATION = env.bool('PORTFOLIO_CURSOR_PAGINATION', default=False)
+PORTFOLIO_APPROXIMATE_COUNTS = env.bool('PORTFOLIO_APPROXIMATE_COUNTS', default=False)
+PORTFOLIO_EXACT_COUNT_LIMIT = env.int('PORTFOLIO_EXACT_COUNT_LIMIT', default=10000)
+
+# Full-text search (see portfolio/search.py) - PostgreSQL text search
+# configuration and the minimum title similarity for typo-tolerant matches
+PORTFOLIO_SEARCH_CONFIG = env('PORTFOLIO_SEARCH_CONFIG', default='english')
+PORTFOLIO_SEARCH_TRIGRAM_THRESHOLD = env.float('PORTFOLIO_SEARCH_TRIGRAM_THRESHOLD', default=0.3)
+
+# Related content (see portfolio/related.py) - neighbours stored per project/post,
+# rescored on a background thread PORTFOLIO_RELATED_REFRESH_DELAY seconds after a change
+PORTFOLIO_RELATED_LIMIT = env.int('PORTFOLIO_RELATED_LIMIT', default=6)
+PORTFOLIO_RELATED_REFRESH_DELAY = env.float('PORTFOLIO_RELATED_REFRESH_DELAY', default=5)
+
+# Responsive images (see portfolio/images.py) - renditions generated on a
+# background thread PORTFOLIO_IMAGE_RENDITIONS_DELAY seconds after an upload;
+# set PORTFOLIO_IMAGE_RENDITIONS_ON_SAVE to False to only generate them with
+# `manage.py generate_image_renditions` (also run hourly by the scheduler)
+PORTFOLIO_IMAGE_RENDITIONS_ON_SAVE = env.bool('PORTFOLIO_IMAGE_RENDITIONS_ON_SAVE', default=True)
+PORTFOLIO_IMAGE_RENDITIONS_DELAY = env.float('PORTFOLIO_IMAGE_RENDITIONS_DELAY', default=1)
+
+# Local media serving (see portfolio/media_server.py) - set to 'x-accel-redirect'
+# (nginx, files under PORTFOLIO_MEDIA_ACCEL_PREFIX) or 'x-sendfile' (Apache) to
+# let the front proxy send files; empty serves them from the app server
+PORTFOLIO_MEDIA_SENDFILE = env('PORTFOLIO_MEDIA_SENDFILE', default='')
+PORTFOLIO_MEDIA_ACCEL_PREFIX = env('PORTFOLIO_MEDIA_ACCEL_PREFIX', default='/protected-media/')
+
+# Resume delivery (see portfolio/resume.py) - seconds a resolved (signed) resume
+# URL is valid; it is re-resolved PORTFOLIO_RESUME_URL_REFRESH_MARGIN earlier
+PORTFOLIO_RESUME_URL_TTL = env.int('PORTFOLIO_RESUME_URL_TTL', default=3600)
+PORTFOLIO_RESUME_URL_REFRESH_MARGIN = env.int('PORTFOLIO_RESUME_URL_REFRESH_MARGIN', default=300)
+
+# Request instrumentation (see portfolio_project/middleware.py) - Server-Timing
+# header on responses to everyone rather than only staff, and requests kept per
+# URL in the rolling histogram
+PORTFOLIO_SERVER_TIMING = env.bool('PORTFOLIO_SERVER_TIMING', default=DEBUG)
+PORTFOLIO_PERFORMANCE_WINDOW = env.int('PORTFOLIO_PERFORMANCE_WINDOW', default=500)
+
 # Production security flags (controlled by environment variables)
 # Basic security settings (common across all environments)
 SECURE_BROWSER_XSS_FILTER = True
@@ -72,19 +72,25 @@ USE_X_FORWARDED_HOST = config('USE_X_FORWARDED_HOST', default=True, cast=bool)
 USE_X_FORWARDED_PORT = config('USE_X_FORWARDED_PORT', default=True, cast=bool)
 SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
 
+# Templates - compiled once per process by the cached loader, whatever DEBUG says
+TEMPLATES[0]['APP_DIRS'] = False
+TEMPLATES[0]['OPTIONS']['loaders'] = CACHED_TEMPLATE_LOADERS
+
 # Performance Settings
 # Cache configuration
 CACHE_TTL = config('CACHE_TTL', default=300, cast=int)  # 5 minutes default
-CACHES = {
-    'default': {
-        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
-        'LOCATION': config('CACHE_LOCATION', default=''),
-        'TIMEOUT': CACHE_TTL,
-        'OPTIONS': {
-            'MAX_ENTRIES': config('CACHE_MAX_ENTRIES', default=1000, cast=int),
+# With REDIS_URL set, base.py configures the two-tier Redis cache
+if not REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+            'LOCATION': config('CACHE_LOCATION', default=''),
+            'TIMEOUT': CACHE_TTL,
+            'OPTIONS': {
+                'MAX_ENTRIES': config('CACHE_MAX_ENTRIES', default=1000, cast=int),
+            }
         }
     }
-}
 
 # Session Configuration
 SESSION_ENGINE = config('SESSION_ENGINE', default='django.contrib.sessions.backends.cached_db')
@@ -92,7 +98,8 @@ SESSION_CACHE_ALIAS = 'default'
 
 # Static and Media Files for Production
 # WhiteNoise is already configured in base.py
-# Override base.py settings for production
+# Override base.py settings for production: hashed, precompressed assets
+STATICFILES_STORAGE = MANIFEST_STATICFILES_STORAGE
 WHITENOISE_USE_FINDERS = config('WHITENOISE_USE_FINDERS', default=False, cast=bool)
 WHITENOISE_AUTOREFRESH = config('WHITENOISE_AUTOREFRESH', default=False, cast=bool)
 
@@ -119,10 +119,15 @@ LOGGING = {
     },
 }
 
+# Templates - compiled once per process by the cached loader, whatever DEBUG says
+TEMPLATES[0]['APP_DIRS'] = False
+TEMPLATES[0]['OPTIONS']['loaders'] = CACHED_TEMPLATE_LOADERS
+
 # Cache configuration for production (optional)
+# (two-tier: per-process L1 in front of Redis, see portfolio_project/cache_backends.py)
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'BACKEND': 'portfolio_project.cache_backends.TieredCache',
         'LOCATION': config('REDIS_URL', default='redis://127.0.0.1:6379/1'),
     }
 } if config('REDIS_URL', default=None) else {
@@ -154,5 +159,7 @@ if config('USE_CLOUDINARY', default=False, cast=bool):
 else:
     print("Production using local file storage")
 
-# Keep STATICFILES_STORAGE pointed at WhiteNoise for static assets
-STATICFILES_STORAGE = "whitenoise.storage.StaticFilesStorage"
+# Hashed, precompressed WhiteNoise assets, served from the collected files only
+STATICFILES_STORAGE = MANIFEST_STATICFILES_STORAGE
+WHITENOISE_USE_FINDERS = False
+WHITENOISE_AUTOREFRESH = False
@@ -155,16 +155,33 @@ DATABASES = {
 # Debug: Print database engine being used
 print(f"🔗 Database ENGINE: {DATABASES['default'].get('ENGINE', 'Not configured')}")
 
+# ✅ Cache - two tiers when Railway Redis is attached: a small per-process L1
+# in front of the shared Redis L2 (see portfolio_project/cache_backends.py).
+# Without Redis every gunicorn worker keeps its own LocMemCache
+REDIS_URL = os.environ.get('REDIS_URL', '')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'portfolio_project.cache_backends.TieredCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+
 # ✅ Static files (served via WhiteNoise)
 STATIC_URL = "/static/"
 STATIC_ROOT = os.path.join(BASE_DIR, "staticfiles")
 STATICFILES_DIRS = [
     os.path.join(BASE_DIR, "static"),
 ]
+# Compiled SCSS and minified JS from `manage.py build_assets` shadow their sources
+STATIC_BUILD_DIR = os.path.join(BASE_DIR, "build", "static")
+if os.path.isdir(STATIC_BUILD_DIR):
+    STATICFILES_DIRS.insert(0, STATIC_BUILD_DIR)
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",  # <- must be above common middleware
+    "portfolio_project.middleware.PerformanceMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -184,8 +201,17 @@ TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
         "DIRS": [os.path.join(BASE_DIR, "templates")],
-        "APP_DIRS": True,
         "OPTIONS": {
+            # Compiled once per process, whatever DEBUG says (see portfolio/template_cache.py)
+            "loaders": [
+                (
+                    "django.template.loaders.cached.Loader",
+                    [
+                        "django.template.loaders.filesystem.Loader",
+                        "django.template.loaders.app_directories.Loader",
+                    ],
+                ),
+            ],
             "context_processors": [
                 "django.template.context_processors.debug",
                 "django.template.context_processors.request",
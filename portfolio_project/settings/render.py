@@ -85,7 +85,7 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
 # Additional WhiteNoise settings for better performance
-WHITENOISE_USE_FINDERS = True
+WHITENOISE_USE_FINDERS = False  # Serve the collected, hashed files only
 WHITENOISE_AUTOREFRESH = False  # Disable in production for performance
 WHITENOISE_SKIP_COMPRESS_EXTENSIONS = ['jpg', 'jpeg', 'png', 'gif', 'webp', 'zip', 'gz', 'tgz', 'bz2', 'tbz', 'xz', 'br']
 
@@ -131,16 +131,18 @@ LOGGING = {
 # Email configuration for production
 EMAIL_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.smtp.EmailBackend')
 
+# Templates - compiled once per process by the cached loader, whatever DEBUG says
+TEMPLATES[0]['APP_DIRS'] = False
+TEMPLATES[0]['OPTIONS']['loaders'] = CACHED_TEMPLATE_LOADERS
+
 # Cache configuration - Use Redis if available on Render
 redis_url = config('REDIS_URL', default=None)
 if redis_url:
+    # Per-process L1 in front of Redis, see portfolio_project/cache_backends.py
     CACHES = {
         'default': {
-            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'BACKEND': 'portfolio_project.cache_backends.TieredCache',
             'LOCATION': redis_url,
-            'OPTIONS': {
-                'CLIENT_CLASS': 'django_redis.client.DefaultClient',
-            },
             'KEY_PREFIX': 'portfolio',
             'TIMEOUT': 300,
         }
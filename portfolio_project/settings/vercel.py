@@ -21,9 +21,12 @@ DATABASES = {
     }
 }
 
-# Static files for Vercel
+# Static files for Vercel - the build does not run collectstatic, so files
+# are served from the static directories under their own names
 STATIC_URL = '/static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles_build', 'static')
+STATICFILES_STORAGE = "whitenoise.storage.StaticFilesStorage"
+WHITENOISE_USE_FINDERS = True
 
 # Media files for Vercel
 MEDIA_URL = '/media/'
@@ -7,12 +7,17 @@ This module provides specialized storage classes to ensure:
 - Existing images remain unaffected by PDF storage changes
 """
 
+import os
+
 from django.conf import settings
 from cloudinary_storage.storage import MediaCloudinaryStorage, RawMediaCloudinaryStorage
 import cloudinary
 import cloudinary.uploader
 import cloudinary.api
 
+# Bytes per chunk for chunked uploads; Cloudinary requires at least 5MB
+UPLOAD_CHUNK_SIZE = 6 * 1024 * 1024
+
 
 class PublicPDFStorage(RawMediaCloudinaryStorage):
     """
@@ -57,9 +62,7 @@ class PublicPDFStorage(RawMediaCloudinaryStorage):
         
         # Use direct Cloudinary uploader to ensure proper options        
         try:
-            # Read file content
             content.seek(0)  # Ensure we're at the start
-            file_content = content.read()
             
             # Generate public_id - don't add media/ prefix for public access to work
             clean_name = name.lstrip('/')
@@ -67,8 +70,7 @@ class PublicPDFStorage(RawMediaCloudinaryStorage):
             
             # Upload with authenticated type to generate signed URLs for access
             # This prevents 401 errors by using Cloudinary's signed URL system
-            result = cloudinary.uploader.upload(
-                file_content,
+            options = dict(
                 public_id=public_id,
                 resource_type='raw',        # Correct for non-image files
                 type='authenticated',       # Generate signed URLs for access
@@ -77,8 +79,17 @@ class PublicPDFStorage(RawMediaCloudinaryStorage):
                 secure=True,                # Force HTTPS
                 use_filename=False,         # Use our public_id
                 folder=None,                # Don't use folder parameter with public_id
+                filename=os.path.basename(clean_name),
             )
             
+            # Files larger than one chunk are sent in chunks, so at most one
+            # chunk is held in memory; the file is read, never loaded whole
+            chunk_size = getattr(settings, 'PORTFOLIO_UPLOAD_CHUNK_SIZE', UPLOAD_CHUNK_SIZE)
+            if getattr(content, 'size', 0) > chunk_size:
+                result = cloudinary.uploader.upload_large(content, chunk_size=chunk_size, **options)
+            else:
+                result = cloudinary.uploader.upload(content, **options)
+            
             # Return the name for Django's file field
             return name
             
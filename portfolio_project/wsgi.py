@@ -15,3 +15,12 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'portfolio_project.settings.rail
 
 # Use dj-static to serve media files in production
 application = Cling(get_wsgi_application())
+
+# Fail at startup rather than on the first page view if collectstatic did not run
+from portfolio.checks import verify_static_manifest
+verify_static_manifest()
+
+# Compile templates now rather than on each page's first view
+from portfolio.template_cache import PREWARM_ON_STARTUP, prewarm
+if PREWARM_ON_STARTUP:
+    prewarm()
@@ -4,6 +4,7 @@ Railway startup script that ensures:
 1. Database migrations are applied
 2. Static files are collected  
 3. Superuser is created if it doesn't exist
+4. Caches are warmed (when the cache is shared by every process)
 
 This script runs before the Django app starts on Railway.
 """
@@ -19,6 +20,8 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'portfolio_project.settings.rail
 # Initialize Django
 django.setup()
 
+from portfolio.cache import is_shared_cache
+
 def run_startup_tasks():
     """Run essential startup tasks for Railway deployment."""
     
@@ -48,6 +51,18 @@ def run_startup_tasks():
     except Exception as e:
         print(f"ℹ️  Superuser already exists or will be created automatically: {e}")
     
+    # 4. Warm the page cache so the first visitors are not served cold pages.
+    # The web server is not up yet, so only a shared cache can be filled here
+    if is_shared_cache():
+        print("🔥 Warming caches...")
+        try:
+            execute_from_command_line(['manage.py', 'warm_cache', '--quiet'])
+            print("✅ Caches warmed")
+        except Exception as e:
+            print(f"⚠️  Cache warming warning: {e}")
+    else:
+        print("ℹ️  Skipping cache warming: the cache is per-process")
+    
     print("🎉 Railway startup tasks completed!")
 
 if __name__ == '__main__':